@@ -0,0 +1,116 @@
+"""
+Asyncio front end for the data access layer.
+
+Responsibilities:
+- Runs DataAccessLayer methods on a bounded thread pool (executor offload), so
+  independent queries of one callback run concurrently and the page's DB time
+  is the slowest query instead of the sum of all of them.
+- Every DataAccessLayer method is available as a coroutine with the same name
+  and arguments: `await adal.get_asset_counts()`.
+- fetch() runs a set of named calls concurrently from synchronous code (Dash
+  callbacks) and returns their results by name.
+
+Only fan out the engine-based read methods (pd.read_sql on self.dev_conn._engine):
+each call checks out its own pooled connection. Methods that use the shared
+`cnn` connection are not safe to run concurrently.
+
+SQLite stand-in for local testing:
+    dal = DataAccessLayer(engine=create_engine("sqlite:///test.sqlite"))
+    adal = AsyncDataAccessLayer(dal)
+"""
+
+import asyncio
+import functools
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+from DataAccessLayer import DataAccessLayer
+
+# Stay within SQLAlchemy's default pool (5 connections + 10 overflow)
+DEFAULT_MAX_WORKERS = int(os.getenv("DAL_MAX_CONCURRENCY", 8))
+
+
+class AsyncDataAccessLayer:
+    def __init__(self, dal=None, max_workers=DEFAULT_MAX_WORKERS):
+        """
+        Args:
+            dal (DataAccessLayer, optional): The synchronous DAL to offload. Defaults to a new one.
+            max_workers (int): Maximum number of queries running at once.
+        """
+        self.dal = dal or DataAccessLayer()
+        self.max_workers = max_workers
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="dal")
+
+    async def run(self, func, *args, **kwargs):
+        """Runs any blocking callable on the DAL executor and awaits its result."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, functools.partial(func, *args, **kwargs))
+
+    def __getattr__(self, name):
+        attr = getattr(self.dal, name)
+        if not callable(attr):
+            return attr
+
+        async def method(*args, **kwargs):
+            return await self.run(attr, *args, **kwargs)
+
+        method.__name__ = name
+        method.__doc__ = attr.__doc__
+        return method
+
+    async def gather(self, **calls) -> dict:
+        """Awaits named coroutines concurrently. Returns {name: result}; the first error is raised."""
+        results = await asyncio.gather(*calls.values())
+        return dict(zip(calls.keys(), results))
+
+    def fetch(self, **calls) -> dict:
+        """
+        Synchronous entry point: runs named coroutines concurrently and returns their results.
+        Example:
+            data = adal.fetch(counts=adal.get_asset_counts(), assets=adal.get_clients_projects_assets_detailed())
+        """
+        return asyncio.run(self.gather(**calls))
+
+    def close(self):
+        self._executor.shutdown(wait=True)
+
+
+if __name__ == "__main__":
+    # Benchmark on an SQLite stand-in: three independent dashboard queries, sequential vs. concurrent
+    import tempfile
+    import time
+
+    from sqlalchemy import create_engine, event
+
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f"sqlite:///{os.path.join(tmp, 'dal.sqlite')}")
+
+        @event.listens_for(engine, "before_cursor_execute")
+        def simulate_latency(conn, cursor, statement, parameters, context, executemany):
+            time.sleep(0.2)  # network round trip to SQL Server
+
+        with engine.begin() as conn:
+            conn.exec_driver_sql("CREATE TABLE tbl_client (ClientID INTEGER PRIMARY KEY, Name TEXT)")
+            conn.exec_driver_sql("CREATE TABLE tbl_project (ProjectID INTEGER PRIMARY KEY, ClientID INTEGER, Name TEXT)")
+            conn.exec_driver_sql("CREATE TABLE tbl_asset (AssetID INTEGER PRIMARY KEY, AssetTypeID INTEGER)")
+            conn.exec_driver_sql("CREATE TABLE tbl_project_asset (ProjectAssetID INTEGER PRIMARY KEY, ProjectID INTEGER)")
+            conn.exec_driver_sql("INSERT INTO tbl_client VALUES (1, 'Client A')")
+            conn.exec_driver_sql("INSERT INTO tbl_project VALUES (1, 1, 'Project 1')")
+            conn.exec_driver_sql("INSERT INTO tbl_asset VALUES (1, 1), (2, 2)")
+
+        dal = DataAccessLayer(engine=engine)
+        started = time.perf_counter()
+        dal.get_asset_counts(), dal.get_clients_projects_assets(), dal.get_total_project_count()
+        sequential = time.perf_counter() - started
+
+        adal = AsyncDataAccessLayer(dal)
+        started = time.perf_counter()
+        results = adal.fetch(
+            counts=adal.get_asset_counts(),
+            projects=adal.get_clients_projects_assets(),
+            total_projects=adal.get_total_project_count(),
+        )
+        concurrent = time.perf_counter() - started
+        adal.close()
+        print(f"sequential: {sequential:.2f}s, concurrent: {concurrent:.2f}s")
+        print(dict(results["counts"]), int(results["total_projects"]))
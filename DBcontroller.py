@@ -8,15 +8,27 @@ Responsibilities:
 Modify this file to add new database operations or modify existing ones.
 """
 from sqlalchemy import text
-from DataAccessLayer import DataAccessLayer as DAL
+from DataAccessLayer import DataAccessLayer as DAL, get_detail_cache_stats, get_single_flight_stats, get_sql_stats
+from AsyncDataAccessLayer import AsyncDataAccessLayer
+from utils.asset_status import DOWN, get_status_service
 
 
 class DBcontoller(object):
-    def __init__(self):
+    def __init__(self, dal=None):
         """
         Initializes the DBcontroller with a single DataAccessLayer instance.
+        Args:
+            dal (DataAccessLayer, optional): Use this DAL (e.g. one on an SQLite stand-in engine).
         """
-        self.dal = DAL()
+        self.dal = dal or DAL()
+        self._adal = None
+
+    @property
+    def adal(self):
+        """AsyncDataAccessLayer over this controller's DAL, created on first use."""
+        if self._adal is None:
+            self._adal = AsyncDataAccessLayer(self.dal)
+        return self._adal
 
     def getTotalProjectCount(self):
         """
@@ -238,8 +250,78 @@ class DBcontoller(object):
             list: List of dicts with asset details including pairing information
         """
         df = self.dal.get_clients_projects_assets_detailed()
+        df = df.astype(object).where(df.notna(), None)
         return df.to_dict(orient="records")
 
+    def getClientsProjectsAssetsWithStatus(self):
+        """
+        Same as getClientsProjectsAssetsDetailed() plus each asset's ingest status.
+        Status comes from the precomputed asset_status table in the local ETL store,
+        read in one query and left-joined on ProjectAssetID; assets that never
+        received data are 'Down'.
+        Returns:
+            list: dicts with the detailed asset columns plus Status, LastTimestamp, RecoveryRate
+        """
+        return self._merge_status(self.dal.get_clients_projects_assets_detailed(), get_status_service().status_frame())
+
+    def getProjectAssetDetails(self, project_asset_ids=None, fresh=False):
+        """
+        Returns the detail properties of many assets as one typed wide frame (cached, see
+        DataAccessLayer.get_project_asset_details), e.g. for reports over a set of assets.
+        Returns:
+            DataFrame: Indexed by ProjectAssetID, one column per property.
+        """
+        return self.dal.get_project_asset_details(project_asset_ids, fresh=fresh)
+
+    def getAssetCoordinates(self):
+        """
+        Returns every located project asset (for the fleet map), from the cached detail frame.
+        Returns:
+            DataFrame: ProjectAssetID, AssetName, AssetType, ClientName, ProjectName, Latitude, Longitude
+        """
+        assets = self.dal.get_clients_projects_assets_detailed()
+        details = self.dal.get_project_asset_details()[["Latitude", "Longitude"]].dropna()
+        assets = assets[["ProjectAssetID", "AssetName", "AssetType", "ClientName", "ProjectName"]]
+        return assets.merge(details, left_on="ProjectAssetID", right_index=True, how="inner").reset_index(drop=True)
+
+    def getProjectAssetWithStatus(self, project_asset_id):
+        """
+        Returns one asset as getClientsProjectsAssetsWithStatus() would (e.g. right after adding it).
+        Returns:
+            dict: the asset's detailed columns plus Status, LastTimestamp, RecoveryRate, or None if not found.
+        """
+        rows = self._merge_status(self.dal.get_project_asset_detailed(project_asset_id), get_status_service().status_frame())
+        return rows[0] if rows else None
+
+    @staticmethod
+    def _merge_status(df, status):
+        status = status[["ProjectAssetID", "Status", "LastTimestamp", "RecoveryRate"]]
+        df = df.merge(status, on="ProjectAssetID", how="left")
+        df["Status"] = df["Status"].fillna(DOWN)
+        df = df.astype(object).where(df.notna(), None)
+        return df.to_dict(orient="records")
+
+    def getAssetsDashboardData(self):
+        """
+        Loads everything the assets dashboard needs with the queries running concurrently
+        (see AsyncDataAccessLayer), so the load takes as long as the slowest query.
+        Returns:
+            dict: asset_counts (as getAssetCounts), assets_detailed (as getClientsProjectsAssetsWithStatus),
+                total_project_count (as getTotalProjectCount)
+        """
+        adal = self.adal
+        results = adal.fetch(
+            asset_counts=adal.get_asset_counts(),
+            assets_detailed=adal.get_clients_projects_assets_detailed(),
+            total_project_count=adal.get_total_project_count(),
+            status=adal.run(lambda: get_status_service().status_frame()),
+        )
+        return {
+            "asset_counts": results["asset_counts"],
+            "assets_detailed": self._merge_status(results["assets_detailed"], results["status"]),
+            "total_project_count": results["total_project_count"],
+        }
+
     def addSimpleAsset(self, asset_name: str, asset_type_id: int) -> int:
         """
         Simple method to add an asset directly to tbl_asset table.
@@ -319,6 +401,79 @@ class DBcontoller(object):
                 return matching_projects.iloc[0]['ProjectID']
             return None
 
+    def getPairedRemoteSensingAssets(self):
+        """
+        Returns every Lidar/Sodar paired to a Met Tower, for the paired-MET comparison engine.
+        Returns:
+            pd.DataFrame: ProjectAssetID, AssetName, AssetType, PairProjectAssetID, PairedMET
+        """
+        return self.dal.get_paired_remote_sensing_assets()
+
+    def getIngestConfigs(self):
+        """
+        Returns the ingest configuration of every asset for the ingest pipelines.
+        Column names are normalized (case and underscores ignored), so e.g. gmail_folder_id
+        and GmailFolderID both come back as 'GmailFolderID'.
+        Returns:
+            list: dicts with ProjectAssetID, Sender, GmailFolderID, DropboxPath, AltospherePath
+        """
+        canonical = {
+            "projectassetid": "ProjectAssetID",
+            "sender": "Sender",
+            "gmailfolderid": "GmailFolderID",
+            "dropboxpath": "DropboxPath",
+            "altospherepath": "AltospherePath",
+        }
+        df = self.dal.get_ingest_configs()
+        df = df.rename(columns=lambda c: canonical.get(str(c).replace("_", "").lower(), c))
+        df = df.astype(object).where(df.notna(), None)
+        return df.to_dict(orient="records")
+
+    def exportProjectAssetDetails(self, path, project_asset_ids=None, chunksize=None):
+        """
+        Streams tbl_project_asset_detail to a CSV file chunk by chunk, so memory stays bounded
+        regardless of table size.
+        Args:
+            path (str): Output CSV path.
+            project_asset_ids (list, optional): Limit to these assets. None exports every asset.
+            chunksize (int, optional): Rows per chunk (defaults to DAL_CHUNKSIZE).
+        Returns:
+            int: Number of rows written.
+        """
+        kwargs = {} if chunksize is None else {"chunksize": chunksize}
+        rows = 0
+        with open(path, "w", newline="", encoding="utf-8") as f:
+            for chunk in self.dal.iter_project_asset_details(project_asset_ids, **kwargs):
+                chunk.to_csv(f, index=False, header=rows == 0)
+                rows += len(chunk)
+        return rows
+
+    def getReadCoalescingStats(self):
+        """
+        Returns the DAL read-coalescing metrics for this process.
+        Returns:
+            dict: calls, executions, coalesced (calls served by another caller's in-flight query),
+            errors, in_flight and per-method counters under 'by_name'.
+        """
+        return get_single_flight_stats()
+
+    def getSqlStats(self):
+        """
+        Returns the DAL statement metrics for this process.
+        Returns:
+            dict: statements, literal (statements with inline values, should stay 0),
+            cache_hits/cache_misses (SQLAlchemy compiled cache) and cached_statements.
+        """
+        return get_sql_stats()
+
+    def getDetailCacheStats(self):
+        """
+        Returns the asset detail cache metrics for this process.
+        Returns:
+            dict: requests, hits (served entirely from cache), misses, loads (queries run) and cached_assets.
+        """
+        return get_detail_cache_stats()
+
 
 if __name__ == "__main__":
     dbc = DBcontoller()
@@ -11,6 +11,7 @@ Responsibilities:
 Modify this file to update the database schema interactions or add new queries.
 """
 
+import functools
 import pandas as pd
 import scipy.stats as ss
 import urllib, urllib.parse
@@ -20,15 +21,61 @@ from dotenv import load_dotenv
 from sqlalchemy import create_engine, text
 from sqlalchemy.sql import text
 
+from utils.single_flight import SingleFlight, coalesced, writes
+from utils.sql_params import statement, literal_sql_monitor
+from utils.frame_types import compact_frame, pivot_details, CLIENTS_PROJECTS_ASSETS_DETAILED_DTYPES, PROJECT_ASSET_DETAIL_DTYPES
+from utils.detail_cache import DetailCache
+
+# One coalescer per process, shared by every DataAccessLayer instance: concurrent callers asking for
+# the same read (method + arguments, on the same database) share one in-flight query and its result.
+# Write methods are marked @writes, so reads issued after a write never join a pre-write query.
+single_flight = SingleFlight()
+
+# Pivoted tbl_project_asset_detail rows per database, shared by every DataAccessLayer instance
+detail_cache = DetailCache()
+
+
+# Rows per chunk for the iter_* streaming reads
+DEFAULT_CHUNKSIZE = int(os.getenv("DAL_CHUNKSIZE", 10000))
+
+
+def _engine_scope(dal):
+    return str(dal.dev_conn._engine.url)
+
+
+def get_sql_stats() -> dict:
+    """Returns statement metrics: statements executed, literal (ad hoc) statements, compiled-cache hits/misses."""
+    return literal_sql_monitor.stats()
+
+
+def get_detail_cache_stats() -> dict:
+    """Returns asset detail cache metrics: requests, hits, misses, loads (queries run), discarded and cached_assets."""
+    return detail_cache.stats()
+
+
+def get_single_flight_stats() -> dict:
+    """Returns read-coalescing metrics: calls, executions, coalesced (calls that shared another's query)."""
+    return single_flight.stats()
+
 
 class DataAccessLayer:
 
-    def __init__(self, client=None, project=None, force_platform=None):
+    def __init__(self, client=None, project=None, force_platform=None, engine=None):
+        """
+        Args:
+            engine (sqlalchemy.engine.Engine, optional): Use this engine instead of the SQL Server
+                connections from the environment (e.g. an SQLite stand-in for local testing).
+        """
         self.client = client
         self.clientID = None
         self.project = project
-        self.db_conn = MSSQLRepository()
-        self.dev_conn = MSSQLRepository(database="DevDB_stage")
+        if engine is not None:
+            self.db_conn = self.dev_conn = EngineRepository(engine)
+        else:
+            self.db_conn = MSSQLRepository()
+            self.dev_conn = MSSQLRepository(database="DevDB_stage")
+            literal_sql_monitor.install(self.db_conn._engine)
+        literal_sql_monitor.install(self.dev_conn._engine)
         self._cnn = None
 
     @property
@@ -37,8 +84,30 @@ class DataAccessLayer:
             self._cnn = self.dev_conn.connect()
         return self._cnn
 
+    def iter_query(self, query, params=None, chunksize=DEFAULT_CHUNKSIZE):
+        """
+        Streams a query's result as DataFrame chunks with bounded memory.
+        Runs on its own connection with stream_results, so rows are fetched from the server as the
+        chunks are consumed (pyodbc reads SQL Server's default result set incrementally).
+        The connection is held until the generator is exhausted or closed.
+        Args:
+            query (str or TextClause): SQL with :name parameters.
+            params (dict, optional): Bound parameter values.
+            chunksize (int): Rows per chunk.
+        Yields:
+            DataFrame: Up to chunksize rows.
+        """
+        if isinstance(query, str):
+            query = statement(query)
+        engine = self.dev_conn._engine
+        with engine.connect() as connection:
+            connection = connection.execution_options(stream_results=True, max_row_buffer=chunksize)
+            for chunk in pd.read_sql(query, con=connection, params=params, chunksize=chunksize):
+                yield chunk
+
+    @coalesced(single_flight, scope=_engine_scope)
     def get_all_users(self):
-        query = f"select username from tbl_user"
+        query = statement("select username from tbl_user")
         engine = self.dev_conn._engine
         allUsers = pd.read_sql(
             query,
@@ -47,31 +116,35 @@ class DataAccessLayer:
 
         return allUsers
 
+    @writes(single_flight, scope=_engine_scope)
     def add_user(self, username):
-        query = f"insert into tbl_user values ('{username}')"
-        conn = self.cnn.connect().begin()
-        self.cnn.connect().execute(query)
-        conn.commit()
-        conn.close()
+        query = statement("insert into tbl_user values (:username)")
+        with self.cnn.begin() as transaction:
+            self.cnn.execute(query, {"username": username})
 
-        return self.get_all_users()
+        return self.get_all_users.__wrapped__(self)  # read after write: don't join an in-flight read
 
     def get_user_id(self, username):
         userID = self.cnn.execute(
-            f"select top 1 UserID from tbl_user where username like '{username}'",
+            statement("select top 1 UserID from tbl_user where username like :username"),
+            {"username": username},
         ).scalar()
 
         return userID
 
+    @coalesced(single_flight, scope=_engine_scope)
     def get_all_clients(self, username=None):
         if username is None:
-            query = f"select Name from tbl_client"
+            query = statement("select Name from tbl_client")
+            params = None
         else:
-            query = f"select Name from tbl_client inner join tbl_client_user on UserID = (select UserID from tbl_user where username='{username}') and tbl_client.ClientID = tbl_client_user.ClientID"
+            query = statement("select Name from tbl_client inner join tbl_client_user on UserID = (select UserID from tbl_user where username = :username) and tbl_client.ClientID = tbl_client_user.ClientID")
+            params = {"username": username}
         engine = self.dev_conn._engine
         allClients = pd.read_sql(
             query,
             con=engine,
+            params=params,
         )
         allClients = allClients.sort_values("Name")
         return allClients
@@ -93,6 +166,7 @@ class DataAccessLayer:
         return result.ClientID
 
 
+    @writes(single_flight, scope=_engine_scope)
     def add_client(self, client_name, user_ID):
         query = text("exec sp_add_client_remote :client_name, :user_ID")
 
@@ -112,7 +186,7 @@ class DataAccessLayer:
                 raise e
 
         # Verify the client was added by querying the database
-        added_clients = self.get_all_clients()
+        added_clients = self.get_all_clients.__wrapped__(self)  # read after write: don't join an in-flight read
         if client_name not in added_clients["Name"].values:
             raise RuntimeError(
                 f"Client '{client_name}' not found in the database after addition."
@@ -120,15 +194,15 @@ class DataAccessLayer:
 
         return added_clients
 
+    @writes(single_flight, scope=_engine_scope)
     def edit_client(self, new_client_name, old_client_name):
-        query = f"exec sp_update_client_remote '{new_client_name}', '{old_client_name}'"
-        conn = self.cnn.connect().begin()
-        self.cnn.connect().execute(query)
-        conn.commit()
-        conn.close()
+        query = statement("exec sp_update_client_remote :new_client_name, :old_client_name")
+        with self.cnn.begin() as transaction:
+            self.cnn.execute(query, {"new_client_name": new_client_name, "old_client_name": old_client_name})
 
-        return self.get_all_clients()
+        return self.get_all_clients.__wrapped__(self)  # read after write: don't join an in-flight read
 
+    @coalesced(single_flight, scope=_engine_scope)
     def get_project_list(self, clientID=None) -> pd.DataFrame:
         """
         return list of project names for given client id
@@ -149,6 +223,7 @@ class DataAccessLayer:
             project_list_frame = pd.read_sql(query, con=engine, params={"client_id": clientID})
         return project_list_frame
 
+    @writes(single_flight, scope=_engine_scope)
     def add_project(self, project_name, clientID):
         # Check if the project already exists
         existing_projects_df = self.get_project_list(clientID) # This now returns ProjectID and Name
@@ -167,17 +242,19 @@ class DataAccessLayer:
                 transaction.rollback()
                 raise e
 
-        return self.get_project_list(clientID)
+        return self.get_project_list.__wrapped__(self, clientID)  # read after write: don't join an in-flight read
     
     def get_project_assets(self, project_name):
-        sql_str = f"select [Name] FROM [dbo].[tbl_project_asset] WHERE ProjectId = (Select [ProjectId] FROM [dbo].[tbl_project] WHERE [dbo].[tbl_project].Name='{project_name}')"
+        sql_str = statement("select [Name] FROM [dbo].[tbl_project_asset] WHERE ProjectId = (Select [ProjectId] FROM [dbo].[tbl_project] WHERE [dbo].[tbl_project].Name = :project_name)")
         engine = self.dev_conn._engine
         assets_frame = pd.read_sql(
             sql_str,
             con=engine,
+            params={"project_name": project_name},
         )
         return assets_frame
 
+    @writes(single_flight, scope=_engine_scope)
     def add_asset(self, project_name, asset_name, typeID):
         existing_assets = self.get_project_assets(project_name)
         if asset_name in existing_assets["Name"].values:
@@ -196,6 +273,7 @@ class DataAccessLayer:
 
         return self.get_project_assets(project_name)
 
+    @coalesced(single_flight, scope=_engine_scope)
     def get_asset_types(self) -> pd.DataFrame:
         """
         Returns all asset types from tbl_asset_type.
@@ -207,26 +285,29 @@ class DataAccessLayer:
         asset_types_frame = pd.read_sql(query, con=engine)
         return asset_types_frame
 
+    @coalesced(single_flight, scope=_engine_scope)
     def get_distinct_base_senders(self) -> pd.DataFrame:
         """
         Returns a DataFrame with a single column 'base_sender' containing unique base sender strings
         extracted from the 'sender' column of tbl_ingest_config.
         The base sender is the part of the string before the first '|' character, or the whole string if no '|' is present.
         """
-        # SQL Server specific query to extract base sender
-        query = text("""
+        # SQL Server specific query to extract base sender; the separator and empty string are
+        # bound like any other value, so the statement has no inline literals (DAL_STRICT_SQL)
+        query = statement("""
             SELECT DISTINCT
                 CASE
-                    WHEN CHARINDEX('|', sender) > 0 THEN LEFT(sender, CHARINDEX('|', sender) - 1)
+                    WHEN CHARINDEX(:separator, sender) > 0 THEN LEFT(sender, CHARINDEX(:separator, sender) - 1)
                     ELSE sender
                 END AS base_sender
             FROM tbl_ingest_config
-            WHERE sender IS NOT NULL AND sender != '';
+            WHERE sender IS NOT NULL AND sender != :empty;
         """)
         engine = self.dev_conn._engine 
-        base_senders_frame = pd.read_sql(query, con=engine)
+        base_senders_frame = pd.read_sql(query, con=engine, params={"separator": "|", "empty": ""})
         return base_senders_frame
 
+    @writes(single_flight, scope=_engine_scope)
     def create_asset_and_project_asset(self, asset_name: str, asset_type_id: int, project_name: str, paired_met_project_asset_id: int = None, existing_asset_id: int = None):
         """
         Executes the sp_create_asset_and_project_asset stored procedure.
@@ -266,6 +347,7 @@ class DataAccessLayer:
             print(f"Error executing sp_create_asset_and_project_asset: {e}")
             raise
 
+    @writes(single_flight, scope=_engine_scope)
     def add_project_asset_file_map_entry(self, map_key: str, project_asset_id: int):
         """
         Inserts a new entry into tbl_project_asset_file_map.
@@ -288,6 +370,7 @@ class DataAccessLayer:
             print(f"Error inserting into tbl_project_asset_file_map: {e}")
             raise # Re-raise the exception
 
+    @coalesced(single_flight, scope=_engine_scope)
     def get_assets_by_project_and_type(self, project_id: int, asset_type_id: int) -> pd.DataFrame:
         """
         Returns a DataFrame of assets (ProjectAssetID, Name) for a given project_id and asset_type_id.
@@ -322,11 +405,12 @@ class DataAccessLayer:
         asset_name = asset_name.replace("_", " ")
         engine = self.dev_conn._engine
 
-        sql_str = f"exec sp_get_asset_params '{project_name}', '{asset_name}'"
+        sql_str = statement("exec sp_get_asset_params :project_name, :asset_name")
         # print('data repo 174 ',sql_str)
         assets_frame = pd.read_sql(
             sql_str,
             con=engine,
+            params={"project_name": project_name, "asset_name": asset_name},
         )
 
         # assemble dict from
@@ -345,14 +429,16 @@ class DataAccessLayer:
         return param_dict
 
     def get_addable_asset_params(self, project_name, asset_name, param_group_name):
-        query = f"sp_get_addable_asset_params '{project_name}', '{asset_name}', '{param_group_name}'"
+        query = statement("exec sp_get_addable_asset_params :project_name, :asset_name, :param_group_name")
         engine = self.dev_conn._engine
         addable = pd.read_sql(
             query,
             con=engine,
+            params={"project_name": project_name, "asset_name": asset_name, "param_group_name": param_group_name},
         )
         return addable
 
+    @writes(single_flight, scope=_engine_scope)
     def add_param_group_col_mapping(
         self, project_name, asset_name, param_group_name, column_name
     ):
@@ -371,6 +457,7 @@ class DataAccessLayer:
             )
         return self.get_project_asset_params(project_name, asset_name)
 
+    @writes(single_flight, scope=_engine_scope)
     def del_param_group_col_mapping(
         self, project_name, asset_name, param_group_name, column_name
     ):
@@ -390,7 +477,7 @@ class DataAccessLayer:
         return self.get_project_asset_params(project_name, asset_name)
 
     def get_all_param_groups(self):
-        query = f"select Param_Group from tbl_project_asset_attr_set_data_types"
+        query = statement("select Param_Group from tbl_project_asset_attr_set_data_types")
         engine = self.dev_conn._engine
         allPGs = pd.read_sql(
             query,
@@ -400,13 +487,14 @@ class DataAccessLayer:
         return allPGs
 
     def get_raw_details(self, project_name, asset_name):
-        query = f"exec sp_get_raw_data_details '{project_name}', '{asset_name}'"
+        query = statement("exec sp_get_raw_data_details :project_name, :asset_name")
         engine = self.dev_conn._engine
-        allDetails = pd.read_sql(query, con=engine)
+        allDetails = pd.read_sql(query, con=engine, params={"project_name": project_name, "asset_name": asset_name})
         # print("Raw details from DB:", allDetails)
 
         return allDetails
 
+    @writes(single_flight, scope=_engine_scope)
     def add_raw_data_detail(self, project_name, asset_name, prop, value):
         query = text(
             "exec sp_add_raw_data_detail :project_name, :asset_name, :prop, :value"
@@ -421,8 +509,11 @@ class DataAccessLayer:
                     "value": value,
                 },
             )
+        # Only the asset's name is known here, so every cached detail is dropped
+        detail_cache.invalidate(_engine_scope(self))
         return self.get_raw_details(project_name, asset_name)
 
+    @writes(single_flight, scope=_engine_scope)
     def update_raw_data_detail(self, project_name, asset_name, prop, value):
         query = text(
             "exec sp_update_raw_data_detail :project_name, :asset_name, :prop, :value"
@@ -437,9 +528,12 @@ class DataAccessLayer:
                     "value": value,
                 },
             )
+        # Only the asset's name is known here, so every cached detail is dropped
+        detail_cache.invalidate(_engine_scope(self))
         return self.get_raw_details(project_name, asset_name)
 
     # I altered the SQL in the db as well, but the SQL's functionality for previous apps is still fully functionaable
+    @writes(single_flight, scope=_engine_scope)
     def del_raw_data_detail(self, project_name, asset_name, prop):
         query = text("exec sp_delete_raw_data_detail :project_name, :asset_name, :prop")
         with self.cnn.begin() as transaction:
@@ -447,27 +541,30 @@ class DataAccessLayer:
                 query,
                 {"project_name": project_name, "asset_name": asset_name, "prop": prop},
             )
+        # Only the asset's name is known here, so every cached detail is dropped
+        detail_cache.invalidate(_engine_scope(self))
         return self.get_raw_details(project_name, asset_name)
 
     def get_all_sensor_details(self, project_name, asset_name):
-        query = f"exec sp_get_all_sensors_details '{project_name}', '{asset_name}'"
+        query = statement("exec sp_get_all_sensors_details :project_name, :asset_name")
         engine = self.dev_conn._engine
         sensorsDF = pd.read_sql(
             query,
             con=engine,
+            params={"project_name": project_name, "asset_name": asset_name},
         )
 
         return sensorsDF
 
+    @writes(single_flight, scope=_engine_scope)
     def update_sensor_details(self, componentID, col, value):
-        query = f"exec sp_update_sensors_details '{componentID}', '{col}', '{value}'"
-        conn = self.cnn.connect().begin()
-        self.cnn.connect().execute(query)
-        conn.commit()
-        conn.close()
+        query = statement("exec sp_update_sensors_details :component_id, :col, :value")
+        with self.cnn.begin() as transaction:
+            self.cnn.execute(query, {"component_id": str(componentID), "col": col, "value": str(value)})
 
         return
 
+    @coalesced(single_flight, scope=_engine_scope)
     def get_clients_projects_assets(self):
         """
         Returns a DataFrame with columns: ClientName, ProjectID, ProjectName, AssetCount
@@ -488,6 +585,7 @@ class DataAccessLayer:
         df = pd.read_sql(query, con=engine)
         return df
 
+    @coalesced(single_flight, scope=_engine_scope)
     def get_clients_with_project_counts(self):
         """
         Returns a DataFrame with each client and the number of projects they have.
@@ -504,6 +602,7 @@ class DataAccessLayer:
         df = pd.read_sql(query, con=engine)
         return df
 
+    @coalesced(single_flight, scope=_engine_scope)
     def get_total_project_count(self):
         """
         Returns the total number of projects in tbl_project.
@@ -513,6 +612,7 @@ class DataAccessLayer:
         total_projects = pd.read_sql(query, con=engine).iloc[0, 0]
         return total_projects
 
+    @coalesced(single_flight, scope=_engine_scope)
     def get_asset_counts(self):
         """
         Returns the total number of assets, met towers, and lidars.
@@ -541,13 +641,7 @@ class DataAccessLayer:
             next_id = result.scalar_one()
             return int(next_id)
 
-    def get_clients_projects_assets_detailed(self):
-        """
-        Returns detailed asset information organized by client and project.
-        Includes asset pairing information for Lidars.
-        Uses the Name from tbl_project_asset (not tbl_asset) to get specific asset names like ZX300-1168A, ZX300-1168B, etc.
-        """
-        query = """
+    CLIENTS_PROJECTS_ASSETS_DETAILED_SELECT = """
             SELECT
                 c.Name AS ClientName,
                 p.Name AS ProjectName,
@@ -565,13 +659,133 @@ class DataAccessLayer:
             LEFT JOIN tbl_project_asset pa ON p.ProjectID = pa.ProjectID
             LEFT JOIN tbl_asset_type at ON pa.AssetTypeID = at.AssetTypeID
             LEFT JOIN tbl_project_asset paired_pa ON pa.PairProjectAssetID = paired_pa.ProjectAssetID
+        """
+    CLIENTS_PROJECTS_ASSETS_DETAILED_QUERY = CLIENTS_PROJECTS_ASSETS_DETAILED_SELECT + """
             WHERE pa.ProjectAssetID IS NOT NULL
             ORDER BY c.Name, p.Name, pa.Name
         """
+
+    @coalesced(single_flight, scope=_engine_scope)
+    def get_clients_projects_assets_detailed(self):
+        """
+        Returns detailed asset information organized by client and project.
+        Includes asset pairing information for Lidars.
+        Uses the Name from tbl_project_asset (not tbl_asset) to get specific asset names like ZX300-1168A, ZX300-1168B, etc.
+        Repeated labels are categoricals and the IDs nullable Int64 (see utils/frame_types.py),
+        so missing values are pd.NA rather than NaN.
+        """
         engine = self.dev_conn._engine
-        df = pd.read_sql(query, con=engine)
-        return df
+        df = pd.read_sql(statement(self.CLIENTS_PROJECTS_ASSETS_DETAILED_QUERY), con=engine)
+        return compact_frame(df, CLIENTS_PROJECTS_ASSETS_DETAILED_DTYPES)
+
+    def get_project_asset_detailed(self, project_asset_id: int) -> pd.DataFrame:
+        """
+        Returns the get_clients_projects_assets_detailed() row of one project asset (e.g. one just added),
+        so callers can update a view without reloading every asset.
+        Returns:
+            DataFrame: zero or one row, same columns and dtypes as get_clients_projects_assets_detailed().
+        """
+        query = statement(self.CLIENTS_PROJECTS_ASSETS_DETAILED_SELECT + """
+            WHERE pa.ProjectAssetID = :project_asset_id
+        """)
+        engine = self.dev_conn._engine
+        df = pd.read_sql(query, con=engine, params={"project_asset_id": int(project_asset_id)})
+        return compact_frame(df, CLIENTS_PROJECTS_ASSETS_DETAILED_DTYPES)
+
+    @coalesced(single_flight, scope=_engine_scope)
+    def read_project_asset_details(self, project_asset_ids=None) -> pd.DataFrame:
+        """
+        Reads the tbl_project_asset_detail rows of many assets at once (one query per 1000 ids)
+        and pivots them to one typed row per asset (see utils/frame_types.pivot_details).
+        Uncached; use get_project_asset_details() unless the latest values are required.
+        Args:
+            project_asset_ids (list, optional): Limit to these assets. None reads every asset.
+        Returns:
+            DataFrame: Indexed by ProjectAssetID, one column per property (Latitude, Longitude,
+                Elevation as float64, other properties as text).
+        """
+        engine = self.dev_conn._engine
+        if project_asset_ids is None:
+            query = statement("""
+                SELECT ProjectAssetID, property, value
+                FROM tbl_project_asset_detail
+                ORDER BY ProjectAssetDetailID
+            """)
+            return pivot_details(pd.read_sql(query, con=engine))
+
+        query = statement("""
+            SELECT ProjectAssetID, property, value
+            FROM tbl_project_asset_detail
+            WHERE ProjectAssetID IN :project_asset_ids
+            ORDER BY ProjectAssetDetailID
+        """, expanding=("project_asset_ids",))
+        project_asset_ids = sorted({int(x) for x in project_asset_ids})
+        # SQL Server allows 2100 parameters per statement
+        chunks = [pd.read_sql(query, con=engine, params={"project_asset_ids": project_asset_ids[i:i + 1000]})
+                  for i in range(0, len(project_asset_ids), 1000)]
+        rows = pd.concat(chunks) if chunks else pd.DataFrame(columns=["ProjectAssetID", "property", "value"])
+        return pivot_details(rows)
+
+    def get_project_asset_details(self, project_asset_ids=None, fresh=False) -> pd.DataFrame:
+        """
+        Returns the details of many assets as one typed wide frame, from the process-wide
+        detail cache. Only assets not cached (or cached longer than DAL_DETAIL_CACHE_TTL)
+        are read, all in one read_project_asset_details() call.
+        Args:
+            project_asset_ids (list, optional): Limit to these assets. None returns every asset.
+            fresh (bool): Drop the cached copies first and query without joining an in-flight
+                read (read your own writes).
+        Returns:
+            DataFrame: As read_project_asset_details(); assets without details are left out.
+        """
+        scope = _engine_scope(self)
+        loader = self.read_project_asset_details
+        if fresh:
+            detail_cache.invalidate(scope, project_asset_ids)
+            # The undecorated method: a coalesced read may have started before the caller's write
+            loader = functools.partial(DataAccessLayer.read_project_asset_details.__wrapped__, self)
+        return detail_cache.get(scope, project_asset_ids, loader,
+                                fixup=lambda frame: compact_frame(frame, PROJECT_ASSET_DETAIL_DTYPES))
 
+    def iter_clients_projects_assets_detailed(self, chunksize=DEFAULT_CHUNKSIZE):
+        """
+        Streaming variant of get_clients_projects_assets_detailed(), for exports.
+        Yields:
+            DataFrame: Up to chunksize rows, same columns and order.
+        """
+        yield from self.iter_query(self.CLIENTS_PROJECTS_ASSETS_DETAILED_QUERY, chunksize=chunksize)
+
+    def iter_project_asset_details(self, project_asset_ids=None, chunksize=DEFAULT_CHUNKSIZE):
+        """
+        Streams the property/value rows of tbl_project_asset_detail, ordered by ProjectAssetID.
+        Args:
+            project_asset_ids (list, optional): Limit to these assets. None streams every asset.
+            chunksize (int): Rows per chunk.
+        Yields:
+            DataFrame: Up to chunksize rows with ProjectAssetID, property, value.
+        """
+        if project_asset_ids is None:
+            query = statement("""
+                SELECT ProjectAssetID, property, value
+                FROM tbl_project_asset_detail
+                ORDER BY ProjectAssetID, property
+            """)
+            yield from self.iter_query(query, chunksize=chunksize)
+            return
+
+        query = statement("""
+            SELECT ProjectAssetID, property, value
+            FROM tbl_project_asset_detail
+            WHERE ProjectAssetID IN :project_asset_ids
+            ORDER BY ProjectAssetID, property
+        """, expanding=("project_asset_ids",))
+        project_asset_ids = sorted({int(x) for x in project_asset_ids})
+        # SQL Server allows 2100 parameters per statement
+        for i in range(0, len(project_asset_ids), 1000):
+            params = {"project_asset_ids": project_asset_ids[i:i + 1000]}
+            yield from self.iter_query(query, params=params, chunksize=chunksize)
+
+    @writes(single_flight, scope=_engine_scope)
     def add_simple_asset(self, asset_name: str, asset_type_id: int) -> int:
         """
         Simple method to insert directly into tbl_asset table.
@@ -605,6 +819,7 @@ class DataAccessLayer:
                     print(f"DEBUG: Error inserting asset: {e}")
                     raise
 
+    @writes(single_flight, scope=_engine_scope)
     def add_project_asset(self, project_asset_id: int, project_id: int, asset_name: str, asset_type_id: int, asset_id: int, pair_project_asset_id: int = None) -> int:
         """
         Insert into tbl_project_asset table.
@@ -651,6 +866,7 @@ class DataAccessLayer:
                     print(f"DEBUG: Error inserting project asset: {e}")
                     raise
 
+    @coalesced(single_flight, scope=_engine_scope)
     def get_met_towers_by_project_id(self, project_id: int) -> pd.DataFrame:
         """
         Get all Met Towers (AssetTypeID = 1) for a specific project.
@@ -661,38 +877,40 @@ class DataAccessLayer:
         """
         return self.get_assets_by_project_and_type(project_id, 1)  # 1 = Met Tower
 
-load_dotenv()
-class MSSQLRepository:
-    def __init__(
-        self,
-        server=None,
-        database=None,
-        uid=None,
-        pwd=None,
-    ):
-        self._server = server or os.getenv('DB_SERVER')
-        self._database = database or os.getenv('DB_DATABASE')
-        self._UID = uid or os.getenv('DB_UID')
-        self._pwd = pwd or os.getenv('DB_PWD')
-        self.cnn = None
-
-        if all(x is not None for x in [self._server, self._database, self._UID, self._pwd]):
-            params = urllib.parse.quote_plus(
-                f"DRIVER={{ODBC Driver 17 for SQL Server}};"
-                f"SERVER={self._server};DATABASE={self._database};UID={self._UID};PWD={self._pwd}"
-            )
-            conn_str = f"mssql+pyodbc:///?odbc_connect={params}"
-            self._engine = create_engine(conn_str)
-        else:
-            raise ValueError(
-                "MSSQLRepository: must provide server, database, uid, and pwd to create an instance"
-            )
-        
-    def connect(self):
-        connection = self._engine.connect()
+    @coalesced(single_flight, scope=_engine_scope)
+    def get_paired_remote_sensing_assets(self) -> pd.DataFrame:
+        """
+        Get every Lidar/Sodar (AssetTypeID 2, 3) that is paired to a Met Tower.
+        Returns:
+            pd.DataFrame: ProjectAssetID, AssetName, AssetType, PairProjectAssetID, PairedMET
+        """
+        query = text("""
+            SELECT
+                pa.ProjectAssetID,
+                pa.Name AS AssetName,
+                at.AssetType,
+                pa.PairProjectAssetID,
+                paired_pa.Name AS PairedMET
+            FROM tbl_project_asset pa
+            JOIN tbl_asset_type at ON pa.AssetTypeID = at.AssetTypeID
+            JOIN tbl_project_asset paired_pa ON pa.PairProjectAssetID = paired_pa.ProjectAssetID
+            WHERE pa.AssetTypeID IN (2, 3)
+            ORDER BY pa.Name
+        """)
+        engine = self.dev_conn._engine
+        return pd.read_sql(query, con=engine)
 
-        return connection
+    @coalesced(single_flight, scope=_engine_scope)
+    def get_ingest_configs(self) -> pd.DataFrame:
+        """
+        Returns every row of tbl_ingest_config (sender, Gmail folder, Dropbox and
+        Altosphere paths per ProjectAssetID, as entered in wizard Step 4).
+        """
+        query = text("SELECT * FROM tbl_ingest_config")
+        engine = self.dev_conn._engine
+        return pd.read_sql(query, con=engine)
 
+    @writes(single_flight, scope=_engine_scope)
     def add_project_asset_detail(self, project_asset_id: int, property_name: str, property_value: str):
         """
         Inserts a new record into tbl_project_asset_detail.
@@ -717,9 +935,49 @@ class MSSQLRepository:
             with self.cnn.begin() as transaction: # Use self.cnn which is the DevDB_stage connection
                 self.cnn.execute(sql_query, params)
                 transaction.commit()
+            detail_cache.invalidate(_engine_scope(self), [project_asset_id])
             return True
         except Exception as e:
             print(f"Database error in add_project_asset_detail: {e}")
             # Consider logging the error more formally
             # If a transaction was active and an error occurred, 'with self.cnn.begin()' handles rollback.
             return False
+
+load_dotenv()
+class MSSQLRepository:
+    def __init__(
+        self,
+        server=None,
+        database=None,
+        uid=None,
+        pwd=None,
+    ):
+        self._server = server or os.getenv('DB_SERVER')
+        self._database = database or os.getenv('DB_DATABASE')
+        self._UID = uid or os.getenv('DB_UID')
+        self._pwd = pwd or os.getenv('DB_PWD')
+        self.cnn = None
+
+        if all(x is not None for x in [self._server, self._database, self._UID, self._pwd]):
+            params = urllib.parse.quote_plus(
+                f"DRIVER={{ODBC Driver 17 for SQL Server}};"
+                f"SERVER={self._server};DATABASE={self._database};UID={self._UID};PWD={self._pwd}"
+            )
+            conn_str = f"mssql+pyodbc:///?odbc_connect={params}"
+            self._engine = create_engine(conn_str)
+        else:
+            raise ValueError(
+                "MSSQLRepository: must provide server, database, uid, and pwd to create an instance"
+            )
+        
+    def connect(self):
+        connection = self._engine.connect()
+
+        return connection
+
+class EngineRepository(MSSQLRepository):
+    """MSSQLRepository over an existing SQLAlchemy engine (e.g. an SQLite stand-in for local testing)."""
+
+    def __init__(self, engine):
+        self._engine = engine
+        self.cnn = None
@@ -4,18 +4,62 @@ Integrates the modular step files for a complete asset creation workflow
 """
 
 import dash_mantine_components as dmc
-from dash import html, dcc, callback, Output, Input, State, ctx
+from dash import html, dcc, callback, Output, Input, State, ctx, no_update
 import pandas as pd
 from DBcontroller import DBcontoller
+from utils.session_store import get_notification_log, get_session_state
 
 # Import modular step components
 from addAssetModalStep1 import create_step1_layout, validate_step1_data
 from addAssetModalStep2 import create_step2_layout, validate_step2_data, process_step2_to_step3
-from addAssetModalStep3 import create_step3_layout, validate_step3_data, process_step3_completion
+from addAssetModalStep3 import create_step3_layout, validate_step3_data, process_step3_completion, find_nearby_assets, create_nearby_assets_warning
 from addAssetModalStep4 import create_step4_layout, validate_step4_data, process_step4_completion # Added Step 4
 
 dbc_instance = DBcontoller()
 
+# Wizard progress lives server-side under this key (utils/session_store.py):
+# {"step": int, "step_data": {"project_asset_id": ...}, "asset_info": {...}}
+WIZARD_STATE_KEY = "add_asset_wizard"
+
+
+def load_wizard_state(session_id):
+    """
+    Returns (step, step_data, asset_info) of the session's wizard; step 0 and empty dicts if none
+    (or if the browser has not sent its session id yet).
+    """
+    if not session_id:
+        return 0, {}, {}
+    state = get_session_state().get(session_id, WIZARD_STATE_KEY) or {}
+    return state.get("step", 0), state.get("step_data", {}), state.get("asset_info", {})
+
+
+def save_wizard_state(session_id, step, step_data, asset_info):
+    """Stores the wizard's progress; returns False (nothing saved) without a session id."""
+    if not session_id:
+        return False
+    get_session_state().set(session_id, WIZARD_STATE_KEY, {"step": step, "step_data": step_data, "asset_info": asset_info})
+    return True
+
+
+def clear_wizard_state(session_id):
+    get_session_state().delete(session_id, WIZARD_STATE_KEY)
+
+
+def step2_outputs(asset_info):
+    """
+    Returns the Step 2 project options, selected project, asset displays, pairing section style and
+    the asset type id (kept in a store so the Next button can follow the type, see ui.js wizard_buttons).
+    """
+    asset_type_id = asset_info["asset_type_id"]
+    client_id = dbc_instance.getClientID(asset_info["client_name"])
+    projects = dbc_instance.getProjects(client_id)
+    project_options = [{"label": str(p), "value": str(p)} for p in projects] if isinstance(projects, list) else []
+    pairing_style = {} if int(asset_type_id) in [2, 3] else {"display": "none"}
+    return (
+        project_options, asset_info["project_name"], asset_info["asset_name"], f"Asset Type {asset_type_id}",
+        str(asset_info["asset_id"]), pairing_style, int(asset_type_id)
+    )
+
 def create_add_asset_modal():
     """Multi-step asset configuration wizard using modular components"""
     return dmc.Modal(
@@ -108,8 +152,8 @@ def create_add_asset_modal():
             ), # End of html.Div
             # Stores are outside the LoadingOverlay
             dcc.Store(id="add-asset-notification-store"),
-            dcc.Store(id="wizard-step-data", data={}),
-            dcc.Store(id="created-asset-info", data={}),
+            # AssetTypeID of the wizard's asset (Step 2 needs a MET tower pairing for lidars and sodars)
+            dcc.Store(id="step2-asset-type-store"),
         ] # End of Modal children
     ) # End of Modal
 
@@ -130,22 +174,17 @@ def load_client_data_on_modal_open(is_opened):
             return []
     return []
 
-# Main modal control callback
+# Wizard completion callback (opening and Cancel are clientside: window.dash_clientside.ui.toggle_asset_modal)
 @callback(
     [
-        Output("modern-add-asset-modal", "opened"),
+        Output("modern-add-asset-modal", "opened", allow_duplicate=True),
         Output("asset-wizard-stepper", "active", allow_duplicate=True),
-        Output("wizard-step-data", "data", allow_duplicate=True),
-        Output("created-asset-info", "data", allow_duplicate=True),
         Output("add-asset-notification-store", "data", allow_duplicate=True),
-        Output("notification-log-store", "data", allow_duplicate=True),
+        Output("notification-log-cursor", "data", allow_duplicate=True),
+        Output("assets-dashboard-new-asset", "data"),
         Output("assets-dashboard-refresh-trigger", "data", allow_duplicate=True),
     ],
-    [
-        Input("quick-add-asset-btn", "n_clicks"),
-        Input("modern-cancel-asset-btn", "n_clicks"),
-        Input("wizard-complete-btn", "n_clicks")
-    ],
+    Input("wizard-complete-btn", "n_clicks"),
     [
         State("modern-add-asset-modal", "opened"),
         # Step 3 inputs (used if completing from Step 3, though now Step 4 is final)
@@ -161,71 +200,112 @@ def load_client_data_on_modal_open(is_opened):
         State("step4-logger-viewer-checkbox", "checked"),
         State("step4-email-checkbox", "checked"),
         State("step4-altosphere-input", "value"),
-        State("wizard-step-data", "data"),
-        State("created-asset-info", "data"),
-        State("notification-log-store", "data"),
+        State("session-id", "data"),
         State("assets-dashboard-refresh-trigger", "data"),
         State("asset-wizard-stepper", "active") # To know which step we are completing from
     ],
     prevent_initial_call=True
 )
-def toggle_add_asset_modal(
-    open_btn, cancel_btn, complete_btn, is_open, 
+def complete_add_asset_wizard(
+    complete_btn, is_open, 
     # latitude, longitude, elevation, # Step 3 states, moved to handle_wizard_navigation
     sender, dropbox_path, gmail_folder_id, email_text, logger_site_number, 
     show_logger, show_email, altosphere_path, # Step 4 states
-    step_data, asset_info, log_data, refresh_trigger, current_step_on_complete):
+    session_id, refresh_trigger, current_step_on_complete):
 
-    if ctx.triggered_id == "quick-add-asset-btn" and open_btn and open_btn > 0:
-        print("DEBUG: Opening modal, resetting to Step 1")
-        return True, 0, {}, {}, {}, log_data or [], refresh_trigger
-
-    elif ctx.triggered_id == "wizard-complete-btn" and complete_btn:
+    if complete_btn:
         print(f"DEBUG: Processing wizard completion from Step {current_step_on_complete + 1}")
+        _, step_data, asset_info = load_wizard_state(session_id)
         project_asset_id = step_data.get("project_asset_id")
         if not project_asset_id: 
             notification = {"title": "Error", "message": "Project Asset ID missing. Cannot complete.", "color": "red", "icon": "❌"}
-            return is_open, current_step_on_complete, step_data, asset_info, notification, log_data or [], refresh_trigger
+            return is_open, current_step_on_complete, notification, no_update, no_update, refresh_trigger
 
         is_valid, error_msg = validate_step4_data(sender, dropbox_path, gmail_folder_id, email_text, logger_site_number, show_logger, show_email, altosphere_path)
         if not is_valid:
             notification = {"title": "Validation Error (Step 4)", "message": error_msg, "color": "yellow", "icon": "⚠️"}
-            return is_open, 3, step_data, asset_info, notification, log_data or [], refresh_trigger
+            return is_open, 3, notification, no_update, no_update, refresh_trigger
 
         notification_out, log_entry, error = process_step4_completion(
             sender, dropbox_path, gmail_folder_id, email_text, logger_site_number, 
             show_logger, show_email, altosphere_path, project_asset_id
         )
-        updated_log = (log_data or []) + [log_entry]
+        updated_log = get_notification_log().add(session_id, log_entry)
 
         if error:
-            return is_open, 3, step_data, asset_info, notification_out, updated_log, refresh_trigger
+            return is_open, 3, notification_out, updated_log, no_update, refresh_trigger
         else:
-            return False, 0, {}, {}, notification_out, updated_log, (refresh_trigger or 0) + 1
-
-    elif ctx.triggered_id == "modern-cancel-asset-btn":
-        print("DEBUG: Closing modal, resetting wizard")
-        return False, 0, {}, {}, {}, log_data or [], refresh_trigger
+            clear_wizard_state(session_id)
+            # The dashboard patches in just the new row; a full reload only if the row can't be read back
+            new_asset = load_new_dashboard_asset(project_asset_id, asset_info)
+            if new_asset is None:
+                return False, 0, notification_out, updated_log, no_update, (refresh_trigger or 0) + 1
+            return False, 0, notification_out, updated_log, new_asset, no_update
 
     # Default return for other cases (e.g., modal just being present without action)
-    return is_open, current_step_on_complete if current_step_on_complete is not None else 0, step_data, asset_info, {}, log_data or [], refresh_trigger
+    return is_open, current_step_on_complete if current_step_on_complete is not None else 0, {}, no_update, no_update, refresh_trigger
+
+def load_new_dashboard_asset(project_asset_id, asset_info):
+    """Reads back a just-completed asset as an assets dashboard row (see patch_assets_dashboard)"""
+    try:
+        asset = dbc_instance.getProjectAssetWithStatus(project_asset_id)
+    except Exception as e:
+        print(f"Error reading back new asset {project_asset_id}: {e}")
+        return None
+    if asset is None:
+        return None
+    new_asset = {key: asset.get(key) for key in ("ClientName", "ProjectName", "AssetName", "AssetType", "Status", "PairedMET")}
+    new_asset["AssetTypeID"] = int(asset_info["asset_type_id"]) if asset_info.get("asset_type_id") else None
+    return new_asset
+
+# Restores an unfinished wizard (e.g. after a page reload) when the modal opens, and drops the
+# server-side state when it is closed with Cancel (which resets the stepper to 0).
+# Button visibility follows the step clientside (window.dash_clientside.ui.wizard_buttons).
+@callback(
+    [
+        Output("asset-wizard-stepper", "active", allow_duplicate=True),
+        Output("step2-project-dropdown", "data", allow_duplicate=True),
+        Output("step2-project-dropdown", "value", allow_duplicate=True),
+        Output("step2-asset-name-display", "value", allow_duplicate=True),
+        Output("step2-asset-type-display", "value", allow_duplicate=True),
+        Output("step2-asset-id-display", "value", allow_duplicate=True),
+        Output("met-tower-pairing-section", "style", allow_duplicate=True),
+        Output("step2-asset-type-store", "data", allow_duplicate=True)
+    ],
+    Input("modern-add-asset-modal", "opened"),
+    State("session-id", "data"),
+    State("asset-wizard-stepper", "active"),
+    prevent_initial_call=True
+)
+def resume_wizard_session(is_opened, session_id, current_step):
+    if not is_opened:
+        if not current_step:
+            clear_wizard_state(session_id)
+        return [no_update] * 8
+    step, step_data, asset_info = load_wizard_state(session_id)
+    step2 = [no_update] * 7
+    if step > 0 and asset_info:
+        print(f"DEBUG: Resuming wizard at Step {step + 1}")
+        try:
+            step2 = list(step2_outputs(asset_info))
+        except Exception as e:
+            print(f"Error restoring Step 2 options: {e}")
+    else:
+        step = 0
+    return [step] + step2
 
 # Wizard navigation callback
 @callback(
     [
         Output("asset-wizard-stepper", "active"),
-        Output("wizard-prev-btn", "style"),
-        Output("wizard-next-btn", "style"),
-        Output("wizard-complete-btn", "style"),
-        Output("wizard-step-data", "data"),
-        Output("created-asset-info", "data"),
         Output("add-asset-notification-store", "data"),
         Output("step2-project-dropdown", "data"),
         Output("step2-project-dropdown", "value"),
         Output("step2-asset-name-display", "value"),
         Output("step2-asset-type-display", "value"),
         Output("step2-asset-id-display", "value"),
-        Output("met-tower-pairing-section", "style")
+        Output("met-tower-pairing-section", "style"),
+        Output("step2-asset-type-store", "data")
     ],
     [
         Input("wizard-next-btn", "n_clicks"),
@@ -237,8 +317,7 @@ def toggle_add_asset_modal(
         State("modern-asset-project-dropdown", "value"),
         State("modern-asset-type-dropdown", "value"),
         State("modern-asset-name-input", "value"),
-        State("wizard-step-data", "data"),
-        State("created-asset-info", "data"),
+        State("session-id", "data"),
         State("step2-met-tower-dropdown", "value"),
         State("step2-project-dropdown", "value"),
         # Add Step 3 inputs for processing when moving from Step 3 to 4
@@ -251,19 +330,30 @@ def toggle_add_asset_modal(
 def handle_wizard_navigation(
     next_clicks, prev_clicks, current_step, 
     client_name, project_name, asset_type_id, asset_name, 
-    step_data, asset_info, 
+    session_id,
     met_tower_pair_id, step2_project_name,
     s3_latitude, s3_longitude, s3_elevation # Step 3 values
     ):
     print(f"DEBUG: Wizard navigation triggered. Current step: {current_step}, Triggered by: {ctx.triggered_id}")
+    _, step_data, asset_info = load_wizard_state(session_id)
 
     # Show loading overlay if loading_state is True
     loading_style_output = {"display": "none"}
 
     if not ctx.triggered:
-        return current_step, {"display": "none"}, {}, {"display": "none"}, step_data, asset_info, {}, [], "", "", "", "", {"display": "none"}
+        return current_step, {}, [], "", "", "", "", {"display": "none"}, no_update
     
     notification = {}
+
+    # Progress is kept per session; without an id the steps could not be resumed or completed
+    if ctx.triggered_id == "wizard-next-btn" and not session_id:
+        notification = {
+            "title": "Session not ready",
+            "message": "Your browser session has not started yet. Please wait a moment and try again.",
+            "color": "yellow",
+            "icon": "⚠️"
+        }
+        return current_step, notification, [], "", "", "", "", {"display": "none"}, no_update
     
     if ctx.triggered_id == "wizard-next-btn":
         if current_step == 0:  # Moving from Step 1 to Step 2
@@ -275,7 +365,7 @@ def handle_wizard_navigation(
                     "color": "yellow",
                     "icon": "⚠️"
                 }
-                return current_step, {"display": "none"}, {}, {"display": "none"}, step_data, asset_info, notification, [], "", "", "", "", {"display": "none"}
+                return current_step, notification, [], "", "", "", "", {"display": "none"}, no_update
             
             try:
                 print(f"DEBUG: Creating asset from wizard: {asset_name}, type: {asset_type_id}")
@@ -290,18 +380,9 @@ def handle_wizard_navigation(
                     "project_name": project_name
                 }
                 
-                client_id = dbc_instance.getClientID(client_name)
-                projects = dbc_instance.getProjects(client_id)
-                project_options = [{"label": str(p), "value": str(p)} for p in projects] if isinstance(projects, list) else []
-                pairing_style = {} if int(asset_type_id) in [2, 3] else {"display": "none"}
-                next_style_conditional = {"display": "none"} if int(asset_type_id) in [2, 3] else {}
-                
                 new_step = 1
-                return (
-                    new_step, {}, next_style_conditional, {"display": "none"}, step_data, asset_info, notification,
-                    project_options, project_name, asset_name, f"Asset Type {asset_type_id}", str(new_asset_id),
-                    pairing_style
-                )
+                save_wizard_state(session_id, new_step, step_data, asset_info)
+                return (new_step, notification, *step2_outputs(asset_info))
             except Exception as e:
                 print(f"DEBUG: Error creating asset: {e}")
                 notification = {
@@ -310,7 +391,7 @@ def handle_wizard_navigation(
                     "color": "red",
                     "icon": "❌"
                 }
-                return current_step, {"display": "none"}, {}, {"display": "none"}, step_data, asset_info, notification, [], "", "", "", "", {"display": "none"}
+                return current_step, notification, [], "", "", "", "", {"display": "none"}, no_update
         
         elif current_step == 1:  # Moving from Step 2 to Step 3
             is_valid, error_msg = validate_step2_data(step2_project_name, asset_info)
@@ -321,7 +402,7 @@ def handle_wizard_navigation(
                     "color": "yellow",
                     "icon": "⚠️"
                 }
-                return current_step, {}, {}, {"display": "none"}, step_data, asset_info, notification, [], "", "", "", "", {"display": "none"}, {"display": "none"}
+                return current_step, notification, [], "", "", "", "", {"display": "none"}, no_update
             
             project_asset_id, error = process_step2_to_step3(step2_project_name, met_tower_pair_id, asset_info)
             if error:
@@ -331,31 +412,33 @@ def handle_wizard_navigation(
                     "color": "red",
                     "icon": "❌"
                 }
-                return current_step, {}, {}, {"display": "none"}, step_data, asset_info, notification, [], "", "", "", "", {"display": "none"}, {"display": "none"}
+                return current_step, notification, [], "", "", "", "", {"display": "none"}, no_update
             
             step_data["project_asset_id"] = project_asset_id
             new_step = 2
+            save_wizard_state(session_id, new_step, step_data, asset_info)
             return (
-                new_step, {}, {"display": "none"}, {}, step_data, asset_info, {},
-                [], "", "", "", "", {"display": "none"}
+                new_step, {},
+                [], "", "", "", "", {"display": "none"}, no_update
             )
         elif current_step == 2: # Moving from Step 3 to Step 4
             print("DEBUG: Validating and processing Step 3 data before moving to Step 4.")
             is_valid_s3, error_msg_s3 = validate_step3_data(s3_latitude, s3_longitude, s3_elevation)
             if not is_valid_s3:
                 notification = {"title": "Validation Error (Step 3)", "message": error_msg_s3, "color": "yellow", "icon": "⚠️"}
-                return current_step, {}, {}, {"display": "none"}, step_data, asset_info, notification, [], "", "", "", "", {"display": "none"}
+                return current_step, notification, [], "", "", "", "", {"display": "none"}, no_update
 
             s3_notification, _log_entry, s3_error = process_step3_completion(s3_latitude, s3_longitude, s3_elevation, step_data, asset_info)
             
             if s3_error:
-                return current_step, {}, {}, {"display": "none"}, step_data, asset_info, s3_notification, [], "", "", "", "", {"display": "none"}, {"display": "none"}
+                return current_step, s3_notification, [], "", "", "", "", {"display": "none"}, no_update
 
             notification = s3_notification 
             new_step = 3 
+            save_wizard_state(session_id, new_step, step_data, asset_info)
             return (
-                new_step, {}, {"display": "none"}, {}, step_data, asset_info, notification,
-                [], "", "", "", "", {"display": "none"}
+                new_step, notification,
+                [], "", "", "", "", {"display": "none"}, no_update
             )
         else: 
             new_step = min(current_step + 1, 3) 
@@ -366,50 +449,27 @@ def handle_wizard_navigation(
         new_step = current_step
         # loading_style_output remains {"display": "none"}
 
-    prev_style = {} if new_step > 0 else {"display": "none"}
-    if new_step == 0:
-        next_style = {}
-        complete_style = {"display": "none"}
-    elif new_step == 1:
-        asset_type_id_for_style = asset_info.get("asset_type_id") if asset_info else None
-        if asset_type_id_for_style and int(asset_type_id_for_style) in [2, 3] and not met_tower_pair_id:
-             next_style = {"display": "none"}
-        else:
-            next_style = {}
-        complete_style = {"display": "none"}
-    elif new_step == 2:
-        next_style = {}
-        complete_style = {"display": "none"} # Was {}, changed to hide on step 3 next
-    elif new_step == 3:
-        next_style = {"display": "none"}
-        complete_style = {}
-    else:
-        next_style = {}
-        complete_style = {"display": "none"}
+    if new_step != current_step and asset_info:
+        save_wizard_state(session_id, new_step, step_data, asset_info)
 
     # The variable `loading_visible` from the original code is effectively always False in this path
     # So, loading_style_output will be {"display": "none"}
-    return new_step, prev_style, next_style, complete_style, step_data, asset_info, notification, [], "", "", "", "", {"display": "none"}
+    return new_step, notification, [], "", "", "", "", {"display": "none"}, no_update
 
-# Callback to populate Met Tower dropdown and enable Next button
+# Callback to populate the Met Tower dropdown (Next button visibility is clientside)
 @callback(
+    Output("step2-met-tower-dropdown", "data"),
+    Input("step2-project-dropdown", "value"),
     [
-        Output("step2-met-tower-dropdown", "data"),
-        Output("wizard-next-btn", "style", allow_duplicate=True)
-    ],
-    [
-        Input("step2-project-dropdown", "value"),
-        Input("step2-met-tower-dropdown", "value")
-    ],
-    [
-        State("created-asset-info", "data"),
+        State("session-id", "data"),
         State("asset-wizard-stepper", "active")
     ],
     prevent_initial_call=True
 )
-def update_met_tower_dropdown_and_next_button(selected_project, met_tower_selection, asset_info, current_step):
+def update_met_tower_dropdown(selected_project, session_id, current_step):
     if current_step != 1:  # Only active on Step 2
-        return [], {}
+        return []
+    _, _, asset_info = load_wizard_state(session_id)
     
     met_tower_options = [{"label": "Standalone", "value": "standalone"}]
     
@@ -423,10 +483,26 @@ def update_met_tower_dropdown_and_next_button(selected_project, met_tower_select
         except Exception as e:
             print(f"Error loading Met Towers: {e}")
     
-    asset_type_id = asset_info.get("asset_type_id") if asset_info else None
-    if asset_type_id and int(asset_type_id) in [2, 3]:
-        next_style = {} if met_tower_selection else {"display": "none"}
-    else:
-        next_style = {}
-    
-    return met_tower_options, next_style
+    return met_tower_options
+
+# Callback warning about existing assets near the Step 3 location (inputs are debounced)
+@callback(
+    [
+        Output("step3-nearby-alert", "children"),
+        Output("step3-nearby-alert", "style")
+    ],
+    [
+        Input("step3-latitude-input", "value"),
+        Input("step3-longitude-input", "value")
+    ],
+    State("session-id", "data"),
+    prevent_initial_call=True
+)
+def check_nearby_assets(latitude, longitude, session_id):
+    is_valid, _ = validate_step3_data(latitude, longitude, 0)
+    if not is_valid:
+        return create_nearby_assets_warning([])
+    _, step_data, _ = load_wizard_state(session_id)
+    # Going back to Step 3 after saving a location must not warn about the asset itself
+    nearby_assets = find_nearby_assets(latitude, longitude, exclude=step_data.get("project_asset_id"))
+    return create_nearby_assets_warning(nearby_assets)
@@ -3,9 +3,10 @@ Simple Add Asset Modal - Fallback version for testing
 """
 
 import dash_mantine_components as dmc
-from dash import html, dcc, callback, Output, Input, State, ctx
+from dash import html, dcc, callback, Output, Input, State, ctx, no_update
 import pandas as pd
 from DBcontroller import DBcontoller
+from utils.session_store import get_notification_log
 
 dbc_instance = DBcontoller()
 
@@ -146,7 +147,7 @@ def toggle_add_asset_modal(open_btn, cancel_btn, add_btn, is_open):
         Output("modern-asset-type-dropdown", "value", allow_duplicate=True),
         Output("add-asset-notification-store", "data", allow_duplicate=True),
         Output("assets-dashboard-refresh-trigger", "data", allow_duplicate=True),
-        Output("notification-log-store", "data", allow_duplicate=True),
+        Output("notification-log-cursor", "data", allow_duplicate=True),
         Output("modern-add-asset-modal", "opened", allow_duplicate=True)
     ],
     Input("modern-add-asset-btn", "n_clicks"),
@@ -155,10 +156,10 @@ def toggle_add_asset_modal(open_btn, cancel_btn, add_btn, is_open):
     State("modern-asset-type-dropdown", "value"),
     State("modern-asset-name-input", "value"),
     State("assets-dashboard-refresh-trigger", "data"),
-    State("notification-log-store", "data"),
+    State("session-id", "data"),
     prevent_initial_call=True
 )
-def add_new_asset(n_clicks, client_name, project_name, asset_type_id, asset_name, refresh_trigger, log_data):
+def add_new_asset(n_clicks, client_name, project_name, asset_type_id, asset_name, refresh_trigger, session_id):
     if not n_clicks or not client_name or not project_name or not asset_type_id or not asset_name:
         notification = {
             "title": "Warning",
@@ -168,7 +169,7 @@ def add_new_asset(n_clicks, client_name, project_name, asset_type_id, asset_name
         }
         return (
             asset_name, client_name, project_name, asset_type_id,
-            notification, refresh_trigger, log_data or [], True
+            notification, refresh_trigger, no_update, True
         )
     try:
         # Simple asset creation for testing
@@ -180,11 +181,11 @@ def add_new_asset(n_clicks, client_name, project_name, asset_type_id, asset_name
             "color": "green",
             "icon": "✅"
         }
-        log = (log_data or []) + [{
+        log = get_notification_log().add(session_id, {
             "type": "success",
             "message": f"Asset '{asset_name}' was created with ID {new_asset_id}.",
             "timestamp": pd.Timestamp.now().strftime("%Y-%m-%d %H:%M:%S")
-        }]
+        })
         return (
             "", "", "", "",
             notification, (refresh_trigger or 0) + 1, log, False
@@ -196,11 +197,11 @@ def add_new_asset(n_clicks, client_name, project_name, asset_type_id, asset_name
             "color": "red",
             "icon": "❌"
         }
-        log = (log_data or []) + [{
+        log = get_notification_log().add(session_id, {
             "type": "error",
             "message": f"Failed to add asset: {str(e)}",
             "timestamp": pd.Timestamp.now().strftime("%Y-%m-%d %H:%M:%S")
-        }]
+        })
         return (
             asset_name, client_name, project_name, asset_type_id,
             notification, refresh_trigger, log, True
@@ -3,22 +3,75 @@ Step 3: Location Configuration (Modular)
 - Latitude input
 - Longitude input
 - Elevation input
+- Warning when the location is close to an existing asset (utils/nearby_assets.py)
 - Final submission to tbl_project_asset_detail
 """
 
 import dash_mantine_components as dmc
-from dash import html, dcc, callback, Output, Input, State
+from dash import html, dcc
 from DBcontroller import DBcontoller
 import pandas as pd
 import os
 from dotenv import load_dotenv
 import plotly.graph_objects as go
+import threading
+import time
+from utils.nearby_assets import NearbyAssetIndex
 
 load_dotenv() # Load environment variables
 MAPBOX_API_KEY = os.getenv("MAPBOX_API_KEY")
 
 dbc_instance = DBcontoller()
 
+# Latitude/longitude only update the map after typing pauses this long
+MAP_INPUT_DEBOUNCE_MS = 400
+
+# Existing assets closer than this to the entered location are listed in a warning
+NEARBY_ASSET_RADIUS_M = float(os.getenv("NEARBY_ASSET_RADIUS_M", 250))
+# The index is rebuilt from the (cached) asset coordinates this often, so locations added or
+# corrected elsewhere (other workers, the details editor) are picked up
+NEARBY_INDEX_TTL = float(os.getenv("NEARBY_INDEX_TTL", 300))
+
+_nearby_index = None
+_nearby_index_built_at = None
+_nearby_index_lock = threading.Lock()
+
+def get_nearby_asset_index():
+    """Returns this process' NearbyAssetIndex, built from every located asset on first use and after NEARBY_INDEX_TTL"""
+    global _nearby_index, _nearby_index_built_at
+    with _nearby_index_lock:
+        if _nearby_index is None or time.monotonic() - _nearby_index_built_at > NEARBY_INDEX_TTL:
+            _nearby_index = NearbyAssetIndex(dbc_instance.getAssetCoordinates())
+            _nearby_index_built_at = time.monotonic()
+        return _nearby_index
+
+def find_nearby_assets(latitude, longitude, exclude=None):
+    """Existing assets within NEARBY_ASSET_RADIUS_M of a location, nearest first ([] on error)"""
+    if latitude is None or longitude is None:
+        return []
+    try:
+        return get_nearby_asset_index().nearby(float(latitude), float(longitude), NEARBY_ASSET_RADIUS_M, exclude=exclude)
+    except Exception as e:
+        print(f"Error checking for nearby assets: {e}")
+        return []
+
+def create_nearby_assets_warning(nearby_assets):
+    """Alert children and style for the Step 3 nearby-asset warning (hidden when nothing is nearby)"""
+    if not nearby_assets:
+        return [], {"display": "none"}
+    lines = [
+        dmc.Text(
+            f"{asset.get('AssetName')} ({asset.get('AssetType') or 'Unknown'}, {asset.get('ClientName')} / {asset.get('ProjectName')}) "
+            f"is {asset['DistanceM']:,.0f} m away",
+            size="sm"
+        )
+        for asset in nearby_assets[:5]
+    ]
+    if len(nearby_assets) > 5:
+        lines.append(dmc.Text(f"and {len(nearby_assets) - 5} more", size="sm", color="dimmed"))
+    lines.append(dmc.Text("Check this isn't a duplicate, or an existing tower this asset should be paired with.", size="xs", color="dimmed"))
+    return lines, {}
+
 def create_step3_layout():
     """Create the layout for Step 3: Location Details"""
     return dmc.Stack(
@@ -31,6 +84,12 @@ def create_step3_layout():
                 id="step3-success-alert",
                 style={"display": "none"}
             ),
+            dmc.Alert(
+                id="step3-nearby-alert",
+                title=f"Existing assets within {NEARBY_ASSET_RADIUS_M:,.0f} m",
+                color="yellow",
+                style={"display": "none"}
+            ),
             dmc.Text(
                 "Enter the geographic location and elevation for this asset. The map will update as you type.",
                 size="sm", # Smaller text
@@ -54,6 +113,7 @@ def create_step3_layout():
                                         step=0.000001,
                                         min=-90,
                                         max=90,
+                                        debounce=MAP_INPUT_DEBOUNCE_MS,
                                         required=True,
                                         style={"width": "100%"}
                                     ),
@@ -65,6 +125,7 @@ def create_step3_layout():
                                         step=0.000001,
                                         min=-180,
                                         max=180,
+                                        debounce=MAP_INPUT_DEBOUNCE_MS,
                                         required=True,
                                         style={"width": "100%"}
                                     ),
@@ -101,7 +162,17 @@ def create_step3_layout():
                                         id="step3-mapbox-map",
                                         style={"height": "100%", "width": "100%"},
                                         config={'displayModeBar': False}, # Hide mode bar for cleaner look
+                                        # Trace 0 is the asset marker, moved clientside as coordinates are typed
+                                        # (window.dash_clientside.asset_map.update_marker, registered in newApp.py)
                                         figure=go.Figure(
+                                            data=[go.Scattermapbox(
+                                                lat=[],
+                                                lon=[],
+                                                mode='markers',
+                                                marker=go.scattermapbox.Marker(size=14, color='red'),
+                                                text=['Asset Location'],
+                                                hoverinfo='text'
+                                            )],
                                             layout=go.Layout(
                                                 mapbox_style="streets",  # Show US with roads/labels on load
                                                 mapbox_accesstoken=MAPBOX_API_KEY,
@@ -122,59 +193,6 @@ def create_step3_layout():
         ]
     )
 
-# Callback to update Mapbox map based on Lat/Lon input
-@callback(
-    Output("step3-mapbox-map", "figure"),
-    [Input("step3-latitude-input", "value"),
-     Input("step3-longitude-input", "value")],
-    [State("step3-mapbox-map", "figure")] # Keep existing figure state for smooth updates
-)
-def update_map_on_lat_lon_change(latitude, longitude, current_figure):
-    if MAPBOX_API_KEY is None:
-        # Return a placeholder or error message if API key is missing
-        current_figure['layout']['annotations'] = [dict(text="Mapbox API Key Missing", showarrow=False)]
-        return current_figure
-
-    # Default view if lat or lon is not provided or invalid
-    map_center_lat = 39.8283  # US Center
-    map_center_lon = -98.5795
-    map_zoom = 3
-    markers = []
-
-    if latitude is not None and longitude is not None:
-        try:
-            lat_val = float(latitude)
-            lon_val = float(longitude)
-            if -90 <= lat_val <= 90 and -180 <= lon_val <= 180:
-                map_center_lat = lat_val
-                map_center_lon = lon_val
-                map_zoom = 7  # Zoomed out more to show roads/labels
-                markers = [go.Scattermapbox(
-                    lat=[lat_val],
-                    lon=[lon_val],
-                    mode='markers',
-                    marker=go.scattermapbox.Marker(
-                        size=14,
-                        color='red' 
-                    ),
-                    text=['Asset Location'],
-                    hoverinfo='text'
-                )]
-        except ValueError:
-            pass # Keep default view if conversion fails
-
-    layout = go.Layout(
-        mapbox_style="streets",  # Use "streets" for more road/label detail
-        mapbox_accesstoken=MAPBOX_API_KEY,
-        mapbox_center={"lat": map_center_lat, "lon": map_center_lon},
-        mapbox_zoom=map_zoom,
-        margin={"r":0,"t":0,"l":0,"b":0},
-        paper_bgcolor="#1A1B1E", # Match paper background
-        uirevision=' giữ nguyên ' # Preserve UI state like zoom on update
-    )
-    
-    return {"data": markers, "layout": layout}
-
 def validate_step3_data(latitude, longitude, elevation):
     if latitude is None or longitude is None or elevation is None:
         return False, "All location fields are required."
@@ -198,6 +216,17 @@ def process_step3_completion(latitude, longitude, elevation, step_data, asset_in
             success_count += 1
         if dbc_instance.add_project_asset_detail(project_asset_id, "Elevation", str(elevation)):
             success_count += 1
+        # Later wizards warn about this location without rebuilding the index (only once it is saved)
+        if success_count == 3:
+            try:
+                get_nearby_asset_index().add(latitude, longitude, {
+                    "ProjectAssetID": project_asset_id,
+                    "AssetName": asset_info.get("asset_name"),
+                    "ClientName": asset_info.get("client_name"),
+                    "ProjectName": asset_info.get("project_name"),
+                })
+            except Exception as e:
+                print(f"Error adding asset {project_asset_id} to the nearby-asset index: {e}")
         notification = {
             "title": "Asset Configuration Complete!",
             "message": f"Asset '{asset_info.get('asset_name')}' has been fully configured with location details.",
@@ -7,9 +7,10 @@ Modern Add Client Modal for Dash Mantine Dashboard
 """
 
 import dash_mantine_components as dmc
-from dash import html, dcc, callback, Output, Input, State
+from dash import html, dcc, callback, Output, Input, State, no_update
 import pandas as pd
 from DBcontroller import DBcontoller
+from utils.session_store import get_notification_log
 
 dbc_instance = DBcontoller()
 
@@ -56,48 +57,25 @@ def create_add_client_modal():
     )
 
 # Callback to handle modal open/close
-@callback(
-    Output("add-client-notification-store", "data", allow_duplicate=True),
-    Input("add-client-notification-store", "data"),
-    prevent_initial_call=True
-)
-def clientside_show_notification(notification):
-    # This is a placeholder for a clientside callback in assets/ that will call window.dash_mantine_components.showNotification
-    return notification
-
-# Callback to handle modal open/close
-@callback(
-    Output("modern-add-client-modal", "opened"),
-    [Input("open-modern-add-client-btn", "n_clicks"),
-     Input("modern-cancel-client-btn", "n_clicks"),
-     Input("modern-add-client-btn", "n_clicks")],
-    [State("modern-add-client-modal", "opened")],
-    prevent_initial_call=True
-)
-def toggle_add_client_modal(open_sidebar, cancel, add, is_open):
-    from dash import ctx
-    if ctx.triggered_id == "open-modern-add-client-btn":
-        return True
-    elif ctx.triggered_id in ["modern-cancel-client-btn", "modern-add-client-btn"]:
-        return False
-    return is_open
+# Modal open/close and the toast are clientside callbacks (assets/ui.js, assets/clients_notification.js),
+# registered in newApp.py
 
 # Callback to handle adding a new client
 @callback(
     [Output("modern-client-name-input", "value"),
      Output("add-client-notification-store", "data"),
-     Output("notification-log-store", "data", allow_duplicate=True),
+     Output("notification-log-cursor", "data", allow_duplicate=True),
      Output("clients-refresh-trigger", "data")],
     [Input("modern-add-client-btn", "n_clicks")],
     [State("modern-client-name-input", "value"),
      State("add-client-notification-store", "data"),
-     State("notification-log-store", "data"),
+     State("session-id", "data"),
      State("clients-refresh-trigger", "data")],
     prevent_initial_call=True
 )
-def add_new_client(n_clicks, client_name, toast_data, log_data, current_trigger):
+def add_new_client(n_clicks, client_name, toast_data, session_id, current_trigger):
     if not n_clicks or not client_name:
-        return "", {}, log_data or [], current_trigger
+        return "", {}, no_update, current_trigger
     try:
         dbc_instance.addClient(client_name, "1")
         notification = {
@@ -106,11 +84,11 @@ def add_new_client(n_clicks, client_name, toast_data, log_data, current_trigger)
             "color": "green",
             "icon": "✅"
         }
-        log = (log_data or []) + [{
+        log = get_notification_log().add(session_id, {
             "type": "success",
             "message": f"Client '{client_name}' was added successfully.",
             "timestamp": pd.Timestamp.now().strftime("%Y-%m-%d %H:%M:%S")
-        }]
+        })
         return "", notification, log, current_trigger + 1
     except ValueError as e:
         notification = {
@@ -119,11 +97,11 @@ def add_new_client(n_clicks, client_name, toast_data, log_data, current_trigger)
             "color": "yellow",
             "icon": "⚠️"
         }
-        log = (log_data or []) + [{
+        log = get_notification_log().add(session_id, {
             "type": "warning",
             "message": str(e),
             "timestamp": pd.Timestamp.now().strftime("%Y-%m-%d %H:%M:%S")
-        }]
+        })
         return client_name, notification, log, current_trigger
     except Exception as e:
         notification = {
@@ -132,9 +110,9 @@ def add_new_client(n_clicks, client_name, toast_data, log_data, current_trigger)
             "color": "red",
             "icon": "❌"
         }
-        log = (log_data or []) + [{
+        log = get_notification_log().add(session_id, {
             "type": "error",
             "message": f"Failed to add client: {str(e)}",
             "timestamp": pd.Timestamp.now().strftime("%Y-%m-%d %H:%M:%S")
-        }]
+        })
         return client_name, notification, log, current_trigger
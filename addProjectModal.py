@@ -11,6 +11,7 @@ import dash_mantine_components as dmc
 from dash import html, dcc, callback, Output, Input, State, ALL
 import pandas as pd
 from DBcontroller import DBcontoller
+from utils.session_store import get_notification_log
 
 dbc_instance = DBcontoller()
 
@@ -64,37 +65,8 @@ def create_add_project_modal():
         ]
     )
 
-@callback(
-    Output("add-project-notification-store", "data", allow_duplicate=True),
-    Input("add-project-notification-store", "data"),
-    prevent_initial_call=True
-)
-def clientside_show_project_notification(notification):
-    if notification:
-        return notification
-    return dash.no_update
-
-@callback(
-    Output("modern-add-project-modal", "opened"),
-    [Input("quick-add-project-btn", "n_clicks"),
-     Input({"type": "add-project-to-client-btn", "client": ALL}, "n_clicks")],
-    [State("modern-add-project-modal", "opened")],
-    prevent_initial_call=True,
-)
-def open_project_modal(quick_clicks, client_clicks, is_open):
-    from dash import ctx
-    if any(c is not None and c > 0 for c in client_clicks) or (quick_clicks is not None and quick_clicks > 0):
-        return True
-    return is_open
-
-@callback(
-    Output("modern-add-project-modal", "opened", allow_duplicate=True),
-    [Input("modern-cancel-project-btn", "n_clicks"),
-     Input("modern-add-project-btn", "n_clicks")],
-    prevent_initial_call=True,
-)
-def close_project_modal(cancel_clicks, add_clicks):
-    return False
+# Modal open/close and the toast are clientside callbacks (assets/ui.js, assets/clients_notification.js),
+# registered in newApp.py
 
 @callback(
     Output("modern-project-client-dropdown", "value"),
@@ -117,17 +89,17 @@ def preselect_client_from_card(n_clicks):
      Output("modern-project-client-dropdown", "value", allow_duplicate=True),
      Output("add-project-notification-store", "data", allow_duplicate=True),
      Output("projects-dashboard-refresh-trigger", "data"),
-     Output("notification-log-store", "data", allow_duplicate=True)],
+     Output("notification-log-cursor", "data", allow_duplicate=True)],
     [Input("modern-add-project-btn", "n_clicks")],
     [State("modern-project-client-dropdown", "value"),
      State("modern-project-name-input", "value"),
      State("projects-dashboard-refresh-trigger", "data"),
-     State("notification-log-store", "data")],
+     State("session-id", "data")],
     prevent_initial_call=True
 )
-def add_new_project(n_clicks, client_name, project_name, refresh_trigger, log_data):
+def add_new_project(n_clicks, client_name, project_name, refresh_trigger, session_id):
         if not n_clicks or not client_name or not project_name:
-            return "", "", dash.no_update, refresh_trigger, log_data or []
+            return "", "", dash.no_update, refresh_trigger, dash.no_update
         try:
             print(f"Adding project '{project_name}' to client '{client_name}'...")
             dbc_instance.addProject(project_name, client_name)
@@ -138,11 +110,11 @@ def add_new_project(n_clicks, client_name, project_name, refresh_trigger, log_da
                 "color": "green",
                 "icon": "✅"
             }
-            log = (log_data or []) + [{
+            log = get_notification_log().add(session_id, {
                 "type": "success",
                 "message": f"Project '{project_name}' was added to '{client_name}'.",
                 "timestamp": pd.Timestamp.now().strftime("%Y-%m-%d %H:%M:%S")
-            }]
+            })
             return "", "", notification, (refresh_trigger or 0) + 1, log
         except ValueError as e:
             print(f"ValueError adding project: {e}")
@@ -152,11 +124,11 @@ def add_new_project(n_clicks, client_name, project_name, refresh_trigger, log_da
                 "color": "yellow",
                 "icon": "⚠️"
             }
-            log = (log_data or []) + [{
+            log = get_notification_log().add(session_id, {
                 "type": "warning",
                 "message": str(e),
                 "timestamp": pd.Timestamp.now().strftime("%Y-%m-%d %H:%M:%S")
-            }]
+            })
             return project_name, client_name, notification, refresh_trigger, log
         except Exception as e:
             print(f"Exception adding project: {e}")
@@ -166,9 +138,9 @@ def add_new_project(n_clicks, client_name, project_name, refresh_trigger, log_da
                 "color": "red",
                 "icon": "❌"
             }
-            log = (log_data or []) + [{
+            log = get_notification_log().add(session_id, {
                 "type": "error",
                 "message": f"Failed to add project: {str(e)}",
                 "timestamp": pd.Timestamp.now().strftime("%Y-%m-%d %H:%M:%S")
-            }]
+            })
             return project_name, client_name, notification, refresh_trigger, log
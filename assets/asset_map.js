@@ -0,0 +1,24 @@
+if (window.dash_clientside === undefined) { window.dash_clientside = {}; }
+window.dash_clientside.asset_map = {
+    // Moves the Step 3 marker and map center to the typed coordinates without a server round trip.
+    // Only the marker trace and the mapbox center/zoom change; the rest of the figure is reused.
+    update_marker: function (latitude, longitude, figure) {
+        if (!figure) {
+            return window.dash_clientside.no_update;
+        }
+        var lat = parseFloat(latitude);
+        var lon = parseFloat(longitude);
+        var valid = !isNaN(lat) && !isNaN(lon) && lat >= -90 && lat <= 90 && lon >= -180 && lon <= 180;
+
+        var layout = Object.assign({}, figure.layout);
+        layout.mapbox = Object.assign({}, layout.mapbox, valid
+            ? {center: {lat: lat, lon: lon}, zoom: 7}
+            : {center: {lat: 39.8283, lon: -98.5795}, zoom: 3});  // US center
+        // A new uirevision per location recenters the map; user pan/zoom is kept otherwise
+        layout.uirevision = valid ? lat + "," + lon : "default";
+
+        var data = (figure.data || []).slice();
+        data[0] = Object.assign({}, data[0], {lat: valid ? [lat] : [], lon: valid ? [lon] : []});
+        return {data: data, layout: layout};
+    }
+}
@@ -0,0 +1,13 @@
+if (window.dash_clientside === undefined) { window.dash_clientside = {}; }
+window.dash_clientside.session = {
+    // Creates the tab's session id on first load; sessionStorage keeps it across reloads
+    ensure_id: function (pathname, session_id) {
+        if (session_id) {
+            return window.dash_clientside.no_update;
+        }
+        if (window.crypto && window.crypto.randomUUID) {
+            return window.crypto.randomUUID();
+        }
+        return Date.now().toString(36) + "-" + Math.random().toString(36).slice(2);
+    }
+}
@@ -0,0 +1,11 @@
+if (window.dash_clientside === undefined) { window.dash_clientside = {}; }
+window.dash_clientside.timeseries_chart = {
+    // Reports the graph's pixel width so the server downsamples to exactly what can be drawn
+    measure_width: function (asset_value) {
+        var graph = document.getElementById("timeseries-chart-graph");
+        if (!graph || !graph.offsetWidth) {
+            return window.dash_clientside.no_update;
+        }
+        return Math.round(graph.offsetWidth * (window.devicePixelRatio || 1));
+    }
+}
@@ -0,0 +1,75 @@
+if (window.dash_clientside === undefined) { window.dash_clientside = {}; }
+window.dash_clientside.ui = {
+    // Id of the component that fired the callback ("" on initial call); pattern ids come back as JSON strings
+    _triggered: function () {
+        var triggered = window.dash_clientside.callback_context.triggered;
+        if (!triggered || !triggered.length || !triggered[0].value) {
+            return "";
+        }
+        return triggered[0].prop_id.split(".")[0];
+    },
+
+    // Add client modal: opens from the clients page button, closes on Cancel / Add
+    toggle_client_modal: function (open_clicks, cancel_clicks, add_clicks, is_open) {
+        var id = window.dash_clientside.ui._triggered();
+        if (id === "open-modern-add-client-btn") {
+            return true;
+        }
+        if (id === "modern-cancel-client-btn" || id === "modern-add-client-btn") {
+            return false;
+        }
+        return is_open;
+    },
+
+    // Add project modal: opens from the quick add button or a client card's add button
+    open_project_modal: function (quick_clicks, client_clicks, is_open) {
+        var clicked = (client_clicks || []).some(function (c) { return c; });
+        if (clicked || quick_clicks) {
+            return true;
+        }
+        return is_open;
+    },
+
+    close_modal: function () {
+        return false;
+    },
+
+    // Add asset wizard: opens on quick add; Cancel closes it and resets the stepper
+    // (resume_wizard_session then clears the server-side wizard state)
+    toggle_asset_modal: function (open_clicks, cancel_clicks) {
+        var no_update = window.dash_clientside.no_update;
+        var id = window.dash_clientside.ui._triggered();
+        if (id === "quick-add-asset-btn") {
+            return [true, no_update];
+        }
+        if (id === "modern-cancel-asset-btn") {
+            return [false, 0];
+        }
+        return [no_update, no_update];
+    },
+
+    // Wizard Previous / Next / Complete visibility from the active step. On Step 2, lidars and
+    // sodars (AssetTypeID 2 or 3) need a MET tower selection before Next appears.
+    wizard_buttons: function (step, met_tower_value, asset_type_id) {
+        var hidden = {"display": "none"};
+        var prev = step > 0 ? {} : hidden;
+        if (step === 1) {
+            var needs_pairing = [2, 3].indexOf(Number(asset_type_id)) !== -1 && !met_tower_value;
+            return [prev, needs_pairing ? hidden : {}, hidden];
+        }
+        if (step === 3) {
+            return [prev, hidden, {}];
+        }
+        return [prev, {}, hidden];
+    },
+
+    // Notification bell badge from the server-side log's {cursor, count}
+    notification_badge: function (log_cursor) {
+        var count = (log_cursor && log_cursor.count) || 0;
+        var style = {
+            "position": "absolute", "top": 2, "right": 2, "pointerEvents": "none", "zIndex": 10, "fontSize": 10, "padding": "0 4px",
+            "display": count === 0 ? "none" : "inline-block"
+        };
+        return [String(count), style];
+    }
+}
@@ -9,9 +9,11 @@ Responsibilities:
 """
 
 import dash_mantine_components as dmc
-from dash import html, dcc, callback, Output, Input, State
+from dash import html, dcc, callback, Output, Input, State, Patch, no_update
 from DBcontroller import DBcontoller
 from addAssetModal import create_add_asset_modal
+from utils.asset_status import STATUS_COLORS, DOWN
+from snapshots import get_snapshot, invalidate_snapshots, refresh_snapshots
 
 dbc_instance = DBcontoller()
 
@@ -81,6 +83,52 @@ def create_asset_actions_card():
         ]
     )
 
+def create_asset_row(asset):
+    """Create one asset table row (also used to patch a newly added asset into its project table)"""
+    # Determine asset type display
+    asset_type = asset.get("AssetType") or "Unknown"
+    
+    # Handle MET pairing for Lidars - Enhanced Type & Pairing display
+    if asset_type.upper() == "LIDAR":
+        paired_met = asset.get("PairedMET")
+        if paired_met:
+            type_and_pairing = f"Lidar (→ {paired_met})"
+        else:
+            type_and_pairing = "Lidar (Standalone)"
+    else:
+        # For MET Towers and other asset types, just show the type
+        type_and_pairing = asset_type
+    
+    # Live / Stale / Down from ingest freshness (utils/asset_status.py)
+    status_text = asset.get("Status") or DOWN
+    status_color = STATUS_COLORS.get(status_text, "gray")
+    
+    return html.Tr([
+        html.Td(
+            asset.get("AssetName", "Unknown"), 
+            style={"color": "white", "padding": "8px", "fontWeight": "600"}
+        ),
+        html.Td(
+            type_and_pairing, 
+            style={"color": "white", "padding": "8px"}
+        ),
+        html.Td(
+            dmc.Badge(status_text, color=status_color, variant="light", size="sm"),
+            style={"padding": "8px"}
+        ),
+        html.Td(
+            dmc.Group(
+                spacing="xs",
+                children=[
+                    dmc.Button("View", size="xs", variant="light", color="blue"),
+                    dmc.Button("Edit", size="xs", variant="outline", color="gray"),
+                    dmc.Button("Config", size="xs", variant="outline", color="green")
+                ]
+            ),
+            style={"padding": "8px"}
+        )
+    ])
+
 def create_asset_table_for_project(assets_data):
     """Create an asset table for a specific project"""
     if not assets_data:
@@ -106,54 +154,7 @@ def create_asset_table_for_project(assets_data):
             ]
         )
     
-    # Create asset table rows
-    table_rows = []
-    for asset in assets_data:
-        # Determine asset type display
-        asset_type = asset.get("AssetType", "Unknown")
-        
-        # Handle MET pairing for Lidars - Enhanced Type & Pairing display
-        if asset_type.upper() == "LIDAR":
-            paired_met = asset.get("PairedMET")
-            if paired_met:
-                type_and_pairing = f"Lidar (→ {paired_met})"
-            else:
-                type_and_pairing = "Lidar (Standalone)"
-        else:
-            # For MET Towers and other asset types, just show the type
-            type_and_pairing = asset_type
-        
-        # Placeholder status (will be replaced with ClickUp integration later)
-        status_color = "green" if asset.get("Status", "Active") == "Active" else "yellow"
-        status_text = asset.get("Status", "Active")
-        
-        table_rows.append(
-            html.Tr([
-                html.Td(
-                    asset.get("AssetName", "Unknown"), 
-                    style={"color": "white", "padding": "8px", "fontWeight": "600"}
-                ),
-                html.Td(
-                    type_and_pairing, 
-                    style={"color": "white", "padding": "8px"}
-                ),
-                html.Td(
-                    dmc.Badge(status_text, color=status_color, variant="light", size="sm"),
-                    style={"padding": "8px"}
-                ),
-                html.Td(
-                    dmc.Group(
-                        spacing="xs",
-                        children=[
-                            dmc.Button("View", size="xs", variant="light", color="blue"),
-                            dmc.Button("Edit", size="xs", variant="outline", color="gray"),
-                            dmc.Button("Config", size="xs", variant="outline", color="green")
-                        ]
-                    ),
-                    style={"padding": "8px"}
-                )
-            ])
-        )
+    table_rows = [create_asset_row(asset) for asset in assets_data]
     
     return dmc.Table(
         striped=True,
@@ -179,6 +180,11 @@ def create_assets_dashboard_layout():
         children=[
             create_add_asset_modal(),
             dcc.Store(id="assets-dashboard-refresh-trigger", data=0),
+            # What the rendered dashboard shows (card order, per-project counts, totals), so a write
+            # can patch the page in place instead of re-rendering it (see patch_assets_dashboard)
+            dcc.Store(id="assets-dashboard-index"),
+            # Set by the add asset wizard with the new asset's row
+            dcc.Store(id="assets-dashboard-new-asset"),
             
             # Header Section
             dmc.Stack(
@@ -227,19 +233,27 @@ def refresh_assets_data(n_clicks, current_trigger):
     [Output("total-assets-card", "children"),
      Output("met-towers-card", "children"),
      Output("lidars-card", "children"),
-     Output("assets-list-container", "children")],
+     Output("assets-list-container", "children"),
+     Output("assets-dashboard-index", "data")],
     Input("assets-dashboard-refresh-trigger", "data")
 )
 def update_assets_dashboard(refresh_trigger):
+    # Snapshots are precomputed in the background; a refresh (button or after adding an asset) reloads them
+
     # Get asset counts for metrics
     try:
-        counts = dbc_instance.getAssetCounts()
+        if refresh_trigger:
+            snapshot, = refresh_snapshots("assets_dashboard")
+        else:
+            snapshot = get_snapshot("assets_dashboard")
+        counts = snapshot["asset_counts"]
         total_assets = counts["TotalAssets"]
         met_towers = counts["MetTowers"]
         lidars = counts["Lidars"]
     except Exception as e:
         print(f"Error getting asset counts: {e}")
         total_assets = met_towers = lidars = 0
+        counts = None
     
     # Create metrics cards (consistent styling, no emojis)
     total_assets_card = create_asset_metrics_card("Total Assets", total_assets)
@@ -248,24 +262,106 @@ def update_assets_dashboard(refresh_trigger):
     
     # Get hierarchical asset data (Client -> Project -> Assets)
     try:
-        # This will need a new database method - for now, let's create a placeholder
+        # Same snapshot as the counts above, so this never reloads it a second time
         assets_data = get_assets_by_client_and_project()
         asset_cards = create_client_project_asset_cards(assets_data)
     except Exception as e:
         print(f"Error getting assets data: {e}")
+        assets_data = None
         asset_cards = dmc.Alert(
             "Error loading asset data. Please check database connection.",
             title="Database Error",
             color="red"
         )
     
-    return total_assets_card, met_towers_card, lidars_card, asset_cards
+    # No index when something failed or the empty placeholder is shown: the next write reloads instead
+    index = None
+    if counts is not None and assets_data:
+        index = {
+            "cards": [[client_name, project_name, len(project_assets)]
+                      for client_name, projects in assets_data.items()
+                      for project_name, project_assets in projects.items()],
+            "totals": {"TotalAssets": int(total_assets), "MetTowers": int(met_towers), "Lidars": int(lidars)},
+        }
+    
+    return total_assets_card, met_towers_card, lidars_card, asset_cards, index
+
+# Metric card for each asset type counted in get_asset_counts (AssetTypeID -> totals key, card id)
+METRIC_CARDS_BY_ASSET_TYPE = {
+    1: ("MetTowers", "met-towers-card"),
+    2: ("Lidars", "lidars-card"),
+}
+
+@callback(
+    [Output("total-assets-card", "children", allow_duplicate=True),
+     Output("met-towers-card", "children", allow_duplicate=True),
+     Output("lidars-card", "children", allow_duplicate=True),
+     Output("assets-list-container", "children", allow_duplicate=True),
+     Output("assets-dashboard-index", "data", allow_duplicate=True),
+     Output("assets-dashboard-refresh-trigger", "data", allow_duplicate=True)],
+    Input("assets-dashboard-new-asset", "data"),
+    [State("assets-dashboard-index", "data"),
+     State("assets-dashboard-refresh-trigger", "data")],
+    prevent_initial_call=True
+)
+def patch_assets_dashboard(new_asset, index, refresh_trigger):
+    """
+    Adds a newly created asset to the rendered dashboard with dash.Patch: its row is appended to
+    the project's table and the counters are bumped, so the browser receives one row instead of
+    every card. Falls back to a full reload when the project has no card on the page yet.
+    """
+    if not new_asset:
+        return [no_update] * 6
+
+    key = [new_asset.get("ClientName"), new_asset.get("ProjectName")]
+    position = None
+    if index:
+        position = next((i for i, card in enumerate(index["cards"]) if card[:2] == key), None)
+    if position is None:
+        return [no_update] * 5 + [(refresh_trigger or 0) + 1]
+
+    # Other views and workers rebuild their snapshots in the background
+    invalidate_snapshots()
+
+    card = index["cards"][position]
+    card[2] += 1
+    totals = index["totals"]
+    totals["TotalAssets"] += 1
+
+    # Paths follow create_client_project_asset_cards / create_asset_table_for_project:
+    # Stack -> Paper(Group(Stack(Title, Text), Tooltip), Table(Thead, Tbody(rows)))
+    cards = Patch()
+    project_card = cards["props"]["children"][position]["props"]["children"]
+    project_card[1]["props"]["children"][1]["props"]["children"].append(create_asset_row(new_asset))
+    project_card[0]["props"]["children"][0]["props"]["children"][1]["props"]["children"] = f"{card[1]} ({card[2]} assets)"
+
+    metric_cards = {"total-assets-card": _patch_metric_value(totals["TotalAssets"])}
+    type_card = METRIC_CARDS_BY_ASSET_TYPE.get(new_asset.get("AssetTypeID"))
+    if type_card:
+        totals_key, card_id = type_card
+        totals[totals_key] += 1
+        metric_cards[card_id] = _patch_metric_value(totals[totals_key])
+
+    return (
+        metric_cards["total-assets-card"],
+        metric_cards.get("met-towers-card", no_update),
+        metric_cards.get("lidars-card", no_update),
+        cards,
+        index,
+        no_update,
+    )
+
+def _patch_metric_value(value):
+    """Patch for the value Text of a create_asset_metrics_card card"""
+    patch = Patch()
+    patch["props"]["children"][0]["props"]["children"][1]["props"]["children"] = str(value)
+    return patch
 
-def get_assets_by_client_and_project():
-    """Get assets organized by client and project from database"""
+def get_assets_by_client_and_project(fresh=False):
+    """Get assets organized by client and project from the precomputed snapshot"""
     try:
-        # Get detailed asset data from database
-        assets_data = dbc_instance.getClientsProjectsAssetsDetailed()
+        # Detailed asset data (with precomputed ingest status), see snapshots.py
+        assets_data = get_snapshot("assets_dashboard", fresh=fresh)["assets_detailed"]
         
         # Organize data by client and project
         organized_data = {}
@@ -286,7 +382,7 @@ def get_assets_by_client_and_project():
             asset_info = {
                 "AssetName": asset["AssetName"],
                 "AssetType": asset["AssetType"],
-                "Status": "Active",  # Placeholder status for now
+                "Status": asset["Status"],
                 "PairedMET": asset["PairedMET"]
             }
             
@@ -0,0 +1,159 @@
+"""
+Background jobs module for the modernized Dash app.
+
+Responsibilities:
+- Runs long operations (drop-folder ingest backfill, Gmail ingest, asset status
+  rebuild) as Dash background callbacks, in a separate process managed by a
+  DiskcacheManager, so the workers serving dashboards stay responsive
+- Reports progress to a progress bar while the job runs
+- Cancel button terminates the job process
+
+The diskcache directory is read from BACKGROUND_CACHE_DIR (defaults to ./.dash_background_cache).
+"""
+
+import os
+import time
+
+import diskcache
+import dash_mantine_components as dmc
+from dash import html, callback, DiskcacheManager, Output, Input, State
+
+from DBcontroller import DBcontoller
+from utils.asset_status import get_status_service
+from utils.folder_watcher import FolderWatcher, roots_from_ingest_configs
+from utils.gmail_ingest import GmailAttachmentPipeline
+from utils.gmail_utils import get_gmail_service
+from utils.ingest_engine import get_store
+from utils.ingest_manifest import IngestManifest
+from utils.ingest_scheduler import IngestScheduler
+
+dbc_instance = DBcontoller()
+
+background_cache = diskcache.Cache(os.getenv("BACKGROUND_CACHE_DIR", ".dash_background_cache"))
+background_callback_manager = DiskcacheManager(background_cache)
+
+JOBS = {
+    "folder_backfill": "Drop folder backfill (Dropbox / Altosphere)",
+    "gmail_ingest": "Gmail attachment ingest",
+    "status_rebuild": "Recompute asset status",
+}
+
+
+def run_folder_backfill(report):
+    """Sweeps every configured drop folder and ingests new or changed files. report(done, total, text)."""
+    roots = roots_from_ingest_configs(dbc_instance.getIngestConfigs())
+    scheduler = IngestScheduler(manifest=IngestManifest())
+    watcher = FolderWatcher(roots, scheduler.submit, use_inotify=False)
+    try:
+        report(0, 1, f"Scanning {len(roots)} folders...")
+        sweep = watcher.sweep(full=True)
+        while not scheduler.wait(timeout=1.0):
+            stats = scheduler.stats()
+            report(stats["completed"] + stats["failed"], stats["submitted"],
+                   f"{stats['completed']:,} ingested, {stats['failed']:,} failed, {stats['files_per_second']:.1f} files/s")
+        stats = scheduler.stats()
+    finally:
+        scheduler.shutdown()
+        watcher.close()
+    return (f"Scanned {sweep['directories']:,} folders: {stats['completed']:,} files ingested, "
+            f"{stats['skipped']:,} duplicates skipped, {stats['failed']:,} failed.")
+
+
+def run_gmail_ingest(report):
+    """Ingests new attachments under every configured Gmail label. report(done, total, text)."""
+    configs = [c for c in dbc_instance.getIngestConfigs() if c.get("GmailFolderID")]
+    pipeline = GmailAttachmentPipeline(get_gmail_service(), manifest=IngestManifest())
+    ingested = skipped = failed = 0
+    for i, config in enumerate(configs):
+        report(i, len(configs), f"Label {config['GmailFolderID']} ({i + 1} of {len(configs)})")
+        try:
+            summary = pipeline.run_label(config["ProjectAssetID"], config["GmailFolderID"])
+        except Exception as e:
+            print(f"Error running Gmail ingest for ProjectAssetID {config['ProjectAssetID']}: {e}")
+            failed += 1
+            continue
+        ingested += summary["ingested"]
+        skipped += summary["skipped"]
+        failed += summary["failed"]
+    return f"{len(configs)} labels: {ingested:,} attachments ingested, {skipped:,} skipped, {failed:,} failed."
+
+
+def run_status_rebuild(report):
+    """Recomputes the asset_status row of every asset with stored data. report(done, total, text)."""
+    service = get_status_service()
+    asset_ids = get_store().asset_ids()
+    for i, project_asset_id in enumerate(asset_ids):
+        report(i, len(asset_ids), f"ProjectAssetID {project_asset_id}")
+        service.update_asset(project_asset_id)
+    return f"Recomputed status for {len(asset_ids):,} assets."
+
+
+JOB_RUNNERS = {
+    "folder_backfill": run_folder_backfill,
+    "gmail_ingest": run_gmail_ingest,
+    "status_rebuild": run_status_rebuild,
+}
+
+
+def create_background_jobs_card():
+    """Create the background jobs card (job picker, run/cancel buttons, progress bar)"""
+    return dmc.Paper(
+        radius="md",
+        p="lg",
+        style={"background": "#23262f", "border": "1px solid #3a3d46"},
+        children=[
+            dmc.Text("Background Jobs", size="lg", weight=600, color="white", mb="md"),
+            dmc.Group(
+                spacing="md",
+                align="flex-end",
+                children=[
+                    dmc.Select(
+                        id="background-job-select",
+                        label="Job",
+                        data=[{"value": k, "label": v} for k, v in JOBS.items()],
+                        value="folder_backfill",
+                        style={"width": 340},
+                    ),
+                    dmc.Button("Run", id="background-job-run-btn", color="blue"),
+                    dmc.Button("Cancel", id="background-job-cancel-btn", color="red", variant="outline", disabled=True),
+                ],
+            ),
+            dmc.Progress(id="background-job-progress", value=0, mt="md", size="lg", animate=False),
+            dmc.Text(id="background-job-progress-label", size="sm", color="dimmed", mt="xs"),
+            html.Div(id="background-job-result", style={"marginTop": "12px"}),
+        ],
+    )
+
+
+@callback(
+    Output("background-job-result", "children"),
+    Input("background-job-run-btn", "n_clicks"),
+    State("background-job-select", "value"),
+    background=True,
+    manager=background_callback_manager,
+    running=[
+        (Output("background-job-run-btn", "disabled"), True, False),
+        (Output("background-job-cancel-btn", "disabled"), False, True),
+        (Output("background-job-progress", "animate"), True, False),
+    ],
+    cancel=[Input("background-job-cancel-btn", "n_clicks")],
+    progress=[Output("background-job-progress", "value"), Output("background-job-progress-label", "children")],
+    prevent_initial_call=True,
+)
+def run_background_job(set_progress, n_clicks, job):
+    runner = JOB_RUNNERS.get(job)
+    if runner is None:
+        return dmc.Alert(f"Unknown job: {job}", color="red")
+
+    def report(done, total, text):
+        set_progress((round(100 * done / total) if total else 0, text))
+
+    started = time.time()
+    try:
+        summary = runner(report)
+    except Exception as e:
+        print(f"Background job '{job}' failed: {e}")
+        set_progress((0, ""))
+        return dmc.Alert(str(e), title=f"{JOBS[job]} failed", color="red")
+    set_progress((100, f"Finished in {time.time() - started:.0f}s"))
+    return dmc.Alert(summary, title=f"{JOBS[job]} complete", color="green")
@@ -13,6 +13,7 @@ from dash import html, dcc, callback, Output, Input, State
 import dash_bootstrap_components as dbc
 from DBcontroller import DBcontoller
 from addClientModal import create_add_client_modal
+from snapshots import get_snapshot, refresh_snapshots
 
 # Initialize database controller
 dbc_instance = DBcontoller()
@@ -287,8 +288,11 @@ def refresh_clients_data(n_clicks, current_trigger):
 )
 def load_clients_data(trigger):
     try:
-        # Use the optimized method to get all clients and their project counts in one call
-        clients_data = dbc_instance.getClientsWithProjectCounts()
+        # Served from the precomputed snapshot; a refresh (button or after adding a client) reloads it
+        if trigger:
+            clients_data, = refresh_snapshots("clients_with_project_counts")
+        else:
+            clients_data = get_snapshot("clients_with_project_counts")
         if not clients_data:
             return [], create_client_metrics_card(0), create_simple_clients_table()
         # clients_data is a list of dicts: [{ClientName: ..., ProjectCount: ...}, ...]
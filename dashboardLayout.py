@@ -3,14 +3,16 @@ Mantine-style dashboard layout using dash-mantine-components (dmc).
 
 - Modern sidebar with navigation icons
 - Sleek topbar with search and branding
-- Main dashboard grid with analytics cards and charts
+- Main dashboard grid with analytics cards and charts, rendered from the
+  materialized KPI snapshot (utils/overview_kpis.py, rebuilt by snapshots.py)
 - Enterprise-ready responsive design
 """
 
 import dash_mantine_components as dmc
 from dash import html, dcc, callback, Output, Input, State
-import plotly.express as px
-import pandas as pd
+from snapshots import get_snapshot
+from utils.overview_kpis import format_bytes
+from utils.session_store import get_notification_log
 
 def create_navigation_sidebar(active_page=None):
     """Create the icon-based navigation sidebar"""
@@ -78,6 +80,7 @@ def create_navigation_sidebar(active_page=None):
                     create_nav_icon("👥", "/clients", "Clients", active_page == "clients"),
                     create_nav_icon("💼", "/projects", "Projects", active_page == "projects"),
                     create_nav_icon("🗄️", "/assets", "Assets", active_page == "assets"),
+                    create_nav_icon("🗺️", "/map", "Fleet Map", active_page == "map"),
                     create_nav_icon("⚙️", "/admin", "Admin", active_page == "admin"),
                 ]
             ),
@@ -197,39 +200,20 @@ def create_modern_topbar():
 def create_main_dashboard_content():
     """Create the main dashboard analytics content"""
     
-    # Sample data for the main dashboard
-    df_performance = pd.DataFrame({
-        'Date': pd.date_range('2024-01-01', periods=30, freq='D'),
-        'Assets_Online': [85, 87, 86, 88, 89, 87, 90, 88, 89, 91, 90, 92, 91, 89, 90, 
-                         88, 89, 91, 92, 90, 89, 91, 93, 92, 90, 89, 91, 92, 94, 93],
-        'Data_Quality': [94, 95, 93, 96, 97, 95, 98, 96, 97, 98, 97, 99, 98, 96, 97,
-                        95, 96, 98, 99, 97, 96, 98, 99, 98, 97, 96, 98, 99, 99, 98]
-    })
-    
-    performance_chart = dcc.Graph(
-        figure=px.line(
-            df_performance, x='Date', y=['Assets_Online', 'Data_Quality'],
-            title="System Performance Trends",
-            labels={'value': 'Percentage', 'variable': 'Metric'}
-        ).update_layout(
-            plot_bgcolor='rgba(0,0,0,0)',
-            paper_bgcolor='rgba(0,0,0,0)',
-            font_color='white',
-            title_font_color='white',
-            legend=dict(
-                orientation="h",
-                yanchor="bottom",
-                y=1.02,
-                xanchor="right",
-                x=1
-            )
-        ).update_traces(
-            line=dict(width=3)
-        ),
-        config={'displayModeBar': False},
-        style={'height': '300px'}
-    )
-    
+    # Rebuilt in the background; the overview only ever reads the in-memory snapshot
+    kpis = get_snapshot("overview_kpis")
+    by_type = " • ".join(f"{count} {asset_type}" for asset_type, count in kpis["assets_by_type"].items())
+    recovery = "—" if kpis["recovery_pct"] is None else f"{kpis['recovery_pct']}%"
+
+    if kpis["figures"]["ingest_volume"]:
+        volume_chart = dcc.Graph(
+            figure=kpis["figures"]["ingest_volume"],
+            config={'displayModeBar': False},
+            style={'height': '300px'}
+        )
+    else:
+        volume_chart = dmc.Text("No files ingested in the last 30 days", size="sm", color="dimmed")
+
     return dmc.Container(
         fluid=True,
         px=0,
@@ -280,8 +264,8 @@ def create_main_dashboard_content():
                                                     },
                                                     children=[
                                                         dmc.Text("Total Assets", size="sm", weight=500),
-                                                        dmc.Text("88", size="2rem", weight=700),
-                                                        dmc.Text("+12% vs last month", size="xs")
+                                                        dmc.Text(f"{kpis['total_assets']:,}", size="2rem", weight=700),
+                                                        dmc.Text(by_type or "No assets yet", size="xs")
                                                     ]
                                                 ),
                                                 span=3
@@ -297,8 +281,8 @@ def create_main_dashboard_content():
                                                     },
                                                     children=[
                                                         dmc.Text("Active Projects", size="sm", weight=500),
-                                                        dmc.Text("24", size="2rem", weight=700),
-                                                        dmc.Text("+8% vs last month", size="xs")
+                                                        dmc.Text(f"{kpis['active_projects']:,}", size="2rem", weight=700),
+                                                        dmc.Text(f"{kpis['total_clients']:,} clients", size="xs")
                                                     ]
                                                 ),
                                                 span=3
@@ -313,9 +297,9 @@ def create_main_dashboard_content():
                                                         "textAlign": "center"
                                                     },
                                                     children=[
-                                                        dmc.Text("Data Points", size="sm", weight=500),
-                                                        dmc.Text("2.4M", size="2rem", weight=700),
-                                                        dmc.Text("+15% vs last month", size="xs")
+                                                        dmc.Text("Data Recovery", size="sm", weight=500),
+                                                        dmc.Text(recovery, size="2rem", weight=700),
+                                                        dmc.Text("7-day average across assets", size="xs")
                                                     ]
                                                 ),
                                                 span=3
@@ -330,9 +314,9 @@ def create_main_dashboard_content():
                                                         "textAlign": "center"
                                                     },
                                                     children=[
-                                                        dmc.Text("Uptime", size="sm", weight=500),
-                                                        dmc.Text("99.2%", size="2rem", weight=700),
-                                                        dmc.Text("+0.3% vs last month", size="xs")
+                                                        dmc.Text("Stale Assets", size="sm", weight=500),
+                                                        dmc.Text(f"{kpis['stale_assets']:,}", size="2rem", weight=700),
+                                                        dmc.Text(f"{kpis['down_assets']:,} down • {kpis['live_assets']:,} live", size="xs")
                                                     ]
                                                 ),
                                                 span=3
@@ -340,12 +324,15 @@ def create_main_dashboard_content():
                                         ]
                                     ),
                                     
-                                    # Performance Chart
+                                    # Ingest volume chart
                                     dmc.Paper(
                                         p="md",
                                         radius="md",
                                         style={"background": "#181A1B"},
-                                        children=[performance_chart]
+                                        children=[
+                                            dmc.Text("Files Ingested per Day", size="sm", weight=500, color="gray.3", mb="sm"),
+                                            volume_chart
+                                        ]
                                     ),
                                 ]
                             ),
@@ -407,21 +394,21 @@ def create_main_dashboard_content():
                                                             position="apart",
                                                             children=[
                                                                 dmc.Text("Files Processed Today", size="sm", color="white"),
-                                                                dmc.Text("1,247", size="sm", weight=600, color="green")
+                                                                dmc.Text(f"{kpis['files_today']:,}", size="sm", weight=600, color="green")
                                                             ]
                                                         ),
                                                         dmc.Group(
                                                             position="apart",
                                                             children=[
-                                                                dmc.Text("Processing Queue", size="sm", color="white"),
-                                                                dmc.Text("23", size="sm", weight=600, color="blue")
+                                                                dmc.Text("Data Ingested Today", size="sm", color="white"),
+                                                                dmc.Text(format_bytes(kpis['bytes_today']), size="sm", weight=600, color="blue")
                                                             ]
                                                         ),
                                                         dmc.Group(
                                                             position="apart",
                                                             children=[
-                                                                dmc.Text("Failed Processes", size="sm", color="white"),
-                                                                dmc.Text("2", size="sm", weight=600, color="red")
+                                                                dmc.Text("Assets Down", size="sm", color="white"),
+                                                                dmc.Text(f"{kpis['down_assets']:,}", size="sm", weight=600, color="red")
                                                             ]
                                                         ),
                                                     ]
@@ -500,31 +487,27 @@ def create_main_dashboard_content():
     )
 
 # Notification badge and log callbacks
+# The log itself lives server-side (utils/session_store.py); the browser only holds {"cursor", "count"}
 @callback(
-    Output("notification-badge", "children"),
-    Output("notification-badge", "style"),
-    Input("notification-log-store", "data"),
+    Output("notification-log-cursor", "data", allow_duplicate=True),
+    Input("session-id", "data"),
+    prevent_initial_call=True,
 )
-def update_notification_badge(log):
-    count = len(log) if log else 0
-    style = {
-        "position": "absolute", "top": 2, "right": 2, "pointerEvents": "none", "zIndex": 10, "fontSize": 10, "padding": "0 4px"
-    }
-    if count == 0:
-        style["display"] = "none"
-    else:
-        style["display"] = "inline-block"
-    return str(count), style
+def restore_notification_log_cursor(session_id):
+    return get_notification_log().state(session_id)
+
+# The badge is a clientside callback (window.dash_clientside.ui.notification_badge)
 
 @callback(
     Output("notification-log-list", "children"),
-    Input("notification-log-store", "data"),
+    Input("notification-log-cursor", "data"),
+    State("session-id", "data"),
 )
-def update_notification_log_list(log):
-    if not log:
+def update_notification_log_list(log_cursor, session_id):
+    if not (log_cursor or {}).get("count"):
         return [dmc.Text("No notifications yet.", color="gray", size="sm")]
     items = []
-    for n in reversed(log[-20:]):  # Show last 20 notifications, newest first
+    for n in get_notification_log().latest(session_id, limit=20):  # Show last 20 notifications, newest first
         color = {"success": "green", "warning": "yellow", "error": "red"}.get(n.get("type"), "gray")
         items.append(
             dmc.Paper(
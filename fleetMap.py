@@ -0,0 +1,163 @@
+"""
+Fleet map module for the modernized Dash app.
+
+Responsibilities:
+- Map of every located asset (Latitude/Longitude from tbl_project_asset_detail)
+- Points come from an in-memory grid index (utils/spatial_index.py) held in the
+  "fleet_map" snapshot, so panning and zooming never query the database
+- Clusters the assets in the visible area on the server for the current zoom,
+  so the browser receives at most MAX_MARKERS markers whatever the fleet size
+"""
+
+import math
+import os
+
+import dash_mantine_components as dmc
+import plotly.graph_objects as go
+from dash import dcc, callback, ctx, Output, Input, no_update
+from dotenv import load_dotenv
+
+from snapshots import get_snapshot
+from utils.spatial_index import MAX_MARKERS
+
+load_dotenv()
+MAPBOX_API_KEY = os.getenv("MAPBOX_API_KEY")
+
+DEFAULT_CENTER = {"lat": 39.8283, "lon": -98.5795}  # US Center
+DEFAULT_ZOOM = 3
+# Used to estimate the visible area when the map hasn't reported its corners yet
+MAP_WIDTH_PX = 1100
+MAP_HEIGHT_PX = 600
+# Markers just outside the view are included so short pans don't show empty edges
+VIEW_PADDING = 0.25
+
+
+def viewport_from_relayout(relayout_data):
+    """
+    Returns (south, west, north, east, zoom) for the map view described by relayoutData.
+    Uses the corner coordinates Plotly reports after a pan/zoom, and otherwise estimates
+    the box from the center and zoom (256 px tiles, MAP_WIDTH_PX x MAP_HEIGHT_PX).
+    """
+    relayout_data = relayout_data or {}
+    center = relayout_data.get("mapbox.center") or DEFAULT_CENTER
+    zoom = float(relayout_data.get("mapbox.zoom", DEFAULT_ZOOM))
+
+    corners = (relayout_data.get("mapbox._derived") or {}).get("coordinates")
+    if corners:
+        lons = [corner[0] for corner in corners]
+        lats = [corner[1] for corner in corners]
+        south, north = min(lats), max(lats)
+        west, east = corners[0][0], corners[1][0]
+        if max(lons) - min(lons) >= 360:
+            west, east = -180.0, 180.0
+    else:
+        degrees_per_px = 360 / (256 * 2 ** zoom)
+        half_width = degrees_per_px * MAP_WIDTH_PX / 2
+        half_height = degrees_per_px * MAP_HEIGHT_PX / 2 * math.cos(math.radians(center["lat"]))
+        south, north = center["lat"] - half_height, center["lat"] + half_height
+        west, east = center["lon"] - half_width, center["lon"] + half_width
+        if half_width * 2 >= 360:
+            west, east = -180.0, 180.0
+
+    pad_lat = (north - south) * VIEW_PADDING
+    pad_lon = ((east - west) % 360 or 360) * VIEW_PADDING
+    if east - west < 360 - 2 * pad_lon:
+        west, east = west - pad_lon, east + pad_lon
+    return south - pad_lat, west, north + pad_lat, east, zoom
+
+
+def build_fleet_map_figure(markers) -> go.Figure:
+    """Builds the map figure from cluster markers (see GridIndex.cluster)."""
+    singles = [m for m in markers if m["count"] == 1]
+    clusters = [m for m in markers if m["count"] > 1]
+    figure = go.Figure([
+        go.Scattermapbox(
+            lat=[m["lat"] for m in clusters],
+            lon=[m["lon"] for m in clusters],
+            mode="markers+text",
+            marker=dict(size=[min(14 + 6 * math.log2(m["count"]), 48) for m in clusters], color="#2196F3", opacity=0.8),
+            text=[str(m["count"]) for m in clusters],
+            textfont=dict(color="white", size=11),
+            hovertext=[f"{m['count']} assets" for m in clusters],
+            hoverinfo="text",
+            name="Clusters",
+        ),
+        go.Scattermapbox(
+            lat=[m["lat"] for m in singles],
+            lon=[m["lon"] for m in singles],
+            mode="markers",
+            marker=dict(size=12, color="red"),
+            hovertext=[f"{m.get('AssetName')} ({m.get('AssetType')})<br>{m.get('ClientName')} / {m.get('ProjectName')}"
+                       for m in singles],
+            hoverinfo="text",
+            name="Assets",
+        ),
+    ])
+    figure.update_layout(
+        mapbox_style="streets",
+        mapbox_accesstoken=MAPBOX_API_KEY,
+        mapbox_center=DEFAULT_CENTER,
+        mapbox_zoom=DEFAULT_ZOOM,
+        margin={"r": 0, "t": 0, "l": 0, "b": 0},
+        paper_bgcolor="#1A1B1E",
+        showlegend=False,
+        # Keeps the user's pan/zoom when the markers are replaced
+        uirevision="fleet-map",
+        annotations=[dict(text="Mapbox API Key Missing. Please check .env file.", showarrow=False, font=dict(color="white"))] if MAPBOX_API_KEY is None else [],
+    )
+    return figure
+
+
+def create_fleet_map_layout():
+    """Create the fleet map page layout."""
+    return dmc.Stack(
+        spacing="md",
+        style={"padding": "20px"},
+        children=[
+            dmc.Stack(
+                spacing="xs",
+                children=[
+                    dmc.Title("Fleet Map", order=2, color="white"),
+                    dmc.Text("Every asset with a recorded location; zoom in to split clusters", color="dimmed", size="md"),
+                ],
+            ),
+            dmc.Text(id="fleet-map-info", size="xs", color="dimmed"),
+            dmc.Paper(
+                radius="md",
+                withBorder=True,
+                style={"height": f"{MAP_HEIGHT_PX}px", "background": "#1A1B1E", "overflow": "hidden"},
+                children=[
+                    dcc.Graph(
+                        id="fleet-map-graph",
+                        figure=build_fleet_map_figure([]),
+                        config={"displayModeBar": False, "scrollZoom": True},
+                        style={"height": "100%", "width": "100%"},
+                    )
+                ],
+            ),
+        ],
+    )
+
+
+@callback(
+    Output("fleet-map-graph", "figure"),
+    Output("fleet-map-info", "children"),
+    Input("fleet-map-graph", "relayoutData"),
+)
+def update_fleet_map(relayout_data):
+    # Only view changes need new markers (autosize and other relayouts keep them)
+    if ctx.triggered_id == "fleet-map-graph" and relayout_data and "mapbox.zoom" not in relayout_data \
+            and "mapbox.center" not in relayout_data:
+        return no_update, no_update
+
+    try:
+        index = get_snapshot("fleet_map")
+    except Exception as e:
+        print(f"Error loading fleet map: {e}")
+        return build_fleet_map_figure([]), "Error loading asset locations"
+
+    south, west, north, east, zoom = viewport_from_relayout(relayout_data)
+    markers = index.cluster(south, west, north, east, zoom, max_markers=MAX_MARKERS)
+    in_view = sum(m["count"] for m in markers)
+    info = f"{in_view:,} of {len(index):,} located assets in view, shown as {len(markers):,} markers"
+    return build_fleet_map_figure(markers), info
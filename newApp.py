@@ -9,16 +9,18 @@ New main application script for the modernized Dash app.
 
 import dash
 import dash_mantine_components as dmc
-from dash import html, dcc, Output, Input, callback
+from dash import html, dcc, Output, Input, State, ALL, callback
 from dashboardLayout import dashboard_layout, create_navigation_sidebar, create_modern_topbar
 from newComponents import (
     create_dashboard_overview,
     create_clients_page,
     create_projects_page,
     create_assets_page,
+    create_fleet_map_page,
     create_admin_page
 )
 import addProjectModal
+from timeseriesChart import register_timeseries_routes
 
 # Initialize the Dash app with enterprise-ready configuration
 app = dash.Dash(
@@ -37,6 +39,103 @@ app.clientside_callback(
     prevent_initial_call=True
 )
 
+app.clientside_callback(
+    "window.dash_clientside.clients_notification.show",
+    Output("add-client-notification-store", "data", allow_duplicate=True),
+    Input("add-client-notification-store", "data"),
+    prevent_initial_call=True
+)
+
+app.clientside_callback(
+    "window.dash_clientside.clients_notification.show",
+    Output("add-project-notification-store", "data", allow_duplicate=True),
+    Input("add-project-notification-store", "data"),
+    prevent_initial_call=True
+)
+
+# Clientside callbacks for UI-only state (modals, wizard buttons, notification badge), see assets/ui.js
+app.clientside_callback(
+    "window.dash_clientside.ui.toggle_client_modal",
+    Output("modern-add-client-modal", "opened"),
+    Input("open-modern-add-client-btn", "n_clicks"),
+    Input("modern-cancel-client-btn", "n_clicks"),
+    Input("modern-add-client-btn", "n_clicks"),
+    State("modern-add-client-modal", "opened"),
+    prevent_initial_call=True
+)
+
+app.clientside_callback(
+    "window.dash_clientside.ui.open_project_modal",
+    Output("modern-add-project-modal", "opened"),
+    Input("quick-add-project-btn", "n_clicks"),
+    Input({"type": "add-project-to-client-btn", "client": ALL}, "n_clicks"),
+    State("modern-add-project-modal", "opened"),
+    prevent_initial_call=True
+)
+
+app.clientside_callback(
+    "window.dash_clientside.ui.close_modal",
+    Output("modern-add-project-modal", "opened", allow_duplicate=True),
+    Input("modern-cancel-project-btn", "n_clicks"),
+    Input("modern-add-project-btn", "n_clicks"),
+    prevent_initial_call=True
+)
+
+app.clientside_callback(
+    "window.dash_clientside.ui.toggle_asset_modal",
+    Output("modern-add-asset-modal", "opened"),
+    Output("asset-wizard-stepper", "active", allow_duplicate=True),
+    Input("quick-add-asset-btn", "n_clicks"),
+    Input("modern-cancel-asset-btn", "n_clicks"),
+    prevent_initial_call=True
+)
+
+app.clientside_callback(
+    "window.dash_clientside.ui.wizard_buttons",
+    Output("wizard-prev-btn", "style"),
+    Output("wizard-next-btn", "style"),
+    Output("wizard-complete-btn", "style"),
+    Input("asset-wizard-stepper", "active"),
+    Input("step2-met-tower-dropdown", "value"),
+    Input("step2-asset-type-store", "data"),
+)
+
+app.clientside_callback(
+    "window.dash_clientside.ui.notification_badge",
+    Output("notification-badge", "children"),
+    Output("notification-badge", "style"),
+    Input("notification-log-cursor", "data"),
+)
+
+# Clientside callback moving the wizard Step 3 map marker (no server-side figure rebuilds)
+app.clientside_callback(
+    "window.dash_clientside.asset_map.update_marker",
+    Output("step3-mapbox-map", "figure"),
+    Input("step3-latitude-input", "value"),
+    Input("step3-longitude-input", "value"),
+    State("step3-mapbox-map", "figure"),
+    prevent_initial_call=True
+)
+
+# Clientside callback measuring the logger data chart width for server-side downsampling
+app.clientside_callback(
+    "window.dash_clientside.timeseries_chart.measure_width",
+    Output("timeseries-chart-width", "data"),
+    Input("timeseries-chart-asset-select", "value"),
+    prevent_initial_call=True
+)
+
+# Clientside callback creating the browser session id (keys server-side session state)
+app.clientside_callback(
+    "window.dash_clientside.session.ensure_id",
+    Output("session-id", "data"),
+    Input("url", "pathname"),
+    State("session-id", "data"),
+)
+
+# JSON endpoint for downsampled logger data
+register_timeseries_routes(app.server)
+
 # Main app layout with routing
 app.layout = dmc.NotificationsProvider(
     position="top-right",
@@ -50,7 +149,8 @@ app.layout = dmc.NotificationsProvider(
             },
             children=[
                 dcc.Location(id="url", refresh=False),
-                dcc.Store(id="notification-log-store", data=[]),
+                dcc.Store(id="session-id", storage_type="session"),
+                dcc.Store(id="notification-log-cursor", data={"cursor": 0, "count": 0}),
                 html.Div(id="page-content")
             ]
         )
@@ -117,6 +217,20 @@ def display_page(pathname):
                 )
             ]
         )
+    elif pathname == "/map":
+        return html.Div(
+            style={"display": "flex", "height": "100vh", "background": "#181A1B"},
+            children=[
+                create_navigation_sidebar("map"),
+                html.Div(
+                    style={"flex": 1, "display": "flex", "flexDirection": "column", "marginLeft": "100px"},
+                    children=[
+                        create_modern_topbar(),
+                        create_fleet_map_page()
+                    ]
+                )
+            ]
+        )
     elif pathname == "/admin":
         return html.Div([
             dashboard_layout(show_sidebar=True, active_page="admin"),
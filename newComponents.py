@@ -7,19 +7,22 @@ Defines:
 - create_dashboard_overview(): Main dashboard overview page
 - create_clients_page(): Client management page
 - create_projects_page(): Project portfolio page
-- create_assets_page(): Asset monitoring page
-- create_admin_page(): System administration page
+- create_assets_page(): Asset monitoring page with the logger data chart
+- create_admin_page(): System administration page with background jobs
 """
 
 import dash_mantine_components as dmc
 from dash import html, dcc
-import plotly.express as px
-import pandas as pd
 from clientsDashboard import create_clients_dashboard_layout
 from projectsDashboard import create_projects_dashboard_layout
 from assetsDashboard import create_assets_dashboard_layout
+from fleetMap import create_fleet_map_layout
+from timeseriesChart import create_timeseries_chart
+from snapshots import get_snapshot
+from backgroundJobs import create_background_jobs_card
+from utils.overview_kpis import CHART_LAYOUT
 
-def create_kpi_card(title, value, change, icon, color):
+def create_kpi_card(title, value, change, icon, color, change_label="vs last month"):
     """Create a modern KPI card component"""
     return dmc.Paper(
         radius="md",
@@ -43,7 +46,7 @@ def create_kpi_card(title, value, change, icon, color):
                                 spacing="xs",
                                 children=[
                                     dmc.Text(change, size="sm", color=color, weight=500),
-                                    dmc.Text("vs last month", size="xs", color="dimmed")
+                                    dmc.Text(change_label, size="xs", color="dimmed")
                                 ]
                             )
                         ]
@@ -78,46 +81,23 @@ def create_chart_card(title, chart_component):
 
 def create_dashboard_overview():
     """Create the main dashboard overview page"""
-    # Sample data for charts
-    df_revenue = pd.DataFrame({
-        'Month': ['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun'],
-        'Revenue': [45000, 52000, 48000, 61000, 55000, 67000]
-    })
-    
-    revenue_chart = dcc.Graph(
-        figure=px.line(
-            df_revenue, x='Month', y='Revenue',
-            title="Revenue Trend"
-        ).update_layout(
-            plot_bgcolor='rgba(0,0,0,0)',
-            paper_bgcolor='rgba(0,0,0,0)',
-            font_color='white',
-            title_font_color='white'
-        ),
+    # Materialized KPI snapshot (refreshed in the background, see utils/overview_kpis.py)
+    kpis = get_snapshot("overview_kpis")
+    figures = kpis["figures"]
+
+    volume_chart = dcc.Graph(
+        figure=figures["ingest_volume"] or {"layout": CHART_LAYOUT},
         config={'displayModeBar': False},
         style={'height': '250px'}
     )
-    
-    # Asset distribution pie chart
-    asset_data = pd.DataFrame({
-        'Type': ['MET Towers', 'Lidars', 'Sodars', 'Other'],
-        'Count': [45, 23, 12, 8]
-    })
-    
+
     asset_chart = dcc.Graph(
-        figure=px.pie(
-            asset_data, values='Count', names='Type',
-            title="Asset Distribution"
-        ).update_layout(
-            plot_bgcolor='rgba(0,0,0,0)',
-            paper_bgcolor='rgba(0,0,0,0)',
-            font_color='white',
-            title_font_color='white'
-        ),
+        figure=figures["assets_by_type"] or {"layout": CHART_LAYOUT},
         config={'displayModeBar': False},
         style={'height': '250px'}
     )
-    
+    recovery = "—" if kpis["recovery_pct"] is None else f"{kpis['recovery_pct']}%"
+
     return dmc.Container(
         fluid=True,
         px="xl",
@@ -127,10 +107,10 @@ def create_dashboard_overview():
             dmc.Grid(
                 gutter="xl",
                 children=[
-                    dmc.Col(create_kpi_card("Total Assets", "88", "+12%", "📊", "green"), span=3),
-                    dmc.Col(create_kpi_card("Active Projects", "24", "+8%", "💼", "blue"), span=3),
-                    dmc.Col(create_kpi_card("Total Clients", "15", "+3%", "👥", "orange"), span=3),
-                    dmc.Col(create_kpi_card("Data Points", "2.4M", "+15%", "📈", "purple"), span=3),
+                    dmc.Col(create_kpi_card("Total Assets", f"{kpis['total_assets']:,}", f"{kpis['live_assets']:,} live", "📊", "green", change_label=""), span=3),
+                    dmc.Col(create_kpi_card("Active Projects", f"{kpis['active_projects']:,}", f"{kpis['total_clients']:,} clients", "💼", "blue", change_label=""), span=3),
+                    dmc.Col(create_kpi_card("Data Recovery", recovery, "7-day avg", "📈", "purple", change_label=""), span=3),
+                    dmc.Col(create_kpi_card("Stale Assets", f"{kpis['stale_assets']:,}", f"{kpis['down_assets']:,} down", "⚠️", "orange", change_label=""), span=3),
                 ]
             ),
             
@@ -140,7 +120,7 @@ def create_dashboard_overview():
             dmc.Grid(
                 gutter="xl",
                 children=[
-                    dmc.Col(create_chart_card("Revenue Overview", revenue_chart), span=8),
+                    dmc.Col(create_chart_card("Files Ingested per Day", volume_chart), span=8),
                     dmc.Col(create_chart_card("Asset Distribution", asset_chart), span=4),
                 ]
             ),
@@ -247,7 +227,17 @@ def create_projects_page():
 
 def create_assets_page():
     """Create the assets management page using the dedicated assets dashboard"""
-    return create_assets_dashboard_layout()
+    return html.Div([
+        create_assets_dashboard_layout(),
+        html.Div(
+            style={"padding": "0 20px 20px", "maxWidth": "1200px", "margin": "0 auto"},
+            children=[create_chart_card("Logger Data", create_timeseries_chart())]
+        )
+    ])
+
+def create_fleet_map_page():
+    """Create the fleet map page (server-side clustered asset locations)"""
+    return create_fleet_map_layout()
 
 def create_admin_page():
     """Create the admin and overview page"""
@@ -358,6 +348,11 @@ def create_admin_page():
                         span=4
                     ),
                 ]
-            )
+            ),
+
+            dmc.Space(h="xl"),
+
+            # Long-running operations (background callbacks, see backgroundJobs.py)
+            create_background_jobs_card(),
         ]
     )
@@ -12,6 +12,7 @@ import dash_mantine_components as dmc
 from dash import html, dcc, callback, Output, Input, State
 from DBcontroller import DBcontoller
 from addProjectModal import create_add_project_modal
+from snapshots import get_snapshot, refresh_snapshots
 
 dbc_instance = DBcontoller()
 
@@ -131,8 +132,11 @@ def refresh_projects_data(n_clicks, current_trigger):
     Input("projects-dashboard-refresh-trigger", "data")
 )
 def update_projects_dashboard(refresh_trigger):
-    # Fetch all client-project-asset data
-    data = dbc_instance.getClientsProjectsAssets()
+    # Fetch all client-project-asset data from the precomputed snapshots; a refresh reloads them
+    if refresh_trigger:
+        data, total_projects = refresh_snapshots("clients_projects_assets", "total_project_count")
+    else:
+        data, total_projects = get_snapshot("clients_projects_assets"), get_snapshot("total_project_count")
     # Organize by client
     clients = {}
     for row in data:
@@ -141,7 +145,6 @@ def update_projects_dashboard(refresh_trigger):
             clients[client] = []
         if row["ProjectID"] is not None:
             clients[client].append(row)
-    total_projects = dbc_instance.getTotalProjectCount()
 
     cards = []
     for client, projects in clients.items():
@@ -0,0 +1,135 @@
+"""
+Precomputed snapshots for the Dash app.
+
+Responsibilities:
+- Registers the client, project and asset lists, the overview KPIs and the
+  fleet map's spatial index with a
+  background PrecomputeWorker (utils/precompute.py) running in the server process
+- Dashboard callbacks read snapshots from memory (stale-while-revalidate), so
+  under load no request waits on the database
+- Refresh buttons and post-write refreshes call refresh_snapshots() to read their
+  own writes: one synchronous load of the snapshots they show, the rest are
+  rebuilt in the background
+- Loads go through the shared cache (utils/shared_cache.py), so with several
+  server workers one worker's load is reused by the others, and
+  invalidate_snapshots() after a write reaches every worker
+
+Refresh interval and maximum age are read from SNAPSHOT_REFRESH_INTERVAL and
+SNAPSHOT_MAX_AGE (seconds); the shared cache backend from SHARED_CACHE_URL.
+"""
+
+import os
+
+from DBcontroller import DBcontoller
+from utils.overview_kpis import EMPTY_SNAPSHOT, load_overview_kpis
+from utils.precompute import PrecomputeWorker
+from utils.shared_cache import SharedCache
+from utils.spatial_index import GridIndex
+
+SNAPSHOT_GROUP = "snapshots"
+
+dbc_instance = DBcontoller()
+shared_cache = SharedCache()
+
+worker = PrecomputeWorker(
+    interval=float(os.getenv("SNAPSHOT_REFRESH_INTERVAL", 60)),
+    max_age=float(os.getenv("SNAPSHOT_MAX_AGE", 120)),
+)
+
+
+def _shared(name, loader):
+    """
+    Wraps a loader so a snapshot another worker already loaded (same version) is reused.
+    The version is read before loading and the result stored under it, so a load that overlaps
+    another worker's invalidate_snapshots() never ends up under the new version.
+    """
+    missing = object()
+
+    def load():
+        try:
+            version = shared_cache.version(SNAPSHOT_GROUP)
+            value = shared_cache.get(SNAPSHOT_GROUP, name, missing, version=version)
+        except Exception as e:
+            print(f"Error reading snapshot '{name}' from the shared cache: {e}")
+            version, value = None, missing
+        if value is not missing:
+            return value
+        value = loader()
+        if version is not None:
+            try:
+                shared_cache.set(SNAPSHOT_GROUP, name, value, ttl=worker.interval, version=version)
+            except Exception as e:
+                print(f"Error writing snapshot '{name}' to the shared cache: {e}")
+        return value
+    return load
+
+
+# Registration order is refresh order: overview_kpis is derived from assets_dashboard
+worker.register("clients_with_project_counts", _shared("clients_with_project_counts", dbc_instance.getClientsWithProjectCounts))
+worker.register("clients_projects_assets", _shared("clients_projects_assets", dbc_instance.getClientsProjectsAssets))
+worker.register("total_project_count", _shared("total_project_count", dbc_instance.getTotalProjectCount))
+# Asset counts, detailed assets with status and project total, queried concurrently
+worker.register("assets_dashboard", _shared("assets_dashboard", dbc_instance.getAssetsDashboardData))
+worker.register(
+    "overview_kpis",
+    _shared("overview_kpis", lambda: load_overview_kpis(worker.get("assets_dashboard")["assets_detailed"])),
+    default=EMPTY_SNAPSHOT,
+    depends_on=["assets_dashboard"],
+)
+# Grid index over every located asset for the fleet map (fleetMap.py)
+worker.register("fleet_map", _shared("fleet_map", lambda: GridIndex(dbc_instance.getAssetCoordinates())))
+
+
+_seen_version = None
+
+
+def _check_shared_version():
+    """Queues a rebuild of every snapshot when another worker invalidated the shared group."""
+    global _seen_version
+    try:
+        version = shared_cache.version(SNAPSHOT_GROUP)
+    except Exception as e:
+        print(f"Error reading shared snapshot version: {e}")
+        return
+    if _seen_version is not None and version != _seen_version:
+        worker.invalidate()
+    _seen_version = version
+
+
+def get_snapshot(name, fresh=False):
+    """
+    Returns the latest snapshot by name; fresh=True rebuilds it first.
+    Use refresh_snapshots() for a read that must reflect a write.
+    """
+    _check_shared_version()
+    return worker.get(name, fresh=fresh)
+
+
+def _invalidate_shared():
+    global _seen_version
+    try:
+        _seen_version = shared_cache.invalidate(SNAPSHOT_GROUP)
+    except Exception as e:
+        print(f"Error invalidating shared snapshots: {e}")
+
+
+def invalidate_snapshots(*names):
+    """
+    Invalidates the shared snapshot group for every worker and queues a background rebuild
+    of the named snapshots here (all if none are given).
+    """
+    _invalidate_shared()
+    worker.invalidate(*names)
+
+
+def refresh_snapshots(*names):
+    """
+    Reads snapshots back after a write (or a Refresh click): invalidates the shared group for
+    every worker, rebuilds the named snapshots now with one load each and queues every other
+    snapshot for a background rebuild.
+    Returns:
+        list: The rebuilt snapshots, in the order of names.
+    """
+    _invalidate_shared()
+    worker.invalidate(exclude=names)
+    return [worker.get(name, fresh=True) for name in names]
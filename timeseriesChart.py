@@ -0,0 +1,196 @@
+"""
+Time-series chart module for the modernized Dash app.
+
+Responsibilities:
+- Logger data chart for any asset in the local ETL store (utils/timeseries_store.py)
+- Server-side LTTB downsampling to the pixel width of the chart, so a year of
+  10-minute data sends a few thousand points per channel instead of 52k
+- Re-fetches at full detail for the zoomed window when the user zooms in
+- JSON endpoint (/api/timeseries/<ProjectAssetID>) returning the same downsampled series
+"""
+
+import dash_mantine_components as dmc
+import plotly.graph_objects as go
+from dash import dcc, callback, ctx, Output, Input, State, no_update
+from flask import jsonify, request
+
+from DBcontroller import DBcontoller
+from utils.downsample import lttb_frame
+from utils.ingest_engine import get_store
+
+dbc_instance = DBcontoller()
+
+DEFAULT_WIDTH = 1200
+MAX_WIDTH = 4000
+DEFAULT_CHANNEL_COUNT = 4
+
+
+def get_downsampled_series(project_asset_id, channels=None, start=None, end=None, width=DEFAULT_WIDTH) -> dict:
+    """
+    Reads a window of an asset's channels and downsamples each one to the chart width.
+    Args:
+        project_asset_id (int): The ProjectAssetID to read.
+        channels (list, optional): Channel names. Defaults to every stored channel.
+        start, end (optional): Timestamp-like window bounds. None leaves the side open.
+        width (int): Chart width in pixels; each channel is reduced to at most this many points.
+    Returns:
+        dict: {'series': {channel: pd.Series}, 'source_points': int, 'points': int}
+    """
+    width = max(3, min(int(width or DEFAULT_WIDTH), MAX_WIDTH))
+    frame = get_store().read_frame(project_asset_id, start=start, end=end, channels=channels or None)
+    series = lttb_frame(frame, width)
+    return {
+        "series": series,
+        "source_points": int(frame.count().sum()),
+        "points": sum(len(s) for s in series.values()),
+    }
+
+
+def build_timeseries_figure(series: dict, title=None) -> go.Figure:
+    """Builds a dark-themed line figure from {channel: pd.Series}."""
+    figure = go.Figure()
+    for channel, values in series.items():
+        figure.add_trace(go.Scattergl(x=values.index, y=values.values, mode="lines", name=channel))
+    figure.update_layout(
+        title=title,
+        plot_bgcolor="rgba(0,0,0,0)",
+        paper_bgcolor="rgba(0,0,0,0)",
+        font_color="white",
+        margin=dict(l=40, r=20, t=40 if title else 20, b=40),
+        legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1),
+        uirevision="timeseries-chart",
+    )
+    return figure
+
+
+def create_timeseries_chart():
+    """Create the logger data chart (asset and channel pickers plus graph); wrap it with create_chart_card()"""
+    return dmc.Stack(
+        spacing="sm",
+        children=[
+            dcc.Store(id="timeseries-chart-width", data=DEFAULT_WIDTH),
+            dmc.Group(
+                spacing="md",
+                children=[
+                    dmc.Select(
+                        id="timeseries-chart-asset-select",
+                        label="Asset",
+                        placeholder="Select an asset",
+                        searchable=True,
+                        data=[],
+                        style={"width": 260},
+                    ),
+                    dmc.MultiSelect(
+                        id="timeseries-chart-channel-select",
+                        label="Channels",
+                        placeholder="Select channels",
+                        searchable=True,
+                        data=[],
+                        style={"minWidth": 320, "flex": 1},
+                    ),
+                ],
+            ),
+            dmc.Text(id="timeseries-chart-info", size="xs", color="dimmed"),
+            dcc.Graph(
+                id="timeseries-chart-graph",
+                figure=build_timeseries_figure({}),
+                config={"displayModeBar": False},
+                style={"height": "360px"},
+            ),
+        ],
+    )
+
+
+@callback(
+    Output("timeseries-chart-asset-select", "data"),
+    Input("timeseries-chart-asset-select", "id"),
+)
+def load_timeseries_assets(_):
+    asset_ids = get_store().asset_ids()
+    try:
+        names = {row["ProjectAssetID"]: row["AssetName"] for row in dbc_instance.getClientsProjectsAssetsDetailed()}
+    except Exception as e:
+        print(f"Error loading asset names for chart: {e}")
+        names = {}
+    return [{"value": str(i), "label": names.get(i, f"ProjectAssetID {i}")} for i in asset_ids]
+
+
+@callback(
+    Output("timeseries-chart-channel-select", "data"),
+    Output("timeseries-chart-channel-select", "value"),
+    Input("timeseries-chart-asset-select", "value"),
+    prevent_initial_call=True,
+)
+def load_timeseries_channels(project_asset_id):
+    if not project_asset_id:
+        return [], []
+    channels = get_store().channels(int(project_asset_id))
+    return channels, channels[:DEFAULT_CHANNEL_COUNT]
+
+
+@callback(
+    Output("timeseries-chart-graph", "figure"),
+    Output("timeseries-chart-info", "children"),
+    Input("timeseries-chart-channel-select", "value"),
+    Input("timeseries-chart-graph", "relayoutData"),
+    Input("timeseries-chart-width", "data"),
+    State("timeseries-chart-asset-select", "value"),
+    prevent_initial_call=True,
+)
+def update_timeseries_chart(channels, relayout_data, width, project_asset_id):
+    if not project_asset_id or not channels:
+        return build_timeseries_figure({}), ""
+
+    # Zooming re-fetches the visible window at full chart resolution; autorange resets to the full series
+    start = end = None
+    relayout_data = relayout_data or {}
+    if "xaxis.range[0]" in relayout_data:
+        start, end = relayout_data["xaxis.range[0]"], relayout_data["xaxis.range[1]"]
+    elif ctx.triggered_id == "timeseries-chart-graph" and not relayout_data.get("xaxis.autorange"):
+        # Other relayouts (autosize, y-axis zoom) don't change the data
+        return no_update, no_update
+
+    try:
+        result = get_downsampled_series(int(project_asset_id), channels, start, end, width)
+    except Exception as e:
+        print(f"Error loading chart data for ProjectAssetID {project_asset_id}: {e}")
+        return build_timeseries_figure({}), "Error loading data"
+
+    figure = build_timeseries_figure(result["series"])
+    if start is not None:
+        figure.update_xaxes(range=[start, end])
+    info = f"Showing {result['points']:,} of {result['source_points']:,} points"
+    return figure, info
+
+
+def register_timeseries_routes(server):
+    """
+    Registers GET /api/timeseries/<ProjectAssetID> on the Flask server.
+    Query parameters: channels (comma separated), start, end, width (pixels).
+    """
+    @server.route("/api/timeseries/<int:project_asset_id>")
+    def timeseries_endpoint(project_asset_id):
+        channels = [c for c in request.args.get("channels", "").split(",") if c]
+        try:
+            result = get_downsampled_series(
+                project_asset_id,
+                channels,
+                request.args.get("start"),
+                request.args.get("end"),
+                request.args.get("width", DEFAULT_WIDTH, type=int),
+            )
+        except Exception as e:
+            print(f"Error serving timeseries for ProjectAssetID {project_asset_id}: {e}")
+            return jsonify({"error": str(e)}), 400
+        return jsonify({
+            "project_asset_id": project_asset_id,
+            "source_points": result["source_points"],
+            "points": result["points"],
+            "series": {
+                channel: {
+                    "x": [ts.isoformat() for ts in values.index],
+                    "y": values.astype(float).tolist(),
+                }
+                for channel, values in result["series"].items()
+            },
+        })
@@ -0,0 +1,160 @@
+"""
+Asset status service.
+
+Responsibilities:
+- Keeps a precomputed asset_status row per ProjectAssetID in the local ETL store:
+  the newest data timestamp, the inferred logging interval and the data recovery
+  rate over the trailing window that ends at that timestamp (or over the data
+  received so far, for an asset younger than the window).
+- Updated incrementally by the ingest engine after every file it writes, so no
+  status work happens when the dashboard renders.
+- Classifies each asset as Live, Stale or Down in the read query itself, so the
+  dashboard gets every status from one query and ages out silent assets
+  without waiting for another ingest.
+
+Live:  data newer than stale_after and recovery at or above min_recovery.
+Stale: data older than stale_after, or recovery below min_recovery.
+Down:  data older than down_after, or no data received at all.
+"""
+
+import sqlite3
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+from utils.timeseries_store import DEFAULT_STORE_PATH, SAMPLES_DDL
+
+LIVE = "Live"
+STALE = "Stale"
+DOWN = "Down"
+STATUS_COLORS = {LIVE: "green", STALE: "yellow", DOWN: "red"}
+
+DEFAULT_INTERVAL = 600  # 10-minute logger averages
+MIN_INTERVAL = 60
+
+# One service (and SQLite connection) per store path per process
+_services = {}
+
+
+def get_status_service(store_path=None):
+    """Returns this process' AssetStatusService for the given path, opening it on first use."""
+    key = store_path or ""
+    if key not in _services:
+        _services[key] = AssetStatusService(store_path)
+    return _services[key]
+
+
+class AssetStatusService:
+    def __init__(self, path=None, window_days=7, stale_after_hours=24, down_after_hours=72, min_recovery=0.8):
+        """
+        Args:
+            path (str, optional): SQLite file path. Defaults to ETL_STORE_PATH.
+            window_days (int): Trailing window used for the recovery rate.
+            stale_after_hours (float): Age of the newest data after which an asset is Stale.
+            down_after_hours (float): Age of the newest data after which an asset is Down.
+            min_recovery (float): Recovery rate (0-1) below which a fresh asset is Stale.
+        """
+        self.window = int(window_days * 86400)
+        self.stale_after = int(stale_after_hours * 3600)
+        self.down_after = int(down_after_hours * 3600)
+        self.min_recovery = min_recovery
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path or DEFAULT_STORE_PATH, timeout=30, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(SAMPLES_DDL + """
+            CREATE TABLE IF NOT EXISTS asset_status (
+                project_asset_id INTEGER PRIMARY KEY,
+                last_timestamp INTEGER,
+                last_received_at REAL,
+                interval_seconds INTEGER,
+                recovery_rate REAL,
+                updated_at REAL NOT NULL
+            );
+        """)
+        self._conn.commit()
+
+    def update_asset(self, project_asset_id: int) -> dict:
+        """
+        Recomputes the status row of one asset from its samples in the trailing window.
+        Called by the ingest engine after each write.
+        Returns:
+            dict: project_asset_id, last_timestamp, interval_seconds, recovery_rate
+        """
+        project_asset_id = int(project_asset_id)
+        with self._lock:
+            first_ts, last_ts = self._conn.execute(
+                "SELECT MIN(ts), MAX(ts) FROM samples WHERE project_asset_id = ?", (project_asset_id,)
+            ).fetchone()
+            if last_ts is None:
+                return {"project_asset_id": project_asset_id, "last_timestamp": None,
+                        "interval_seconds": None, "recovery_rate": 0.0}
+            window_start = last_ts - self.window
+            timestamps = [row[0] for row in self._conn.execute(
+                "SELECT DISTINCT ts FROM samples WHERE project_asset_id = ? AND ts > ? ORDER BY ts",
+                (project_asset_id, window_start),
+            )]
+
+            # The typical step is the logging interval; the median keeps one irregular sample
+            # (or a few gaps) from skewing it
+            interval = DEFAULT_INTERVAL
+            if len(timestamps) > 1:
+                steps = np.diff(timestamps)
+                interval = max(int(np.median(steps)), MIN_INTERVAL)
+            # A newly installed asset is measured from its first sample, not the whole window
+            covered = min(self.window, last_ts - first_ts + interval)
+            expected = max(covered // interval, 1)
+            recovery_rate = min(len(timestamps) / expected, 1.0)
+
+            now = time.time()
+            with self._conn:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO asset_status "
+                    "(project_asset_id, last_timestamp, last_received_at, interval_seconds, recovery_rate, updated_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    (project_asset_id, last_ts, now, interval, recovery_rate, now),
+                )
+        return {"project_asset_id": project_asset_id, "last_timestamp": last_ts,
+                "interval_seconds": interval, "recovery_rate": recovery_rate}
+
+    def refresh_all(self) -> int:
+        """Recomputes every asset that has samples (e.g. after a bulk load). Returns the number of assets."""
+        with self._lock:
+            asset_ids = [row[0] for row in self._conn.execute("SELECT DISTINCT project_asset_id FROM samples")]
+        for project_asset_id in asset_ids:
+            self.update_asset(project_asset_id)
+        return len(asset_ids)
+
+    def status_frame(self, now=None) -> pd.DataFrame:
+        """
+        Reads every asset's status in one query.
+        Args:
+            now (float, optional): Epoch seconds to measure data age against. Defaults to the current time.
+        Returns:
+            pd.DataFrame: ProjectAssetID, Status, LastTimestamp, RecoveryRate, LastReceivedAt
+        """
+        now = int(time.time() if now is None else now)
+        query = """
+            SELECT
+                project_asset_id AS ProjectAssetID,
+                CASE
+                    WHEN last_timestamp IS NULL OR ? - last_timestamp > ? THEN 'Down'
+                    WHEN ? - last_timestamp > ? OR recovery_rate < ? THEN 'Stale'
+                    ELSE 'Live'
+                END AS Status,
+                last_timestamp AS LastTimestamp,
+                recovery_rate AS RecoveryRate,
+                last_received_at AS LastReceivedAt
+            FROM asset_status
+        """
+        params = (now, self.down_after, now, self.stale_after, self.min_recovery)
+        with self._lock:
+            frame = pd.read_sql_query(query, self._conn, params=params)
+        frame["LastTimestamp"] = pd.to_datetime(frame["LastTimestamp"], unit="s")
+        frame["LastReceivedAt"] = pd.to_datetime(frame["LastReceivedAt"], unit="s")
+        return frame
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,134 @@
+"""
+Cache of pivoted project asset details.
+
+Responsibilities:
+- Keeps the wide, typed detail frame (see frame_types.pivot_details) per
+  database, one row per ProjectAssetID, so reports and maps reading details
+  for many assets reuse it instead of querying per asset.
+- get() loads only the assets that are missing or older than the ttl, with
+  one loader call for all of them; assets without any detail rows are cached
+  as such, so they are not re-queried either.
+- Writes invalidate the assets they touched (or everything when the asset is
+  only known by name). Every invalidate() starts a new generation of the scope;
+  a load that was running when it happened is returned to its caller but not
+  cached, so it cannot overwrite the invalidation with pre-write rows.
+
+The ttl is read from DAL_DETAIL_CACHE_TTL (seconds, default 300).
+"""
+
+import os
+import threading
+import time
+
+import pandas as pd
+
+DEFAULT_TTL = float(os.getenv("DAL_DETAIL_CACHE_TTL", 300))
+
+
+class _Scope:
+    __slots__ = ("frame", "loaded_at", "complete_at")
+
+    def __init__(self):
+        self.frame = None  # wide frame indexed by ProjectAssetID
+        self.loaded_at = {}  # ProjectAssetID -> load time (also for assets without details)
+        self.complete_at = None  # time of the last load of every asset
+
+
+class DetailCache:
+    def __init__(self, ttl=DEFAULT_TTL):
+        """
+        Args:
+            ttl (float): Seconds a cached asset is served before it is loaded again.
+        """
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._scopes = {}
+        self._generations = {}  # scope -> invalidation count
+        self._epoch = 0  # invalidations of every scope
+        self._stats = {"requests": 0, "hits": 0, "misses": 0, "loads": 0, "discarded": 0}
+
+    def _generation(self, scope):
+        return self._epoch, self._generations.get(scope, 0)
+
+    def get(self, scope, project_asset_ids, loader, fixup=None) -> pd.DataFrame:
+        """
+        Returns the cached rows for the given assets, loading the missing or expired ones first.
+        Args:
+            scope (str): Cache partition, e.g. the database URL.
+            project_asset_ids (iterable or None): Assets to return. None returns every asset and
+                loads them all unless a complete load is still fresh.
+            loader (callable): loader(ids) returns the wide frame for a list of ids (None = all).
+            fixup (callable, optional): Applied to the merged frame (e.g. to restore dtypes).
+        Returns:
+            DataFrame: Indexed by ProjectAssetID, in the order requested (missing assets are left out).
+        """
+        now = time.time()
+        cutoff = now - self.ttl
+        with self._lock:
+            entry = self._scopes.setdefault(scope, _Scope())
+            self._stats["requests"] += 1
+            if project_asset_ids is None:
+                wanted = None
+                missing = None if entry.complete_at is None or entry.complete_at < cutoff else []
+            else:
+                wanted = list(dict.fromkeys(int(i) for i in project_asset_ids))
+                missing = [i for i in wanted if entry.loaded_at.get(i, 0) < cutoff]
+            self._stats["misses" if missing is None or missing else "hits"] += 1
+            generation = self._generation(scope)
+            frame = entry.frame
+
+        if missing is None or missing:
+            loaded = loader(missing)
+            with self._lock:
+                self._stats["loads"] += 1
+                entry = self._scopes.setdefault(scope, _Scope())
+                if missing is None:
+                    frame = loaded
+                else:
+                    keep = entry.frame.drop(index=missing, errors="ignore") if entry.frame is not None else None
+                    merged = loaded if keep is None or keep.empty else pd.concat([keep, loaded])
+                    frame = fixup(merged) if fixup else merged
+                if self._generation(scope) != generation:
+                    # Invalidated while loading: the rows may predate the write, so they aren't kept
+                    self._stats["discarded"] += 1
+                elif missing is None:
+                    entry.frame = frame
+                    entry.loaded_at = dict.fromkeys(loaded.index.tolist(), now)
+                    entry.complete_at = now
+                else:
+                    entry.frame = frame
+                    entry.loaded_at.update(dict.fromkeys(missing, now))
+
+        if frame is None:
+            return pd.DataFrame(index=pd.Index([], name="ProjectAssetID", dtype="int64"))
+        if wanted is None:
+            return frame.copy()
+        return frame.loc[[i for i in wanted if i in frame.index]].copy()
+
+    def invalidate(self, scope=None, project_asset_ids=None):
+        """Drops the given assets of a scope (all of its assets if none are given; every scope if scope is None)."""
+        with self._lock:
+            if scope is None:
+                self._epoch += 1
+                self._scopes.clear()
+                return
+            self._generations[scope] = self._generations.get(scope, 0) + 1
+            entry = self._scopes.get(scope)
+            if entry is None:
+                return
+            if project_asset_ids is None:
+                del self._scopes[scope]
+                return
+            for i in project_asset_ids:
+                entry.loaded_at.pop(int(i), None)
+            entry.complete_at = None
+
+    def stats(self) -> dict:
+        """
+        Counts of requests, requests served entirely from cache (hits), misses, loader calls and
+        loads not cached because of an invalidate() while they ran (discarded).
+        """
+        with self._lock:
+            stats = dict(self._stats)
+            stats["cached_assets"] = sum(len(entry.loaded_at) for entry in self._scopes.values())
+        return stats
@@ -0,0 +1,65 @@
+"""
+Server-side downsampling for time-series charts.
+
+Largest-Triangle-Three-Buckets (Steinarsson, 2013) keeps the points that carry
+the visual shape of a series (peaks, troughs, steps), so a chart rendered at
+N pixels wide looks the same with N points as with the full series.
+"""
+
+import numpy as np
+import pandas as pd
+
+
+def lttb_indices(x, y, threshold: int) -> np.ndarray:
+    """
+    Picks `threshold` points of a series with Largest-Triangle-Three-Buckets.
+    Args:
+        x (array-like): Monotonic x values (numeric).
+        y (array-like): y values, same length as x, without NaNs.
+        threshold (int): Number of points to keep.
+    Returns:
+        np.ndarray: Sorted integer positions of the kept points (always includes the first and last).
+    """
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    n = len(x)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+
+    every = (n - 2) / (threshold - 2)
+    kept = np.empty(threshold, dtype=np.int64)
+    kept[0], kept[-1] = 0, n - 1
+    a = 0
+    for i in range(threshold - 2):
+        start = int(i * every) + 1
+        end = int((i + 1) * every) + 1
+        next_end = min(int((i + 2) * every) + 1, n)
+        avg_x = x[end:next_end].mean()
+        avg_y = y[end:next_end].mean()
+        # Twice the area of the triangle (point a, candidate, next bucket average)
+        area = np.abs((x[a] - avg_x) * (y[start:end] - y[a]) - (x[a] - x[start:end]) * (avg_y - y[a]))
+        a = start + int(area.argmax())
+        kept[i + 1] = a
+    return kept
+
+
+def lttb_series(series: pd.Series, threshold: int) -> pd.Series:
+    """
+    Downsamples a DatetimeIndex-ed series with LTTB (NaNs are dropped first).
+    Returns:
+        pd.Series: At most `threshold` points of the original series.
+    """
+    series = series.dropna()
+    if len(series) <= threshold:
+        return series
+    x = pd.DatetimeIndex(series.index).asi8
+    return series.iloc[lttb_indices(x, series.to_numpy(dtype=float), threshold)]
+
+
+def lttb_frame(frame: pd.DataFrame, threshold: int) -> dict:
+    """
+    Downsamples every column of a wide frame independently.
+    Returns:
+        dict: {column: pd.Series with at most `threshold` points}
+    """
+    return {column: lttb_series(frame[column], threshold) for column in frame.columns}
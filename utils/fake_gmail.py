@@ -0,0 +1,166 @@
+"""
+In-memory stand-in for the Gmail API service object.
+
+Mirrors the subset of googleapiclient's Gmail v1 service used by this app
+(labels list/create, messages list/get, attachments get and batch requests),
+so the Gmail utilities and ingest pipeline can be exercised and benchmarked
+without credentials or network access.
+
+Every HTTP round trip (a single .execute() or one batch .execute()) is counted
+in `http_requests`, and an optional per-request latency simulates the network.
+"""
+
+import base64
+import itertools
+import time
+
+MAX_BATCH_SIZE = 100
+PAGE_SIZE = 100
+
+
+class _Request:
+    def __init__(self, service, handler, **kwargs):
+        self._service = service
+        self._handler = handler
+        self._kwargs = kwargs
+
+    def _call(self):
+        return self._handler(**self._kwargs)
+
+    def execute(self):
+        self._service._round_trip()
+        return self._call()
+
+
+class _Batch:
+    def __init__(self, service, callback=None):
+        self._service = service
+        self._callback = callback
+        self._requests = []
+
+    def add(self, request, callback=None, request_id=None):
+        if len(self._requests) >= MAX_BATCH_SIZE:
+            raise ValueError(f"A batch can hold at most {MAX_BATCH_SIZE} requests.")
+        request_id = request_id or str(len(self._requests))
+        self._requests.append((request_id, request, callback or self._callback))
+
+    def execute(self):
+        self._service._round_trip()
+        self._service.batched_calls += len(self._requests)
+        for request_id, request, callback in self._requests:
+            try:
+                response, exception = request._call(), None
+            except Exception as e:
+                response, exception = None, e
+            if callback:
+                callback(request_id, response, exception)
+
+
+class _Resource:
+    def __init__(self, **methods):
+        for name, method in methods.items():
+            setattr(self, name, method)
+
+
+class FakeGmailService:
+    def __init__(self, latency=0.0):
+        """
+        Args:
+            latency (float): Seconds to sleep per HTTP round trip.
+        """
+        self.latency = latency
+        self.http_requests = 0
+        self.batched_calls = 0
+        self._ids = itertools.count(1)
+        self._labels = {}    # label id -> {'id', 'name', 'type'}
+        self._messages = {}  # message id -> message dict
+        self._attachments = {}  # (message id, attachment id) -> bytes
+
+    def _round_trip(self):
+        self.http_requests += 1
+        if self.latency:
+            time.sleep(self.latency)
+
+    # Test helpers --------------------------------------------------------
+
+    def add_label(self, name: str) -> str:
+        """Creates a user label directly (no round trip) and returns its id."""
+        label_id = f"Label_{next(self._ids)}"
+        self._labels[label_id] = {"id": label_id, "name": name, "type": "user"}
+        return label_id
+
+    def add_message(self, label_id: str, attachments, internal_date=None) -> str:
+        """
+        Adds a message under a label.
+        Args:
+            label_id (str): Label the message is filed under.
+            attachments (list): (filename, bytes) tuples.
+            internal_date (int, optional): Epoch milliseconds. Defaults to now.
+        Returns:
+            str: the message id.
+        """
+        message_id = f"msg{next(self._ids):08x}"
+        parts = []
+        for filename, data in attachments:
+            attachment_id = f"att{next(self._ids)}"
+            self._attachments[(message_id, attachment_id)] = bytes(data)
+            parts.append({
+                "filename": filename,
+                "mimeType": "text/csv",
+                "body": {"attachmentId": attachment_id, "size": len(data)},
+            })
+        self._messages[message_id] = {
+            "id": message_id,
+            "labelIds": [label_id],
+            "internalDate": str(internal_date if internal_date is not None else int(time.time() * 1000)),
+            "payload": {"filename": "", "mimeType": "multipart/mixed", "body": {"size": 0}, "parts": parts},
+        }
+        return message_id
+
+    # googleapiclient surface ---------------------------------------------
+
+    def users(self):
+        return _Resource(labels=self._labels_resource, messages=self._messages_resource)
+
+    def new_batch_http_request(self, callback=None):
+        return _Batch(self, callback)
+
+    def _labels_resource(self):
+        def list_labels(userId, fields=None):
+            return {"labels": [dict(label) for label in self._labels.values()]}
+
+        def create(userId, body):
+            if any(label["name"] == body["name"] for label in self._labels.values()):
+                raise ValueError(f"Label name exists or conflicts: {body['name']}")
+            label_id = self.add_label(body["name"])
+            return dict(self._labels[label_id])
+
+        return _Resource(
+            list=lambda **kw: _Request(self, list_labels, **kw),
+            create=lambda **kw: _Request(self, create, **kw),
+        )
+
+    def _messages_resource(self):
+        def list_messages(userId, labelIds=None, q=None, pageToken=None, maxResults=PAGE_SIZE, fields=None):
+            ids = [m["id"] for m in self._messages.values() if not labelIds or set(labelIds) <= set(m["labelIds"])]
+            start = int(pageToken or 0)
+            page = ids[start:start + min(maxResults, 500)]
+            response = {"messages": [{"id": i} for i in page], "resultSizeEstimate": len(ids)}
+            if start + len(page) < len(ids):
+                response["nextPageToken"] = str(start + len(page))
+            return response
+
+        def get(userId, id, format="full", fields=None):
+            if id not in self._messages:
+                raise KeyError(f"Message {id} not found")
+            return self._messages[id]
+
+        def get_attachment(userId, messageId, id, fields=None):
+            data = self._attachments[(messageId, id)]
+            return {"data": base64.urlsafe_b64encode(data).decode("ascii"), "size": len(data)}
+
+        return _Resource(
+            list=lambda **kw: _Request(self, list_messages, **kw),
+            get=lambda **kw: _Request(self, get, **kw),
+            attachments=lambda: _Resource(get=lambda **kw: _Request(self, get_attachment, **kw)),
+        )
@@ -0,0 +1,414 @@
+"""
+Incremental watcher for the Dropbox / Altosphere drop folders.
+
+Responsibilities:
+- Watches the local sync directory behind each asset's Dropbox and Altosphere
+  path (wizard Step 4, tbl_ingest_config) and reports new or changed logger files
+  to a callback, typically IngestScheduler.submit.
+- Keeps an (mtime, size) index of every file per asset, persisted in the local
+  ETL store, so a sweep only reports files that are new or changed since the
+  last sweep, including across restarts. Two assets watching the same (or a
+  nested) directory each get the file reported.
+- Skips whole directories whose mtime has not changed, so a sweep over an
+  unchanged share costs one stat per directory instead of one per file.
+- On Linux, uses inotify to mark directories dirty as soon as a file is written
+  or moved in (which also catches in-place appends the directory mtime misses)
+  and to trigger the sweep immediately. Elsewhere, or if inotify is unavailable,
+  falls back to polling with a periodic full rescan.
+
+Example:
+    scheduler = IngestScheduler(manifest=IngestManifest())
+    watcher = FolderWatcher(roots_from_ingest_configs(dbc.getIngestConfigs()), scheduler.submit)
+    watcher.start()
+"""
+
+import ctypes
+import ctypes.util
+import os
+import select
+import sqlite3
+import struct
+import threading
+import time
+
+from utils.timeseries_store import DEFAULT_STORE_PATH
+
+WATCH_EXTENSIONS = (".csv", ".txt", ".dat")
+IGNORED_PREFIXES = (".", "~", ".~")  # hidden files and sync-client temp files
+
+DROPBOX_SYNC_ROOT = os.environ.get("DROPBOX_SYNC_ROOT", os.path.expanduser("~/Dropbox"))
+ALTOSPHERE_SYNC_ROOT = os.environ.get("ALTOSPHERE_SYNC_ROOT", os.path.expanduser("~/Altosphere"))
+
+
+def roots_from_ingest_configs(ingest_configs, dropbox_root=None, altosphere_root=None) -> list:
+    """
+    Builds the watch roots from the ingest configuration.
+    Args:
+        ingest_configs (list): dicts with 'ProjectAssetID', 'DropboxPath', 'AltospherePath'
+            (e.g. DBcontoller.getIngestConfigs()).
+        dropbox_root (str, optional): Local Dropbox sync directory. Defaults to DROPBOX_SYNC_ROOT.
+        altosphere_root (str, optional): Local Altosphere sync directory. Defaults to ALTOSPHERE_SYNC_ROOT.
+    Returns:
+        list: (project_asset_id, absolute directory) tuples for the paths that exist locally.
+    """
+    bases = {"DropboxPath": dropbox_root or DROPBOX_SYNC_ROOT,
+             "AltospherePath": altosphere_root or ALTOSPHERE_SYNC_ROOT}
+    roots = []
+    for config in ingest_configs:
+        if config.get("ProjectAssetID") is None:
+            continue
+        for column, base in bases.items():
+            path = config.get(column)
+            if not path:
+                continue
+            path = os.path.abspath(os.path.join(base, str(path).strip().lstrip("/\\")))
+            if os.path.isdir(path):
+                roots.append((int(config["ProjectAssetID"]), path))
+            else:
+                print(f"Watch path for ProjectAssetID {config['ProjectAssetID']} not found: {path}")
+    return roots
+
+
+class _Inotify:
+    """Minimal ctypes binding for Linux inotify (directory watches only)."""
+
+    IN_MODIFY = 0x00000002
+    IN_CLOSE_WRITE = 0x00000008
+    IN_MOVED_FROM = 0x00000040
+    IN_MOVED_TO = 0x00000080
+    IN_CREATE = 0x00000100
+    IN_DELETE = 0x00000200
+    IN_DELETE_SELF = 0x00000400
+    IN_MOVE_SELF = 0x00000800
+    IN_Q_OVERFLOW = 0x00004000
+    IN_IGNORED = 0x00008000
+    IN_ONLYDIR = 0x01000000
+    MASK = (IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE
+            | IN_DELETE_SELF | IN_MOVE_SELF | IN_ONLYDIR)
+    _EVENT = struct.Struct("iIII")
+
+    def __init__(self):
+        self._libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        self.fd = self._libc.inotify_init1(os.O_CLOEXEC | os.O_NONBLOCK)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self._paths = {}  # wd -> directory
+        self._wds = {}    # directory -> wd
+
+    def watch(self, directory):
+        if directory in self._wds:
+            return
+        wd = self._libc.inotify_add_watch(self.fd, os.fsencode(directory), self.MASK)
+        if wd < 0:
+            raise OSError(ctypes.get_errno(), f"inotify_add_watch failed for {directory}")
+        self._paths[wd] = directory
+        self._wds[directory] = wd
+
+    def read(self, timeout):
+        """
+        Waits up to timeout seconds for events.
+        Returns:
+            tuple: (set of directories with activity, overflowed flag)
+        """
+        dirty, overflow = set(), False
+        readable, _, _ = select.select([self.fd], [], [], timeout)
+        if not readable:
+            return dirty, overflow
+        while True:
+            try:
+                data = os.read(self.fd, 64 * 1024)
+            except BlockingIOError:
+                break
+            offset = 0
+            while offset < len(data):
+                wd, mask, _cookie, length = self._EVENT.unpack_from(data, offset)
+                offset += self._EVENT.size + length
+                if mask & self.IN_Q_OVERFLOW:
+                    overflow = True
+                directory = self._paths.get(wd)
+                if directory is not None:
+                    dirty.add(directory)
+                if mask & self.IN_IGNORED and directory is not None:
+                    del self._paths[wd]
+                    self._wds.pop(directory, None)
+        return dirty, overflow
+
+    def close(self):
+        os.close(self.fd)
+
+
+class _Dir:
+    __slots__ = ("mtime_ns", "subdirs", "files")
+
+    def __init__(self):
+        self.mtime_ns = None  # None forces a listing on the next sweep
+        self.subdirs = set()
+        self.files = {}       # name -> (mtime_ns, size)
+
+
+class FolderWatcher:
+    def __init__(self, roots, on_change, store_path=None, poll_interval=30.0, full_rescan_every=20,
+                 settle_seconds=2.0, use_inotify=True):
+        """
+        Args:
+            roots (list): (project_asset_id, directory) tuples, see roots_from_ingest_configs().
+            on_change (callable): Called as on_change(project_asset_id, path, timestamp) for each new
+                or changed file, oldest first. If it raises, the file is reported again next sweep.
+            store_path (str, optional): SQLite file for the persisted index. Defaults to ETL_STORE_PATH.
+            poll_interval (float): Seconds between sweeps (upper bound when inotify is active).
+            full_rescan_every (int): Every Nth sweep lists every directory regardless of its mtime.
+            settle_seconds (float): Files modified more recently than this are left for the next sweep.
+            use_inotify (bool): Use inotify where available.
+        """
+        self.roots = [(int(asset_id), os.path.abspath(path)) for asset_id, path in roots]
+        self.on_change = on_change
+        self.poll_interval = poll_interval
+        self.full_rescan_every = full_rescan_every
+        self.settle_seconds = settle_seconds
+        self.sweeps = 0
+        self.last_sweep = {}
+        self._dirs = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+        self._conn = sqlite3.connect(store_path or DEFAULT_STORE_PATH, timeout=30, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        columns = [row[1] for row in self._conn.execute("PRAGMA table_info(watch_index)")]
+        if columns and "project_asset_id" not in columns:
+            # Index from before it was kept per asset: rebuilt by the first sweep (the ingest
+            # manifest skips files it already holds)
+            self._conn.execute("DROP TABLE watch_index")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS watch_index (
+                project_asset_id INTEGER NOT NULL,
+                path TEXT NOT NULL,
+                directory TEXT NOT NULL,
+                mtime_ns INTEGER NOT NULL,
+                size INTEGER NOT NULL,
+                PRIMARY KEY (project_asset_id, path)
+            ) WITHOUT ROWID
+        """)
+        self._conn.commit()
+        self._load_index()
+
+        self._inotify = None
+        if use_inotify and hasattr(os, "O_CLOEXEC") and os.uname().sysname == "Linux":
+            try:
+                self._inotify = _Inotify()
+            except (OSError, AttributeError) as e:
+                print(f"inotify unavailable, falling back to polling: {e}")
+
+    @property
+    def using_inotify(self) -> bool:
+        return self._inotify is not None
+
+    def _load_index(self):
+        """Restores the per-file index; directory mtimes are not restored, so the first sweep lists everything."""
+        roots = {}
+        for project_asset_id, path in self.roots:
+            roots.setdefault(project_asset_id, []).append(path)
+        for project_asset_id, path, directory, mtime_ns, size in self._conn.execute(
+                "SELECT project_asset_id, path, directory, mtime_ns, size FROM watch_index"):
+            if any(directory == root or directory.startswith(root.rstrip(os.sep) + os.sep)
+                   for root in roots.get(project_asset_id, ())):
+                entry = self._dirs.setdefault((project_asset_id, directory), _Dir())
+                entry.files[os.path.basename(path)] = (mtime_ns, size)
+
+    def _watch(self, directory):
+        if self._inotify is None:
+            return
+        try:
+            self._inotify.watch(directory)
+        except OSError as e:
+            # Typically fs.inotify.max_user_watches; the periodic full rescan still covers this directory
+            print(f"Could not watch {directory}: {e}")
+
+    def _forget(self, project_asset_id, directory, removed):
+        entry = self._dirs.pop((project_asset_id, directory), None)
+        if entry is None:
+            return
+        removed.extend((project_asset_id, os.path.join(directory, name)) for name in entry.files)
+        for subdir in entry.subdirs:
+            self._forget(project_asset_id, subdir, removed)
+
+    def _scan(self, project_asset_id, directory, full, now, changes, removed):
+        try:
+            stat = os.stat(directory)
+        except FileNotFoundError:
+            self._forget(project_asset_id, directory, removed)
+            return
+        entry = self._dirs.setdefault((project_asset_id, directory), _Dir())
+
+        if not full and entry.mtime_ns == stat.st_mtime_ns:
+            for subdir in list(entry.subdirs):
+                self._scan(project_asset_id, subdir, full, now, changes, removed)
+            return
+
+        self._watch(directory)
+        seen_files, seen_dirs, unsettled = set(), set(), False
+        try:
+            with os.scandir(directory) as it:
+                for item in it:
+                    if item.name.startswith(IGNORED_PREFIXES):
+                        continue
+                    if item.is_dir(follow_symlinks=False):
+                        seen_dirs.add(item.path)
+                        continue
+                    if not item.name.lower().endswith(WATCH_EXTENSIONS):
+                        continue
+                    try:
+                        item_stat = item.stat()
+                    except FileNotFoundError:
+                        continue
+                    seen_files.add(item.name)
+                    signature = (item_stat.st_mtime_ns, item_stat.st_size)
+                    if entry.files.get(item.name) == signature:
+                        continue
+                    if now - item_stat.st_mtime < self.settle_seconds:
+                        unsettled = True
+                        continue
+                    changes.append((item_stat.st_mtime, directory, item.name, signature))
+        except (FileNotFoundError, NotADirectoryError):
+            self._forget(project_asset_id, directory, removed)
+            return
+
+        for name in set(entry.files) - seen_files:
+            del entry.files[name]
+            removed.append((project_asset_id, os.path.join(directory, name)))
+        for subdir in entry.subdirs - seen_dirs:
+            self._forget(project_asset_id, subdir, removed)
+        entry.subdirs = seen_dirs
+        # A directory with files still being written is listed again next sweep
+        entry.mtime_ns = None if unsettled else stat.st_mtime_ns
+        for subdir in seen_dirs:
+            self._scan(project_asset_id, subdir, full, now, changes, removed)
+
+    def sweep(self, full=False) -> dict:
+        """
+        Runs one pass over every root and reports new or changed files to on_change.
+        Args:
+            full (bool): List every directory even if its mtime is unchanged.
+        Returns:
+            dict: changed, reported, failed, removed, directories, seconds
+        """
+        with self._lock:
+            started = time.perf_counter()
+            full = full or (self.full_rescan_every and self.sweeps % self.full_rescan_every == 0)
+            now = time.time()
+            reported, failed, updated, removed = 0, 0, [], []
+            for project_asset_id, root in self.roots:
+                changes = []
+                self._scan(project_asset_id, root, full, now, changes, removed)
+                for timestamp, directory, name, signature in sorted(changes):
+                    path = os.path.join(directory, name)
+                    try:
+                        self.on_change(project_asset_id, path, timestamp)
+                    except Exception as e:
+                        print(f"Error reporting {path} for ProjectAssetID {project_asset_id}: {e}")
+                        self._dirs[(project_asset_id, directory)].mtime_ns = None
+                        failed += 1
+                        continue
+                    self._dirs[(project_asset_id, directory)].files[name] = signature
+                    updated.append((project_asset_id, path, directory) + signature)
+                    reported += 1
+
+            if updated or removed:
+                with self._conn:
+                    self._conn.executemany(
+                        "INSERT OR REPLACE INTO watch_index (project_asset_id, path, directory, mtime_ns, size) "
+                        "VALUES (?, ?, ?, ?, ?)",
+                        updated,
+                    )
+                    self._conn.executemany("DELETE FROM watch_index WHERE project_asset_id = ? AND path = ?", removed)
+
+            self.sweeps += 1
+            self.last_sweep = {
+                "full": bool(full),
+                "changed": reported + failed,
+                "reported": reported,
+                "failed": failed,
+                "removed": len(removed),
+                "directories": len(self._dirs),
+                "seconds": time.perf_counter() - started,
+            }
+            return self.last_sweep
+
+    def mark_dirty(self, directories):
+        """Forces the given directories to be listed on the next sweep."""
+        directories = set(directories)
+        with self._lock:
+            for (_, directory), entry in self._dirs.items():
+                if directory in directories:
+                    entry.mtime_ns = None
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                self.sweep()
+            except Exception as e:
+                print(f"Folder watcher sweep failed: {e}")
+            if self._inotify is None:
+                self._stop.wait(self.poll_interval)
+                continue
+            dirty, overflow = self._inotify.read(self.poll_interval)
+            # Let a burst of writes (a sync client dropping many files) finish before sweeping
+            while dirty and not self._stop.is_set():
+                more, more_overflow = self._inotify.read(min(self.settle_seconds, 0.5))
+                overflow = overflow or more_overflow
+                if not more:
+                    break
+                dirty |= more
+            self.mark_dirty(dirty)
+            if overflow:
+                self.mark_dirty([directory for _, directory in self._dirs])
+
+    def start(self):
+        """Starts sweeping in a background thread."""
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="folder-watcher", daemon=True)
+            self._thread.start()
+
+    def stop(self, timeout=None):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def close(self):
+        self.stop()
+        if self._inotify is not None:
+            self._inotify.close()
+            self._inotify = None
+        with self._lock:
+            self._conn.close()
+
+
+if __name__ == "__main__":
+    # Benchmark: 40k files in 400 directories, cold sweep vs. unchanged sweep vs. one new file
+    import tempfile
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = os.path.join(tmp, "Tower")
+        for d in range(400):
+            directory = os.path.join(root, f"{2020 + d // 100}", f"day_{d:03d}")
+            os.makedirs(directory)
+            for f in range(100):
+                with open(os.path.join(directory, f"tower_{f:03d}.csv"), "w") as handle:
+                    handle.write("Timestamp,WS_80m\n")
+        past = time.time() - 60
+        for dirpath, _, filenames in os.walk(root):
+            for name in filenames:
+                os.utime(os.path.join(dirpath, name), (past, past))
+
+        seen = []
+        watcher = FolderWatcher([(1, root)], lambda asset, path, ts: seen.append(path),
+                                store_path=os.path.join(tmp, "watch.sqlite"), settle_seconds=0)
+        print("cold sweep:     ", watcher.sweep(), len(seen))
+        print("unchanged sweep:", watcher.sweep())
+        with open(os.path.join(root, "2021", "day_150", "new.csv"), "w") as handle:
+            handle.write("Timestamp,WS_80m\n")
+        print("one new file:   ", watcher.sweep())
+        print("forced full:    ", watcher.sweep(full=True))
+        watcher.close()
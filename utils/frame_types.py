@@ -0,0 +1,122 @@
+"""
+Memory-compact dtypes for DAL catalog frames.
+
+Responsibilities:
+- Labels that repeat on every row (client, project, asset type, paired MET)
+  become categoricals: one copy of each string plus a small integer code per row.
+- ID columns become nullable integers (Int64) instead of float64-with-NaN
+  (which is what read_sql returns for an ID column containing NULLs).
+- Unique free-text columns (asset names) use Arrow-backed strings when the
+  optional `pyarrow` package is installed, and stay object dtype otherwise.
+- pivot_details() turns tbl_project_asset_detail property/value rows into one
+  typed column per property (Latitude, Elevation, ... as float64).
+
+Run this module to print bytes per row before and after at 100k assets.
+"""
+
+import pandas as pd
+
+try:
+    import pyarrow  # noqa: F401
+    STRING_DTYPE = "string[pyarrow]"
+except ImportError:
+    STRING_DTYPE = None
+
+CATEGORY = "category"
+ID = "Int64"
+STRING = "string"
+FLOAT = "float"
+
+CLIENTS_PROJECTS_ASSETS_DETAILED_DTYPES = {
+    "ClientName": CATEGORY,
+    "ProjectName": CATEGORY,
+    "ProjectAssetID": ID,
+    "AssetName": STRING,
+    "AssetType": CATEGORY,
+    "PairProjectAssetID": ID,
+    "PairedAssetName": CATEGORY,
+    "PairedMET": CATEGORY,
+}
+
+# Known tbl_project_asset_detail properties (stored as text); others stay text
+PROJECT_ASSET_DETAIL_DTYPES = {
+    "Latitude": FLOAT,
+    "Longitude": FLOAT,
+    "Elevation": FLOAT,
+}
+
+
+def compact_frame(df, dtypes) -> pd.DataFrame:
+    """
+    Converts the columns named in dtypes (missing columns are skipped).
+    Args:
+        df (DataFrame): Frame as returned by read_sql.
+        dtypes (dict): column -> CATEGORY, ID, STRING or FLOAT (unparseable values become NaN).
+    Returns:
+        DataFrame: The converted frame (a new object; df is not modified).
+    """
+    converted = {}
+    for column, kind in dtypes.items():
+        if column not in df.columns:
+            continue
+        if kind == CATEGORY:
+            converted[column] = df[column].astype("category")
+        elif kind == ID:
+            converted[column] = pd.to_numeric(df[column], errors="coerce").round().astype("Int64")
+        elif kind == FLOAT:
+            converted[column] = pd.to_numeric(df[column], errors="coerce").astype("float64")
+        elif kind == STRING and STRING_DTYPE is not None:
+            converted[column] = df[column].astype(STRING_DTYPE)
+    return df.assign(**converted) if converted else df
+
+
+def pivot_details(rows, dtypes=PROJECT_ASSET_DETAIL_DTYPES) -> pd.DataFrame:
+    """
+    Pivots property/value rows into one row per asset and one column per property.
+    Args:
+        rows (DataFrame): ProjectAssetID, property, value; when a property appears more than once
+            for an asset, the last row wins (read them oldest first).
+        dtypes (dict): property -> kind, as in compact_frame().
+    Returns:
+        DataFrame: Indexed by ProjectAssetID, columns sorted by property name. Every property
+            in dtypes has a column, even if no asset has a value for it.
+    """
+    rows = rows.drop_duplicates(["ProjectAssetID", "property"], keep="last")
+    wide = rows.pivot(index="ProjectAssetID", columns="property", values="value")
+    wide.columns.name = None
+    wide.index = wide.index.astype("int64")
+    wide = wide.reindex(columns=sorted(set(wide.columns) | set(dtypes)))
+    return compact_frame(wide, dtypes)
+
+
+def bytes_per_row(df) -> float:
+    """Deep memory usage of a frame divided by its row count."""
+    return df.memory_usage(deep=True).sum() / max(len(df), 1)
+
+
+if __name__ == "__main__":
+    # Benchmark: get_clients_projects_assets_detailed-shaped frame with 100k assets
+    import numpy as np
+
+    rows = 100_000
+    rng = np.random.default_rng(0)
+    project = rng.integers(0, 3000, rows)
+    asset_type = rng.choice(["MET Tower", "Lidar", "Sodar"], rows, p=[0.5, 0.4, 0.1])
+    paired = np.where(asset_type == "Lidar", rng.integers(1, rows, rows), -1)
+    raw = pd.DataFrame({
+        "ClientName": [f"Client {p % 150:03d}" for p in project],
+        "ProjectName": [f"Project {p:04d}" for p in project],
+        "ProjectAssetID": np.arange(1, rows + 1, dtype="int64"),
+        "AssetName": [f"ASSET-{i:06d}" for i in range(rows)],
+        "AssetType": asset_type.astype(object),
+        "PairProjectAssetID": np.where(paired > 0, paired, np.nan),
+        "PairedAssetName": [f"MET-{p % 1500:04d}" if p > 0 else None for p in paired],
+    })
+    raw["PairedMET"] = raw["PairedAssetName"]
+
+    compact = compact_frame(raw, CLIENTS_PROJECTS_ASSETS_DETAILED_DTYPES)
+    before, after = bytes_per_row(raw), bytes_per_row(compact)
+    print(f"strings: {STRING_DTYPE or 'object (pyarrow not installed)'}")
+    print(f"before: {before:7.1f} bytes/row ({before * rows / 1e6:6.1f} MB)")
+    print(f"after:  {after:7.1f} bytes/row ({after * rows / 1e6:6.1f} MB), {before / after:.1f}x smaller")
+    print(compact.dtypes.to_string())
@@ -1,6 +1,10 @@
 import os
+import threading
+import time
+import weakref
 import httplib2
 from googleapiclient.discovery import build
+from googleapiclient.errors import HttpError
 from oauth2client import client
 import pandas as pd
 
@@ -35,49 +39,156 @@ def create_gmail_service():
     service = build('gmail', 'v1', http=http, cache_discovery=False)
     return service
 
-def get_gmail_label_ids_df():
+_service = None
+_service_lock = threading.Lock()
+
+def get_gmail_service():
     """
-    Fetches all Gmail labels and returns them as a Pandas DataFrame
-    sorted by a numeric key if present in the label ID.
+    Returns a long-lived Gmail service, building (and authorizing) it on first use.
+    oauth2client refreshes the access token on the same object as it expires.
     """
-    service = create_gmail_service()
-    all_labels_raw = service.users().labels().list(userId="me").execute()
+    global _service
+    with _service_lock:
+        if _service is None:
+            _service = create_gmail_service()
+        return _service
 
-    ids = []
-    names = []
+LABEL_INDEX_TTL = int(os.environ.get('GMAIL_LABEL_INDEX_TTL', 300))
 
-    if 'labels' in all_labels_raw:
-        for label_dict in all_labels_raw['labels']:
-            ids.append(label_dict.get('id'))
-            names.append(label_dict.get('name'))
-    
-    if not names: # Handle case with no labels
-        return pd.DataFrame(columns=['ids', 'Sort_Key'])
+class GmailLabelIndex:
+    """
+    In-memory index of the mailbox's labels (name -> id, parent -> children),
+    refreshed with a single labels.list call once it is older than the TTL.
+    """
 
-    label_frame = pd.DataFrame(index=names)
-    label_frame['ids'] = ids
-    
-    # Extract numbers from each string and convert them to integers
-    # Safely handle cases where 'ids' might be None or not split as expected
-    sort_keys = []
-    for x_id in label_frame['ids']:
-        if x_id and isinstance(x_id, str):
-            parts = x_id.split("_")
-            if len(parts) > 1 and parts[-1].isdigit():
-                sort_keys.append(float(parts[-1]))
-            else:
-                sort_keys.append(float('nan'))
-        else:
-            sort_keys.append(float('nan'))
-            
-    label_frame['Sort_Key'] = sort_keys
-    df_sorted = label_frame.sort_values(by='Sort_Key', ascending=False)
-    return df_sorted.drop(columns='Sort_Key') # Drop the helper sort key
+    def __init__(self, service=None, ttl=LABEL_INDEX_TTL, weak_service=False):
+        """
+        weak_service: hold the service by weak reference (used by get_label_index, so the
+        shared index never keeps a discarded service alive).
+        """
+        service = service or get_gmail_service()
+        self._service = weakref.ref(service) if weak_service else (lambda: service)
+        self.ttl = ttl
+        self._lock = threading.RLock()
+        self._by_name = {}
+        self._children = {}
+        self._loaded_at = None
+
+    @property
+    def service(self):
+        return self._service()
+
+    def refresh(self):
+        """Re-downloads every label and rebuilds the index."""
+        response = self.service.users().labels().list(userId="me", fields="labels(id,name)").execute()
+        with self._lock:
+            self._by_name = {}
+            self._children = {}
+            for label in response.get('labels', []):
+                self._add(label['name'], label['id'])
+            self._loaded_at = time.monotonic()
+
+    def _add(self, name, label_id):
+        self._by_name[name] = label_id
+        if '/' in name:
+            parent = name.rsplit('/', 1)[0]
+            self._children.setdefault(parent, []).append(name)
+
+    def _ensure_fresh(self):
+        with self._lock:
+            expired = self._loaded_at is None or time.monotonic() - self._loaded_at > self.ttl
+        if expired:
+            self.refresh()
+
+    def invalidate(self):
+        """Forces the next lookup to re-download the labels."""
+        with self._lock:
+            self._loaded_at = None
+
+    def __contains__(self, name):
+        return self.get_id(name) is not None
+
+    def get_id(self, name):
+        """Returns the label id for a full label name (e.g. 'Client/Tower'), or None."""
+        self._ensure_fresh()
+        with self._lock:
+            return self._by_name.get(name)
+
+    def children(self, parent):
+        """Returns the full names of the labels directly under a parent label."""
+        self._ensure_fresh()
+        with self._lock:
+            return list(self._children.get(parent, []))
+
+    def ensure_labels(self, label_names):
+        """
+        Makes sure every label exists, creating only the missing ones (parents before children).
+        Every missing name is created, parents included; use check_or_create_gmail_label() to
+        refuse a label whose parent does not exist yet.
+
+        Args:
+            label_names (list): Full label names, e.g. ["Client", "Client/Tower1", "Client/Tower2"].
+
+        Returns:
+            dict: {label_name: {'status': 'found'/'created'/'error', 'label_id': ..., 'message': ...}}
+        """
+        self._ensure_fresh()
+        results = {}
+        for name in sorted(set(label_names), key=lambda n: n.count('/')):
+            with self._lock:
+                label_id = self._by_name.get(name)
+            if label_id is not None:
+                results[name] = {'status': 'found', 'label_id': label_id, 'label_name': name}
+                continue
+            label_body = {
+                'name': name,
+                'labelListVisibility': 'labelShow',
+                'messageListVisibility': 'show',
+            }
+            try:
+                created_label = self.service.users().labels().create(userId='me', body=label_body).execute()
+            except HttpError as e:
+                # 409: created outside the app since the index was loaded
+                if e.resp.status == 409:
+                    self.refresh()
+                    with self._lock:
+                        label_id = self._by_name.get(name)
+                    if label_id is not None:
+                        results[name] = {'status': 'found', 'label_id': label_id, 'label_name': name}
+                        continue
+                results[name] = {'status': 'error', 'label_name': name, 'message': str(e)}
+                continue
+            except Exception as e:
+                results[name] = {'status': 'error', 'label_name': name, 'message': str(e)}
+                continue
+            with self._lock:
+                self._add(created_label['name'], created_label['id'])
+            results[name] = {'status': 'created', 'label_id': created_label['id'], 'label_name': created_label['name']}
+        return results
+
+# Service -> its GmailLabelIndex; entries go away with their service
+_label_indexes = weakref.WeakKeyDictionary()
+_label_indexes_lock = threading.Lock()
+
+def get_label_index(service=None):
+    """Returns the shared GmailLabelIndex for a service (the cached service by default)."""
+    service = service or get_gmail_service()
+    with _label_indexes_lock:
+        index = _label_indexes.get(service)
+        if index is None:
+            index = _label_indexes[service] = GmailLabelIndex(service, weak_service=True)
+        return index
+
+def ensure_labels(label_names, service=None):
+    """Module-level shortcut for get_label_index(service).ensure_labels(label_names)."""
+    return get_label_index(service).ensure_labels(label_names)
 
 def check_or_create_gmail_label(service, target_label_name, client_name_for_parent_check):
     """
     Checks if a Gmail label exists. If not, attempts to create it.
     Also checks if the parent label (client_name) exists.
+    Lookups go through the shared GmailLabelIndex, so repeated calls do not
+    re-download the label list until its TTL expires.
 
     Args:
         service: Authorized Gmail API service instance.
@@ -91,44 +202,20 @@ def check_or_create_gmail_label(service, target_label_name, client_name_for_pare
                'message': 'error message if any'}
     """
     try:
-        labels_df = get_gmail_label_ids_df() # Re-fetch current labels
+        label_index = get_label_index(service)
 
-        # Check if parent label exists
-        if client_name_for_parent_check not in labels_df.index:
+        # Check if parent label exists (never created here, unlike ensure_labels)
+        if client_name_for_parent_check not in label_index:
             return {
                 'status': 'parent_not_found',
                 'label_name': target_label_name,
                 'parent_label_name': client_name_for_parent_check,
                 'message': f"Parent label '{client_name_for_parent_check}' does not exist."
             }
-        
-        parent_label_id = labels_df.loc[client_name_for_parent_check, 'ids']
 
-        # Check if the target label exists
-        if target_label_name in labels_df.index:
-            label_id = labels_df.loc[target_label_name, 'ids']
-            return {
-                'status': 'found',
-                'label_id': label_id,
-                'label_name': target_label_name
-            }
-        else:
-            # Label does not exist, create it
-            # For nested labels, Gmail API usually handles creation if the parent exists.
-            # The 'name' field for label creation is the full path.
-            label_body = {
-                'name': target_label_name,
-                'labelListVisibility': 'labelShow',
-                'messageListVisibility': 'show',
-                # If creating nested labels under a specific parent ID is required by API version/behavior:
-                # 'parentLabelId': parent_label_id # This might not be standard for 'name' based creation
-            }
-            created_label = service.users().labels().create(userId='me', body=label_body).execute()
-            return {
-                'status': 'created',
-                'label_id': created_label['id'],
-                'label_name': created_label['name']
-            }
+        # Returns 'found' if the target label exists, otherwise creates it.
+        # The 'name' field for label creation is the full path.
+        return label_index.ensure_labels([target_label_name])[target_label_name]
     except Exception as e:
         return {
             'status': 'error',
@@ -136,6 +223,46 @@ def check_or_create_gmail_label(service, target_label_name, client_name_for_pare
             'message': str(e)
         }
 
+def get_gmail_label_ids_df(service=None):
+    """
+    Fetches all Gmail labels and returns them as a Pandas DataFrame
+    sorted by a numeric key if present in the label ID.
+    Uses the cached service unless one is passed in.
+    """
+    service = service or get_gmail_service()
+    all_labels_raw = service.users().labels().list(userId="me").execute()
+
+    ids = []
+    names = []
+
+    if 'labels' in all_labels_raw:
+        for label_dict in all_labels_raw['labels']:
+            ids.append(label_dict.get('id'))
+            names.append(label_dict.get('name'))
+    
+    if not names: # Handle case with no labels
+        return pd.DataFrame(columns=['ids', 'Sort_Key'])
+
+    label_frame = pd.DataFrame(index=names)
+    label_frame['ids'] = ids
+    
+    # Extract numbers from each string and convert them to integers
+    # Safely handle cases where 'ids' might be None or not split as expected
+    sort_keys = []
+    for x_id in label_frame['ids']:
+        if x_id and isinstance(x_id, str):
+            parts = x_id.split("_")
+            if len(parts) > 1 and parts[-1].isdigit():
+                sort_keys.append(float(parts[-1]))
+            else:
+                sort_keys.append(float('nan'))
+        else:
+            sort_keys.append(float('nan'))
+            
+    label_frame['Sort_Key'] = sort_keys
+    df_sorted = label_frame.sort_values(by='Sort_Key', ascending=False)
+    return df_sorted.drop(columns='Sort_Key') # Drop the helper sort key
+
 if __name__ == '__main__':
     # Example Usage (requires .env file with credentials)
     try:
@@ -144,7 +271,7 @@ if __name__ == '__main__':
         # print(all_labels)
 
         # print("\nChecking/Creating a test label...")
-        # service = create_gmail_service()
+        # service = get_gmail_service()
         
         # Ensure parent 'TestClient Cline' exists first if you run this directly
         # result_parent = check_or_create_gmail_label(service, "TestClient Cline", "TestClient Cline") # Creates if not exists
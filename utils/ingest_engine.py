@@ -0,0 +1,110 @@
+"""
+Ingest engine for logger data files.
+
+Responsibilities:
+- Parses logger exports (CSV/TXT/DAT, including Campbell TOA5 files) into
+  Timestamp-indexed frames with one numeric column per channel.
+- Writes the parsed data into the local TimeseriesStore for a ProjectAssetID.
+- Updates the asset's precomputed status row (utils/asset_status.py) after each write.
+
+Functions here are module-level so they can be sent to worker processes
+(see utils/ingest_scheduler.py).
+"""
+
+import io
+import os
+
+import pandas as pd
+
+from utils.asset_status import get_status_service
+from utils.timeseries_store import TimeseriesStore
+
+# One store (and SQLite connection) per store path per process
+_stores = {}
+
+
+def get_store(store_path=None) -> TimeseriesStore:
+    """Returns this process' TimeseriesStore for the given path, opening it on first use."""
+    key = store_path or ""
+    if key not in _stores:
+        _stores[key] = TimeseriesStore(store_path)
+    return _stores[key]
+
+
+def read_logger_file(source, name=None) -> pd.DataFrame:
+    """
+    Parses a logger export into a Timestamp-indexed frame of numeric channels.
+    Args:
+        source: A file path, or a bytes payload (e.g. an email attachment).
+        name (str, optional): File name, used in error messages for byte payloads.
+    Returns:
+        pd.DataFrame: DatetimeIndex named 'Timestamp', one float column per channel.
+    """
+    if isinstance(source, (bytes, bytearray)):
+        text = bytes(source).decode("utf-8-sig", errors="replace")
+    else:
+        name = name or os.path.basename(source)
+        with open(source, "r", encoding="utf-8-sig", errors="replace") as handle:
+            text = handle.read()
+
+    lines = text.splitlines()
+    if not lines:
+        raise ValueError(f"Logger file '{name}' is empty.")
+
+    # TOA5: line 0 is station info, line 1 the header, lines 2-3 units and aggregation
+    if lines[0].lstrip('"').startswith("TOA5"):
+        header_row, skip_rows = 1, [2, 3]
+    else:
+        header_row, skip_rows = 0, None
+    header = lines[header_row]
+    separator = max([",", "\t", ";"], key=header.count)
+
+    frame = pd.read_csv(io.StringIO(text), sep=separator, header=header_row, skiprows=skip_rows, low_memory=False)
+    frame.columns = [str(c).strip() for c in frame.columns]
+
+    time_columns = [c for c in frame.columns if "time" in c.lower() or "date" in c.lower()]
+    time_column = time_columns[0] if time_columns else frame.columns[0]
+    timestamps = pd.to_datetime(frame.pop(time_column), errors="coerce")
+
+    frame = frame.apply(pd.to_numeric, errors="coerce")
+    frame.index = pd.DatetimeIndex(timestamps, name="Timestamp")
+    frame = frame[frame.index.notna()].dropna(axis=1, how="all")
+    if frame.empty:
+        raise ValueError(f"Logger file '{name}' has no timestamped numeric data.")
+    return frame.sort_index()
+
+
+def _ingest_frame(project_asset_id, frame, source, store_path=None) -> dict:
+    written = get_store(store_path).write_frame(project_asset_id, frame)
+    try:
+        get_status_service(store_path).update_asset(project_asset_id)
+    except Exception as e:
+        # The data is stored; status catches up on the next write or refresh_all()
+        print(f"Error updating status for ProjectAssetID {project_asset_id}: {e}")
+    return {
+        "project_asset_id": int(project_asset_id),
+        "source": source,
+        "rows": len(frame),
+        "samples": written["samples"],
+        "periods": written["periods"],
+        "first_timestamp": frame.index.min(),
+        "last_timestamp": frame.index.max(),
+    }
+
+
+def ingest_file(project_asset_id: int, path: str, store_path=None) -> dict:
+    """
+    Parses one logger file and writes it to the store.
+    Args:
+        project_asset_id (int): The ProjectAssetID the file belongs to.
+        path (str): Path of the logger file.
+        store_path (str, optional): TimeseriesStore path. Defaults to ETL_STORE_PATH.
+    Returns:
+        dict: project_asset_id, source, rows, samples, periods, first_timestamp, last_timestamp
+    """
+    return _ingest_frame(project_asset_id, read_logger_file(path), path, store_path)
+
+
+def ingest_bytes(project_asset_id: int, name: str, data: bytes, store_path=None) -> dict:
+    """Same as ingest_file() for an in-memory payload such as an email attachment."""
+    return _ingest_frame(project_asset_id, read_logger_file(data, name), name, store_path)
@@ -0,0 +1,149 @@
+"""
+Ingest manifest: which files have already been ingested.
+
+Responsibilities:
+- Records every ingested file by content hash (SHA-256) and source path, with the
+  ProjectAssetID it was applied to, in the local ETL store.
+- Keeps all known hashes in an in-memory set, so a duplicate check during a
+  Dropbox rescan or a Gmail label replay is a set lookup instead of a re-parse.
+
+The same content arriving under a new path (a renamed file, the same attachment
+in a second email) is still a duplicate; the new path is recorded alongside it
+(IngestScheduler.submit and the Gmail ingest both record skipped duplicates).
+Source paths are kept in memory too, so sources that are expensive to fetch
+(Gmail attachments) can be skipped before downloading them.
+"""
+
+import hashlib
+import sqlite3
+import threading
+import time
+
+from utils.timeseries_store import DEFAULT_STORE_PATH
+
+_CHUNK_SIZE = 1024 * 1024
+
+# Content is counted on the day it was first ingested; later duplicates under other paths are not
+DAILY_VOLUME_QUERY = (
+    "SELECT date(first_seen, 'unixepoch') AS day, COUNT(*), COALESCE(SUM(size), 0) "
+    "FROM (SELECT content_hash, MIN(ingested_at) AS first_seen, MAX(size) AS size "
+    "      FROM ingest_manifest GROUP BY content_hash HAVING MIN(ingested_at) >= ?) "
+    "GROUP BY day ORDER BY day"
+)
+
+
+def hash_bytes(data: bytes) -> str:
+    """Returns the SHA-256 hex digest of a payload."""
+    return hashlib.sha256(data).hexdigest()
+
+
+def hash_file(path: str) -> str:
+    """Returns the SHA-256 hex digest of a file, read in 1 MB chunks."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as handle:
+        for chunk in iter(lambda: handle.read(_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def read_daily_volume(path=None, days: int = 30) -> list:
+    """
+    Same as IngestManifest.daily_volume(), as one query on a short-lived read-only connection,
+    for readers that don't need the in-memory hash and path sets (e.g. the overview KPIs).
+    Returns an empty list when the store or the manifest table does not exist yet.
+    """
+    since = time.time() - days * 86400
+    try:
+        conn = sqlite3.connect(f"file:{path or DEFAULT_STORE_PATH}?mode=ro", uri=True, timeout=30)
+    except sqlite3.OperationalError:
+        return []
+    try:
+        return conn.execute(DAILY_VOLUME_QUERY, (since,)).fetchall()
+    except sqlite3.OperationalError:
+        return []
+    finally:
+        conn.close()
+
+
+class IngestManifest:
+    def __init__(self, path=None):
+        """
+        Opens the manifest table and loads the known hashes into memory.
+        Args:
+            path (str, optional): SQLite file path. Defaults to ETL_STORE_PATH.
+        """
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path or DEFAULT_STORE_PATH, timeout=30, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS ingest_manifest (
+                content_hash TEXT NOT NULL,
+                source_path TEXT NOT NULL,
+                project_asset_id INTEGER,
+                size INTEGER,
+                ingested_at REAL NOT NULL,
+                PRIMARY KEY (content_hash, source_path)
+            ) WITHOUT ROWID
+        """)
+        self._conn.commit()
+        self._hashes = set()
+        self._sources = set()
+        for content_hash, source_path in self._conn.execute("SELECT content_hash, source_path FROM ingest_manifest"):
+            self._hashes.add(content_hash)
+            self._sources.add(source_path)
+
+    def __contains__(self, content_hash) -> bool:
+        return content_hash in self._hashes
+
+    def __len__(self) -> int:
+        return len(self._hashes)
+
+    def is_ingested(self, content_hash: str) -> bool:
+        """O(1) duplicate check against every hash ever recorded."""
+        return content_hash in self._hashes
+
+    def has_source(self, source_path: str) -> bool:
+        """O(1) check whether a source path was already recorded."""
+        return str(source_path) in self._sources
+
+    def record(self, content_hash: str, source_path: str, project_asset_id: int = None, size: int = None):
+        """
+        Marks a file as ingested.
+        Args:
+            content_hash (str): SHA-256 of the file content.
+            source_path (str): Where the content came from (file path or gmail:<message>/<attachment>).
+            project_asset_id (int, optional): The ProjectAssetID the data was applied to.
+            size (int, optional): Content size in bytes.
+        """
+        with self._lock:
+            with self._conn:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO ingest_manifest (content_hash, source_path, project_asset_id, size, ingested_at) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    (content_hash, str(source_path), None if project_asset_id is None else int(project_asset_id), size, time.time()),
+                )
+            self._hashes.add(content_hash)
+            self._sources.add(str(source_path))
+
+    def sources(self, content_hash: str) -> list:
+        """Returns the (source_path, project_asset_id, ingested_at) rows recorded for a hash."""
+        with self._lock:
+            return self._conn.execute(
+                "SELECT source_path, project_asset_id, ingested_at FROM ingest_manifest WHERE content_hash = ? ORDER BY ingested_at",
+                (content_hash,),
+            ).fetchall()
+
+    def daily_volume(self, days: int = 30) -> list:
+        """
+        Returns the ingest volume per day (UTC) over the last `days` days. Content is counted on the
+        day it was first ingested; later duplicates under other paths are not counted again.
+        Returns:
+            list: (day 'YYYY-MM-DD', files, bytes) tuples, oldest first.
+        """
+        since = time.time() - days * 86400
+        with self._lock:
+            return self._conn.execute(DAILY_VOLUME_QUERY, (since,)).fetchall()
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
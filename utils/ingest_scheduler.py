@@ -0,0 +1,336 @@
+"""
+Multi-core ingest scheduler.
+
+Responsibilities:
+- Runs ingest jobs for different ProjectAssetIDs in parallel on a process pool.
+- Applies files for the same ProjectAssetID one at a time, oldest timestamp first.
+- Bounds the number of pending jobs, so producers (folder scans, Gmail replays)
+  block instead of queueing an unbounded backlog.
+- Retries failed jobs with exponential backoff while holding the asset's place
+  in line, so a retry never lets a newer file overtake an older one.
+- Keeps per-worker throughput counters (files, rows, busy seconds).
+- With an IngestManifest, skips files whose content was already ingested and
+  records each file once it has been applied. A skipped duplicate's path is
+  recorded too (once its original has been applied, if that is still queued).
+  Manifest writes happen outside the scheduler lock, so SQLite I/O never
+  blocks submitters.
+
+Example backfill:
+    scheduler = IngestScheduler()
+    scheduler.backfill((asset_id, path) for asset_id, path in files)
+    print(scheduler.stats())
+"""
+
+import heapq
+import itertools
+import multiprocessing
+import os
+import queue
+import threading
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+from utils.ingest_engine import ingest_file
+from utils.ingest_manifest import hash_file
+
+_STOP = object()
+
+
+def _file_size(path):
+    return os.path.getsize(path) if os.path.exists(path) else None
+
+
+def _run_job(ingest_func, project_asset_id, path, store_path):
+    """Worker-side wrapper: runs one job and reports the worker pid and timing with the result."""
+    started = time.perf_counter()
+    try:
+        result, error = ingest_func(project_asset_id, path, store_path), None
+    except Exception as e:
+        result, error = None, f"{type(e).__name__}: {e}"
+    return {"pid": os.getpid(), "elapsed": time.perf_counter() - started, "result": result, "error": error}
+
+
+class _Job:
+    __slots__ = ("project_asset_id", "path", "timestamp", "seq", "attempts", "content_hash")
+
+    def __init__(self, project_asset_id, path, timestamp, seq, content_hash=None):
+        self.project_asset_id = project_asset_id
+        self.path = path
+        self.timestamp = timestamp
+        self.seq = seq
+        self.attempts = 0
+        self.content_hash = content_hash
+
+    def __lt__(self, other):
+        return (self.timestamp, self.seq) < (other.timestamp, other.seq)
+
+
+class IngestScheduler:
+    def __init__(self, max_workers=None, max_pending=1000, max_retries=3, backoff=1.0,
+                 max_backoff=60.0, ingest_func=ingest_file, store_path=None, on_complete=None,
+                 manifest=None):
+        """
+        Args:
+            max_workers (int, optional): Worker processes. Defaults to os.cpu_count().
+            max_pending (int): Jobs accepted but not finished before submit() blocks.
+            max_retries (int): Retries per job after the first failed attempt.
+            backoff (float): Delay in seconds before the first retry; doubles per attempt.
+            max_backoff (float): Upper bound on the retry delay.
+            ingest_func (callable): Module-level function (project_asset_id, path, store_path) -> dict.
+            store_path (str, optional): TimeseriesStore path passed to ingest_func.
+            on_complete (callable, optional): Called as on_complete(job_info, result, error)
+                in the scheduler thread once a job succeeds or runs out of retries.
+            manifest (IngestManifest, optional): Duplicate check on submit, recorded on success.
+        """
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.max_pending = max_pending
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.ingest_func = ingest_func
+        self.store_path = store_path
+        self.on_complete = on_complete
+        self.manifest = manifest
+
+        self._executor = ProcessPoolExecutor(
+            max_workers=self.max_workers, mp_context=multiprocessing.get_context("spawn")
+        )
+        self._max_inflight = self.max_workers * 2
+        self._cond = threading.Condition()
+        self._seq = itertools.count()
+        self._queues = {}       # asset -> heap of _Job waiting to run
+        self._retry_head = {}   # asset -> _Job that failed and must run before the rest
+        self._active = set()    # assets with a job running or waiting on a retry delay
+        self._ready = deque()   # assets that can dispatch their next job
+        self._retries = []      # heap of (due_time, seq, job)
+        self._inflight = 0
+        self._pending = 0
+        self._closed = False
+
+        self._workers = {}
+        self._totals = {"submitted": 0, "completed": 0, "failed": 0, "retried": 0, "skipped": 0}
+        self._queued_hashes = set()  # content queued or running, not yet in the manifest
+        self._duplicate_paths = {}   # content hash -> [(asset, path)] skipped while the original is queued
+        self._failures = []
+        self._started = time.perf_counter()
+
+        self._events = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name="ingest-scheduler", daemon=True)
+        self._thread.start()
+
+    def submit(self, project_asset_id: int, path: str, timestamp=None, block=True, timeout=None) -> bool:
+        """
+        Queues a file for ingest.
+        Args:
+            project_asset_id (int): The ProjectAssetID the file belongs to.
+            path (str): Path of the logger file.
+            timestamp (float, optional): Ordering key within the asset. Defaults to the file mtime.
+            block (bool): Wait for room when max_pending jobs are outstanding.
+            timeout (float, optional): Max seconds to wait for room.
+        Returns:
+            bool: False if the queue stayed full (non-blocking or timed out), True otherwise
+                (including when the file is skipped as already ingested).
+        """
+        if timestamp is None:
+            timestamp = os.path.getmtime(path)
+        content_hash = hash_file(path) if self.manifest is not None else None
+        record_duplicate = False
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("IngestScheduler has been shut down.")
+            if self._pending >= self.max_pending:
+                if not block:
+                    return False
+                if not self._cond.wait_for(lambda: self._pending < self.max_pending, timeout):
+                    return False
+
+            if content_hash is not None:
+                if content_hash in self._queued_hashes:
+                    # Recorded with the original once it has been applied (dropped if it fails)
+                    self._duplicate_paths.setdefault(content_hash, []).append((int(project_asset_id), path))
+                    self._totals["skipped"] += 1
+                    return True
+                if content_hash in self.manifest:
+                    self._totals["skipped"] += 1
+                    record_duplicate = True
+                else:
+                    self._queued_hashes.add(content_hash)
+
+            if not record_duplicate:
+                asset = int(project_asset_id)
+                job = _Job(asset, path, float(timestamp), next(self._seq), content_hash)
+                heapq.heappush(self._queues.setdefault(asset, []), job)
+                if asset not in self._active and asset not in self._ready:
+                    self._ready.append(asset)
+                self._pending += 1
+                self._totals["submitted"] += 1
+                self._dispatch_ready()
+        if record_duplicate:
+            if not self.manifest.has_source(path):
+                self.manifest.record(content_hash, path, project_asset_id, _file_size(path))
+        return True
+
+    def backfill(self, jobs, timeout=None) -> dict:
+        """
+        Submits (project_asset_id, path) or (project_asset_id, path, timestamp) tuples,
+        blocking on backpressure as needed, then waits for all of them.
+        Returns:
+            dict: stats() after the backfill completed.
+        """
+        for job in jobs:
+            self.submit(*job)
+        self.wait(timeout)
+        return self.stats()
+
+    def wait(self, timeout=None) -> bool:
+        """Blocks until every submitted job finished. Returns False on timeout."""
+        with self._cond:
+            return self._cond.wait_for(lambda: self._pending == 0, timeout)
+
+    def shutdown(self, wait=True):
+        """Stops accepting jobs; optionally waits for outstanding ones before stopping the pool."""
+        with self._cond:
+            self._closed = True
+        if wait:
+            self.wait()
+        self._events.put(_STOP)
+        self._thread.join()
+        self._executor.shutdown(wait=wait, cancel_futures=not wait)
+
+    def stats(self) -> dict:
+        """
+        Returns throughput counters.
+        Returns:
+            dict: {'workers': {pid: {files, rows, samples, failures, busy_seconds, rows_per_second}},
+                   'submitted', 'completed', 'failed', 'retried', 'skipped', 'pending', 'inflight',
+                   'elapsed_seconds', 'files_per_second', 'failures': [...]}
+        """
+        with self._cond:
+            elapsed = time.perf_counter() - self._started
+            workers = {}
+            for pid, counters in self._workers.items():
+                busy = counters["busy_seconds"]
+                workers[pid] = dict(counters, rows_per_second=counters["rows"] / busy if busy else 0.0)
+            return dict(
+                self._totals,
+                workers=workers,
+                pending=self._pending,
+                inflight=self._inflight,
+                elapsed_seconds=elapsed,
+                files_per_second=self._totals["completed"] / elapsed if elapsed else 0.0,
+                failures=list(self._failures),
+            )
+
+    def _dispatch_ready(self):
+        """Sends the next job of ready assets to the pool. Caller holds self._cond."""
+        while self._ready and self._inflight < self._max_inflight:
+            asset = self._ready.popleft()
+            job = self._retry_head.pop(asset, None)
+            if job is None:
+                job = heapq.heappop(self._queues[asset])
+            self._active.add(asset)
+            self._inflight += 1
+            job.attempts += 1
+            future = self._executor.submit(_run_job, self.ingest_func, job.project_asset_id, job.path, self.store_path)
+            future.add_done_callback(lambda f, job=job: self._events.put((job, f)))
+
+    def _run(self):
+        while True:
+            with self._cond:
+                wait_for = self._retries[0][0] - time.monotonic() if self._retries else None
+            try:
+                event = self._events.get(timeout=max(wait_for, 0) if wait_for is not None else None)
+            except queue.Empty:
+                event = None
+            if event is _STOP:
+                return
+
+            finished = []
+            records = []
+            with self._cond:
+                if event is not None:
+                    finished.extend(self._complete(*event, records))
+                now = time.monotonic()
+                while self._retries and self._retries[0][0] <= now:
+                    _, _, job = heapq.heappop(self._retries)
+                    self._retry_head[job.project_asset_id] = job
+                    self._active.discard(job.project_asset_id)
+                    self._ready.append(job.project_asset_id)
+                self._dispatch_ready()
+                self._cond.notify_all()
+
+            if records:
+                self._record(records)
+
+            if self.on_complete:
+                for job_info, result, error in finished:
+                    try:
+                        self.on_complete(job_info, result, error)
+                    except Exception as e:
+                        print(f"Error in ingest on_complete callback: {e}")
+
+    def _record(self, records):
+        """
+        Writes (job, duplicates) manifest records without holding self._cond. The job's hash stays
+        in _queued_hashes and the job counts as pending until its record is written, so a submit
+        meanwhile is still treated as a duplicate and wait() covers the manifest write.
+        """
+        for job, duplicates in records:
+            try:
+                self.manifest.record(job.content_hash, job.path, job.project_asset_id, _file_size(job.path))
+                for asset, path in duplicates:
+                    self.manifest.record(job.content_hash, path, asset, _file_size(path))
+            except Exception as e:
+                print(f"Error recording {job.path} in the ingest manifest: {e}")
+        with self._cond:
+            for job, duplicates in records:
+                self._queued_hashes.discard(job.content_hash)
+                self._pending -= 1
+            self._cond.notify_all()
+
+    def _complete(self, job, future, records):
+        """
+        Books a finished attempt. Caller holds self._cond. Returns on_complete arguments;
+        manifest records to write (after releasing the lock) are appended to records.
+        """
+        self._inflight -= 1
+        try:
+            outcome = future.result()
+        except Exception as e:  # e.g. BrokenProcessPool
+            outcome = {"pid": None, "elapsed": 0.0, "result": None, "error": f"{type(e).__name__}: {e}"}
+
+        counters = self._workers.setdefault(
+            outcome["pid"], {"files": 0, "rows": 0, "samples": 0, "failures": 0, "busy_seconds": 0.0}
+        )
+        counters["busy_seconds"] += outcome["elapsed"]
+        asset = job.project_asset_id
+
+        if outcome["error"] is not None:
+            counters["failures"] += 1
+            if job.attempts <= self.max_retries:
+                delay = min(self.backoff * 2 ** (job.attempts - 1), self.max_backoff)
+                heapq.heappush(self._retries, (time.monotonic() + delay, job.seq, job))
+                self._totals["retried"] += 1
+                return []
+            self._totals["failed"] += 1
+            self._failures.append({"project_asset_id": asset, "path": job.path, "error": outcome["error"]})
+        else:
+            counters["files"] += 1
+            counters["rows"] += outcome["result"].get("rows", 0)
+            counters["samples"] += outcome["result"].get("samples", 0)
+            self._totals["completed"] += 1
+            if job.content_hash is not None:
+                records.append((job, self._duplicate_paths.pop(job.content_hash, [])))
+
+        if not records or records[-1][0] is not job:
+            self._queued_hashes.discard(job.content_hash)
+            self._duplicate_paths.pop(job.content_hash, None)
+            self._pending -= 1
+        self._active.discard(asset)
+        if self._queues.get(asset):
+            self._ready.append(asset)
+        else:
+            self._queues.pop(asset, None)
+        job_info = {"project_asset_id": asset, "path": job.path, "timestamp": job.timestamp, "attempts": job.attempts}
+        return [(job_info, outcome["result"], outcome["error"])]
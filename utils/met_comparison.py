@@ -0,0 +1,245 @@
+"""
+Lidar/Sodar to paired MET tower comparison engine.
+
+Responsibilities:
+- Time-aligns a remote-sensing asset with the MET tower it is paired to
+  (tbl_project_asset.PairProjectAssetID) at matching measurement heights.
+- Computes regression slope, offset, R² and residual statistics per height.
+- Caches per-day sufficient statistics, so a refresh only recomputes the days
+  where either asset received new data (see TimeseriesStore.period_watermarks).
+
+Regression is ordinary least squares of remote-sensing wind speed (y) on
+MET wind speed (x). Because n, Σx, Σy, Σx², Σxy and Σy² add across days,
+any window's statistics come from summing the cached daily rows.
+"""
+
+import re
+import threading
+
+import numpy as np
+import pandas as pd
+
+from utils.timeseries_store import TimeseriesStore
+
+_SPEED_RE = re.compile(r"(?i)(ws|speed)")
+_EXCLUDE_RE = re.compile(r"(?i)(sd|std|max|min|dir|gust|ti\b)")
+_HEIGHT_RE = re.compile(r"(\d+(?:\.\d+)?)\s*m(?![a-z])", re.IGNORECASE)
+
+_SUM_COLUMNS = ["n", "sx", "sy", "sxx", "sxy", "syy"]
+_KEY_COLUMNS = ["Height", "RSHeight"]
+
+
+def wind_speed_heights(columns) -> dict:
+    """
+    Maps wind speed channel names to their measurement height in metres.
+    Channels such as 'WS_80m', 'Speed 80m Avg' or 'HWS 100m' match; standard
+    deviation, min/max, direction and gust channels are ignored.
+    """
+    heights = {}
+    for column in columns:
+        name = str(column)
+        if not _SPEED_RE.search(name) or _EXCLUDE_RE.search(name):
+            continue
+        match = _HEIGHT_RE.search(name)
+        if match:
+            heights[column] = float(match.group(1))
+    return heights
+
+
+def match_heights(rs_heights, met_heights, tolerance: float) -> dict:
+    """
+    Maps each remote-sensing height to the nearest MET height within tolerance (metres).
+    Heights without a MET level close enough are left out.
+    """
+    met = np.unique(np.asarray(list(met_heights), dtype=float))
+    rs = np.unique(np.asarray(list(rs_heights), dtype=float))
+    if met.size == 0 or rs.size == 0:
+        return {}
+    pos = np.searchsorted(met, rs)
+    lower = met[np.clip(pos - 1, 0, met.size - 1)]
+    upper = met[np.clip(pos, 0, met.size - 1)]
+    nearest = np.where(np.abs(lower - rs) <= np.abs(upper - rs), lower, upper)
+    keep = np.abs(nearest - rs) <= tolerance
+    return dict(zip(rs[keep].tolist(), nearest[keep].tolist()))
+
+
+def _to_long(frame: pd.DataFrame, interval: str, value_name: str) -> pd.DataFrame:
+    """Wide channel frame -> (Timestamp, Height, value) rows averaged onto the interval grid."""
+    heights = wind_speed_heights(frame.columns)
+    if not heights:
+        return pd.DataFrame(columns=["Timestamp", "Height", value_name])
+    speeds = frame[list(heights)]
+    speeds = speeds.set_axis([heights[c] for c in speeds.columns], axis=1)
+    speeds.index = pd.DatetimeIndex(speeds.index).floor(interval)
+    long_frame = (
+        speeds.rename_axis("Timestamp")
+        .reset_index()
+        .melt(id_vars="Timestamp", var_name="Height", value_name=value_name)
+        .dropna(subset=[value_name])
+    )
+    return long_frame.groupby(["Timestamp", "Height"], as_index=False)[value_name].mean()
+
+
+def regression_stats(sums: pd.DataFrame) -> pd.DataFrame:
+    """
+    Vectorized OLS statistics from sufficient-statistic columns (n, sx, sy, sxx, sxy, syy).
+    Returns:
+        pd.DataFrame: n, slope, offset, r2, mean_diff, rmse, residual_std (same index as sums).
+    """
+    n = sums["n"].astype(float)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        sxx_c = sums["sxx"] - sums["sx"] ** 2 / n
+        sxy_c = sums["sxy"] - sums["sx"] * sums["sy"] / n
+        syy_c = sums["syy"] - sums["sy"] ** 2 / n
+        slope = (sxy_c / sxx_c).where(sxx_c > 0)
+        offset = (sums["sy"] - slope * sums["sx"]) / n
+        r2 = (sxy_c ** 2 / (sxx_c * syy_c)).where((sxx_c > 0) & (syy_c > 0))
+        ssr = (syy_c - slope * sxy_c).clip(lower=0)
+        rmse = np.sqrt(ssr / n)
+        residual_std = np.sqrt(ssr / (n - 2)).where(n > 2)
+        mean_diff = (sums["sy"] - sums["sx"]) / n
+    return pd.DataFrame({
+        "n": sums["n"].astype(int),
+        "slope": slope,
+        "offset": offset,
+        "r2": r2,
+        "mean_diff": mean_diff,
+        "rmse": rmse,
+        "residual_std": residual_std,
+    }, index=sums.index)
+
+
+def _period_runs(periods):
+    """Groups sorted day Timestamps into [start, end) runs of consecutive days."""
+    runs = []
+    for period in periods:
+        if runs and period == runs[-1][1]:
+            runs[-1][1] = period + pd.Timedelta(days=1)
+        else:
+            runs.append([period, period + pd.Timedelta(days=1)])
+    return runs
+
+
+class PairedComparisonEngine:
+    def __init__(self, store=None, interval="10min", height_tolerance=5.0):
+        """
+        Args:
+            store (TimeseriesStore, optional): Where both assets' data is read from.
+            interval (str): Averaging interval both series are aligned onto.
+            height_tolerance (float): Max distance (m) between matched heights.
+        """
+        self.store = store or TimeseriesStore()
+        self.interval = interval
+        self.height_tolerance = height_tolerance
+        self._cache = {}
+        self._lock = threading.Lock()
+
+    def _daily_sums(self, rs_frame, met_frame) -> pd.DataFrame:
+        """Joins both series on (Timestamp, matched height) and sums them per day."""
+        met_long = _to_long(met_frame, self.interval, "x")
+        rs_long = _to_long(rs_frame, self.interval, "y")
+        if met_long.empty or rs_long.empty:
+            return pd.DataFrame(columns=["Period"] + _KEY_COLUMNS + _SUM_COLUMNS)
+
+        height_map = match_heights(rs_long["Height"], met_long["Height"], self.height_tolerance)
+        rs_long = rs_long.rename(columns={"Height": "RSHeight"})
+        rs_long["Height"] = rs_long["RSHeight"].map(height_map)
+        joined = met_long.merge(rs_long.dropna(subset=["Height"]), on=["Timestamp", "Height"], how="inner")
+
+        x, y = joined["x"], joined["y"]
+        joined = joined.assign(
+            Period=joined["Timestamp"].dt.normalize(), n=1, sx=x, sy=y, sxx=x * x, sxy=x * y, syy=y * y
+        )
+        return joined.groupby(["Period"] + _KEY_COLUMNS, as_index=False)[_SUM_COLUMNS].sum()
+
+    def refresh(self, rs_id: int, met_id: int) -> int:
+        """
+        Recomputes the cached daily statistics for days where either asset changed
+        since they were last computed.
+        Returns:
+            int: number of days recomputed.
+        """
+        key = (int(rs_id), int(met_id))
+        watermarks = pd.concat(
+            [self.store.period_watermarks(rs_id), self.store.period_watermarks(met_id)], axis=1
+        ).max(axis=1)
+
+        with self._lock:
+            entry = self._cache.setdefault(key, {
+                "sums": pd.DataFrame(columns=["Period"] + _KEY_COLUMNS + _SUM_COLUMNS),
+                "computed": pd.Series(dtype=float),
+            })
+            computed = entry["computed"].reindex(watermarks.index)
+            dirty = watermarks.index[(computed.isna()) | (watermarks > computed)]
+            if dirty.empty:
+                return 0
+
+            fresh = []
+            for start, end in _period_runs(sorted(dirty)):
+                rs_frame = self.store.read_frame(rs_id, start, end)
+                met_frame = self.store.read_frame(met_id, start, end)
+                fresh.append(self._daily_sums(rs_frame, met_frame))
+
+            kept = entry["sums"][~entry["sums"]["Period"].isin(dirty)]
+            parts = [part for part in [kept] + fresh if not part.empty]
+            if parts:
+                entry["sums"] = pd.concat(parts, ignore_index=True).sort_values(["Period"] + _KEY_COLUMNS)
+            else:
+                entry["sums"] = kept
+            computed = entry["computed"].drop(dirty, errors="ignore")
+            entry["computed"] = watermarks.loc[dirty].combine_first(computed).sort_index()
+            return len(dirty)
+
+    def _cached_sums(self, rs_id, met_id, start=None, end=None) -> pd.DataFrame:
+        self.refresh(rs_id, met_id)
+        with self._lock:
+            sums = self._cache[(int(rs_id), int(met_id))]["sums"]
+        if start is not None:
+            sums = sums[sums["Period"] >= pd.Timestamp(start).normalize()]
+        if end is not None:
+            sums = sums[sums["Period"] < pd.Timestamp(end)]
+        return sums
+
+    def compare(self, rs_id: int, met_id: int, start=None, end=None) -> pd.DataFrame:
+        """
+        Returns regression statistics per matched height over the requested window.
+        Args:
+            rs_id (int): ProjectAssetID of the Lidar/Sodar.
+            met_id (int): ProjectAssetID of its paired MET tower.
+            start, end (optional): Day bounds of the window; None means all cached days.
+        Returns:
+            pd.DataFrame: Height, RSHeight, n, slope, offset, r2, mean_diff, rmse, residual_std
+        """
+        sums = self._cached_sums(rs_id, met_id, start, end)
+        totals = sums.groupby(_KEY_COLUMNS)[_SUM_COLUMNS].sum()
+        return regression_stats(totals).reset_index()
+
+    def period_stats(self, rs_id: int, met_id: int, start=None, end=None) -> pd.DataFrame:
+        """Same statistics as compare(), but one row per day and height."""
+        sums = self._cached_sums(rs_id, met_id, start, end)
+        return regression_stats(sums.set_index(["Period"] + _KEY_COLUMNS)[_SUM_COLUMNS]).reset_index()
+
+    def compare_pairs(self, pairs: pd.DataFrame, start=None, end=None) -> pd.DataFrame:
+        """
+        Runs compare() for every pairing, e.g. the frame from
+        DataAccessLayer.get_paired_remote_sensing_assets().
+        Returns:
+            pd.DataFrame: the comparison rows prefixed with ProjectAssetID and PairProjectAssetID.
+        """
+        results = []
+        for rs_id, met_id in pairs[["ProjectAssetID", "PairProjectAssetID"]].itertuples(index=False):
+            result = self.compare(rs_id, met_id, start, end)
+            result.insert(0, "PairProjectAssetID", int(met_id))
+            result.insert(0, "ProjectAssetID", int(rs_id))
+            results.append(result)
+        if not results:
+            return pd.DataFrame(columns=["ProjectAssetID", "PairProjectAssetID"] + _KEY_COLUMNS)
+        return pd.concat(results, ignore_index=True)
+
+    def invalidate(self, rs_id=None, met_id=None):
+        """Drops cached statistics for one pairing, or everything when called without arguments."""
+        with self._lock:
+            if rs_id is None:
+                self._cache.clear()
+            else:
+                self._cache.pop((int(rs_id), int(met_id)), None)
@@ -0,0 +1,152 @@
+"""
+Nearby-asset lookup for the add asset wizard.
+
+Responsibilities:
+- NearbyAssetIndex holds a scipy cKDTree over every located asset, with
+  coordinates converted to points on the unit sphere so the tree's straight-line
+  (chord) distance maps exactly to great-circle metres, at any latitude and
+  across the antimeridian.
+- nearby() answers "which assets lie within N metres of this point" with one
+  tree query, to warn about duplicates or a MET tower to pair with.
+- add() records an asset inserted after the build. The tree is immutable, so
+  additions go to a small list checked directly and are merged into a new tree
+  once REBUILD_AFTER of them have accumulated.
+
+Run this module to time lookups at 100k assets.
+"""
+
+import threading
+
+import numpy as np
+import pandas as pd
+from scipy.spatial import cKDTree
+
+EARTH_RADIUS_M = 6371008.8
+REBUILD_AFTER = 256
+
+ASSET_FIELDS = ["ProjectAssetID", "AssetName", "AssetType", "ClientName", "ProjectName"]
+
+
+def to_unit_xyz(lat, lon) -> np.ndarray:
+    """Latitude/longitude in degrees to (n, 3) points on the unit sphere."""
+    lat, lon = np.radians(np.asarray(lat, dtype="float64")), np.radians(np.asarray(lon, dtype="float64"))
+    cos_lat = np.cos(lat)
+    return np.column_stack([cos_lat * np.cos(lon), cos_lat * np.sin(lon), np.sin(lat)])
+
+
+def chord_for_metres(metres):
+    return 2 * np.sin(np.asarray(metres, dtype="float64") / (2 * EARTH_RADIUS_M))
+
+
+def metres_for_chord(chord):
+    return 2 * EARTH_RADIUS_M * np.arcsin(np.clip(np.asarray(chord, dtype="float64") / 2, 0, 1))
+
+
+class NearbyAssetIndex:
+    def __init__(self, assets=None, rebuild_after=REBUILD_AFTER):
+        """
+        Args:
+            assets (DataFrame, optional): One row per asset with Latitude, Longitude and the
+                ASSET_FIELDS columns (as DBcontoller.getAssetCoordinates). Rows without valid
+                coordinates are skipped.
+            rebuild_after (int): Assets added with add() before they are merged into the tree.
+        """
+        self.rebuild_after = rebuild_after
+        self._lock = threading.Lock()
+        assets = pd.DataFrame(assets if assets is not None else [])
+        for column in ["Latitude", "Longitude"] + ASSET_FIELDS:
+            if column not in assets.columns:
+                assets[column] = None
+        lat = pd.to_numeric(assets["Latitude"], errors="coerce")
+        lon = pd.to_numeric(assets["Longitude"], errors="coerce")
+        valid = lat.between(-90, 90) & lon.between(-180, 180)
+        assets = assets[valid]
+        self._xyz = to_unit_xyz(lat[valid], lon[valid]).reshape(-1, 3)
+        self._assets = assets[ASSET_FIELDS].astype(object).where(assets[ASSET_FIELDS].notna(), None).to_dict(orient="records")
+        self._tree = cKDTree(self._xyz)
+        self._pending_xyz = []
+        self._pending_assets = []
+
+    def __len__(self):
+        return len(self._assets) + len(self._pending_assets)
+
+    def add(self, latitude, longitude, asset):
+        """
+        Records a newly located asset.
+        Args:
+            latitude, longitude (float): Location in degrees.
+            asset (dict): ASSET_FIELDS values returned with nearby() matches.
+        """
+        xyz = to_unit_xyz([latitude], [longitude])[0]
+        record = {field: asset.get(field) for field in ASSET_FIELDS}
+        with self._lock:
+            # Re-adding an asset (e.g. its location was corrected) replaces the pending entry
+            project_asset_id = record.get("ProjectAssetID")
+            if project_asset_id is not None:
+                keep = [i for i, a in enumerate(self._pending_assets) if a.get("ProjectAssetID") != project_asset_id]
+                self._pending_xyz = [self._pending_xyz[i] for i in keep]
+                self._pending_assets = [self._pending_assets[i] for i in keep]
+            self._pending_xyz.append(xyz)
+            self._pending_assets.append(record)
+            if len(self._pending_assets) >= self.rebuild_after:
+                self._xyz = np.vstack([self._xyz, np.array(self._pending_xyz)])
+                self._assets = self._assets + self._pending_assets
+                self._tree = cKDTree(self._xyz)
+                self._pending_xyz, self._pending_assets = [], []
+
+    def nearby(self, latitude, longitude, radius_m, exclude=None) -> list:
+        """
+        Returns the assets within radius_m metres of a point, nearest first.
+        Args:
+            exclude (int, optional): ProjectAssetID to leave out (e.g. the asset being edited).
+        Returns:
+            list: Dicts with the ASSET_FIELDS plus Latitude, Longitude and DistanceM.
+        """
+        point = to_unit_xyz([latitude], [longitude])[0]
+        chord = float(chord_for_metres(radius_m))
+        with self._lock:
+            tree, assets, xyz = self._tree, self._assets, self._xyz
+            pending_xyz, pending_assets = list(self._pending_xyz), list(self._pending_assets)
+
+        matches = []
+        for i in tree.query_ball_point(point, chord, return_sorted=True):
+            matches.append((xyz[i], assets[i]))
+        if pending_xyz:
+            distances = np.linalg.norm(np.array(pending_xyz) - point, axis=1)
+            matches.extend((pending_xyz[i], pending_assets[i]) for i in np.flatnonzero(distances <= chord))
+
+        results = {}
+        for match_xyz, asset in matches:
+            if exclude is not None and asset.get("ProjectAssetID") == exclude:
+                continue
+            distance = float(metres_for_chord(np.linalg.norm(match_xyz - point)))
+            result = dict(asset)
+            result["Latitude"] = float(np.degrees(np.arcsin(np.clip(match_xyz[2], -1, 1))))
+            result["Longitude"] = float(np.degrees(np.arctan2(match_xyz[1], match_xyz[0])))
+            result["DistanceM"] = distance
+            # Later entries (re-adds) supersede earlier ones for the same asset
+            key = asset.get("ProjectAssetID")
+            key = key if key is not None else id(asset)
+            results[key] = result
+        return sorted(results.values(), key=lambda r: r["DistanceM"])
+
+
+if __name__ == "__main__":
+    import time
+
+    rows = 100_000
+    rng = np.random.default_rng(0)
+    start = time.perf_counter()
+    index = NearbyAssetIndex(pd.DataFrame({
+        "Latitude": rng.uniform(25, 50, rows),
+        "Longitude": rng.uniform(-125, -65, rows),
+        "ProjectAssetID": np.arange(rows),
+    }))
+    print(f"build: {len(index):,} assets in {(time.perf_counter() - start) * 1000:.0f} ms")
+
+    points = rng.uniform([25, -125], [50, -65], (1000, 2))
+    for radius in (500, 5000):
+        start = time.perf_counter()
+        found = sum(len(index.nearby(lat, lon, radius)) for lat, lon in points)
+        elapsed = (time.perf_counter() - start) * 1000 / len(points)
+        print(f"nearby({radius} m): {elapsed:.3f} ms per lookup, {found / len(points):.2f} matches on average")
@@ -0,0 +1,107 @@
+"""
+Materialized KPIs for the overview dashboard.
+
+Responsibilities:
+- Computes the overview KPIs from real data: assets by type, clients and
+  projects, data recovery and Live/Stale/Down counts (utils/asset_status.py),
+  and ingest volume per day (utils/ingest_manifest.py).
+- Pre-builds the overview figures as plain dicts, so rendering the page is a
+  dictionary lookup plus layout, independent of data size.
+- Rebuilt by the background precompute worker (see snapshots.py); the dashboard
+  always reads the last completed snapshot from memory and never waits on the
+  database.
+"""
+
+import time
+
+import pandas as pd
+import plotly.express as px
+
+from utils.asset_status import LIVE, STALE, DOWN
+from utils.ingest_manifest import read_daily_volume
+
+VOLUME_DAYS = 30
+
+CHART_LAYOUT = dict(
+    plot_bgcolor="rgba(0,0,0,0)",
+    paper_bgcolor="rgba(0,0,0,0)",
+    font_color="white",
+    title_font_color="white",
+    margin=dict(l=40, r=20, t=20, b=40),
+)
+
+
+def format_bytes(size) -> str:
+    """Formats a byte count for display (e.g. 1.4 MB)."""
+    size = float(size or 0)
+    for unit in ("B", "KB", "MB", "GB"):
+        if size < 1024 or unit == "GB":
+            return f"{size:.0f} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+        size /= 1024
+
+
+def compute_overview_kpis(assets, ingest_volume, now=None) -> dict:
+    """
+    Computes the overview snapshot.
+    Args:
+        assets (list): Asset dicts with ClientName, ProjectName, AssetType, Status and RecoveryRate
+            (e.g. DBcontoller.getClientsProjectsAssetsWithStatus()).
+        ingest_volume (list): (day, files, bytes) tuples, see read_daily_volume().
+        now (float, optional): Epoch seconds, used for today's ingest figures.
+    Returns:
+        dict: KPI values plus pre-built 'figures' (plotly figure dicts).
+    """
+    now = time.time() if now is None else now
+    assets_df = pd.DataFrame(assets, columns=["ClientName", "ProjectName", "AssetType", "Status", "RecoveryRate"])
+    volume_df = pd.DataFrame(ingest_volume, columns=["Date", "Files", "Bytes"])
+    today = pd.Timestamp(now, unit="s").strftime("%Y-%m-%d")
+
+    by_type = assets_df["AssetType"].fillna("Unknown").value_counts()
+    by_status = assets_df["Status"].value_counts()
+    recovery = pd.to_numeric(assets_df["RecoveryRate"], errors="coerce").dropna()
+    today_volume = volume_df[volume_df["Date"] == today]
+
+    if by_type.empty:
+        type_figure = {}
+    else:
+        type_figure = px.pie(
+            by_type.rename_axis("Type").reset_index(name="Count"), values="Count", names="Type"
+        ).update_layout(**CHART_LAYOUT).to_plotly_json()
+    if volume_df.empty:
+        volume_figure = {}
+    else:
+        volume_figure = px.bar(
+            volume_df, x="Date", y="Files", labels={"Files": "Files ingested"}
+        ).update_layout(**CHART_LAYOUT).to_plotly_json()
+
+    return {
+        "computed_at": now,
+        "total_assets": int(len(assets_df)),
+        "assets_by_type": {str(k): int(v) for k, v in by_type.items()},
+        "total_clients": int(assets_df["ClientName"].nunique()),
+        "active_projects": int(assets_df["ProjectName"].nunique()),
+        "recovery_pct": None if recovery.empty else round(float(recovery.mean()) * 100, 1),
+        "live_assets": int(by_status.get(LIVE, 0)),
+        "stale_assets": int(by_status.get(STALE, 0)),
+        "down_assets": int(by_status.get(DOWN, 0)),
+        "files_today": int(today_volume["Files"].sum()),
+        "bytes_today": int(today_volume["Bytes"].sum()),
+        "files_period": int(volume_df["Files"].sum()),
+        "figures": {"assets_by_type": type_figure, "ingest_volume": volume_figure},
+    }
+
+
+EMPTY_SNAPSHOT = compute_overview_kpis([], [], now=0)
+EMPTY_SNAPSHOT["computed_at"] = None
+
+
+def load_overview_kpis(assets, store_path=None, volume_days=VOLUME_DAYS) -> dict:
+    """
+    Reads the ingest volume from the manifest table (one aggregate query, without loading the
+    manifest's hash and path sets) and computes the overview snapshot.
+    Args:
+        assets (list): Asset dicts, see compute_overview_kpis().
+        store_path (str, optional): ETL store holding the ingest manifest. Defaults to ETL_STORE_PATH.
+        volume_days (int): Days of ingest volume in the snapshot.
+    """
+    return compute_overview_kpis(assets, read_daily_volume(store_path, volume_days))
@@ -0,0 +1,203 @@
+"""
+Background precompute worker with stale-while-revalidate reads.
+
+Responsibilities:
+- Holds named snapshots (client/project/asset lists, dashboard KPIs, ...) in
+  memory, each produced by a loader function.
+- Rebuilds every snapshot periodically on one background thread inside the
+  server process, dependencies before the snapshots derived from them.
+- get() returns the latest snapshot immediately; if it is older than its
+  max age a refresh is queued for the background thread, so readers never wait
+  on the database once a snapshot exists.
+- get(fresh=True) and refresh() rebuild synchronously (e.g. right after a write
+  or when a user presses Refresh); concurrent refreshes of one snapshot are
+  coalesced into a single load, but a refresh never joins a load that started
+  before it was requested (that load may predate the write being read back).
+"""
+
+import threading
+import time
+
+_MISSING = object()
+
+
+class _Entry:
+    __slots__ = ("name", "loader", "max_age", "default", "depends_on", "value", "computed_at",
+                 "loads_started", "value_load", "lock", "refreshes", "errors", "last_error",
+                 "last_duration", "hits", "stale_hits")
+
+    def __init__(self, name, loader, max_age, default, depends_on):
+        self.name = name
+        self.loader = loader
+        self.max_age = max_age
+        self.default = default
+        self.depends_on = tuple(depends_on or ())
+        self.value = _MISSING
+        self.computed_at = None
+        self.loads_started = 0  # loads are numbered in start order
+        self.value_load = 0     # number of the load that produced value
+        self.lock = threading.Lock()
+        self.refreshes = 0
+        self.errors = 0
+        self.last_error = None
+        self.last_duration = None
+        self.hits = 0
+        self.stale_hits = 0
+
+
+class PrecomputeWorker:
+    def __init__(self, interval=60.0, max_age=120.0):
+        """
+        Args:
+            interval (float): Seconds between scheduled rebuilds of each snapshot.
+            max_age (float): Default age in seconds after which a read queues a refresh.
+        """
+        self.interval = interval
+        self.max_age = max_age
+        self._entries = {}
+        self._pending = set()
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def register(self, name, loader, max_age=None, default=_MISSING, depends_on=None):
+        """
+        Adds a snapshot.
+        Args:
+            name (str): Snapshot name.
+            loader (callable): No-argument function that builds the snapshot.
+            max_age (float, optional): Overrides the worker's max_age for this snapshot.
+            default (optional): Returned before the first load completes, instead of waiting for it.
+            depends_on (list, optional): Snapshot names this one is derived from; it is rebuilt
+                after each of them.
+        """
+        self._entries[name] = _Entry(name, loader, self.max_age if max_age is None else max_age,
+                                     default, depends_on)
+
+    def _dependents(self, name):
+        return [e.name for e in self._entries.values() if name in e.depends_on]
+
+    def refresh(self, name):
+        """
+        Rebuilds a snapshot now and returns it; its dependents are queued for the background thread.
+        If another thread started rebuilding it after this call, waits for and returns that result
+        instead; a rebuild already running when this is called is waited for, then loaded again.
+        """
+        entry = self._entries[name]
+        ticket = entry.loads_started
+        with entry.lock:
+            if entry.value_load > ticket:
+                return entry.value
+            entry.loads_started += 1
+            load_number = entry.loads_started
+            started = time.perf_counter()
+            try:
+                value = entry.loader()
+            except Exception as e:
+                entry.errors += 1
+                entry.last_error = f"{type(e).__name__}: {e}"
+                raise
+            entry.value = value
+            entry.value_load = load_number
+            entry.computed_at = time.time()
+            entry.refreshes += 1
+            entry.last_duration = time.perf_counter() - started
+        dependents = self._dependents(name)
+        if dependents:
+            self._schedule(dependents)
+        return value
+
+    def _schedule(self, names):
+        with self._lock:
+            self._pending.update(names)
+        self._wake.set()
+
+    def invalidate(self, *names, exclude=()):
+        """
+        Queues a background rebuild of the given snapshots (all of them if none are given),
+        leaving out the names in exclude (e.g. snapshots the caller is about to refresh itself).
+        """
+        self._schedule([name for name in names or self._entries if name not in exclude])
+        self.start()
+
+    def get(self, name, fresh=False):
+        """
+        Returns a snapshot (stale-while-revalidate).
+        Args:
+            name (str): Snapshot name.
+            fresh (bool): Rebuild synchronously before returning.
+        Returns:
+            The latest snapshot value. Before the first load completes this is the registered
+            default, or (without a default) the result of loading it now.
+        """
+        self.start()
+        entry = self._entries[name]
+        if fresh:
+            return self.refresh(name)
+        if entry.value is _MISSING:
+            if entry.default is not _MISSING:
+                self._schedule([name])
+                return entry.default
+            return self.refresh(name)
+        entry.hits += 1
+        if time.time() - entry.computed_at > entry.max_age:
+            entry.stale_hits += 1
+            self._schedule([name])
+        return entry.value
+
+    def age(self, name):
+        """Seconds since the snapshot was built, or None if it never was."""
+        computed_at = self._entries[name].computed_at
+        return None if computed_at is None else time.time() - computed_at
+
+    def stats(self) -> dict:
+        """Per-snapshot age, refresh/error counts, last load duration and read counts."""
+        return {
+            name: {
+                "age": self.age(name),
+                "refreshes": e.refreshes,
+                "errors": e.errors,
+                "last_error": e.last_error,
+                "last_duration": e.last_duration,
+                "hits": e.hits,
+                "stale_hits": e.stale_hits,
+            }
+            for name, e in self._entries.items()
+        }
+
+    def _due(self):
+        now = time.time()
+        with self._lock:
+            due = set(self._pending)
+            self._pending.clear()
+        due.update(name for name, e in self._entries.items()
+                   if e.computed_at is None or now - e.computed_at >= self.interval)
+        # Registration order, so dependencies are rebuilt before what is derived from them
+        return [name for name in self._entries if name in due]
+
+    def _run(self):
+        while not self._stop.is_set():
+            self._wake.clear()
+            for name in self._due():
+                if self._stop.is_set():
+                    break
+                try:
+                    self.refresh(name)
+                except Exception as e:
+                    print(f"Error precomputing snapshot '{name}': {e}")
+            self._wake.wait(min(self.interval, 1.0) if self._pending else self.interval)
+
+    def start(self):
+        """Starts the background thread (no-op if it is already running)."""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._stop.clear()
+                self._thread = threading.Thread(target=self._run, name="precompute-worker", daemon=True)
+                self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._wake.set()
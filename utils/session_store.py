@@ -0,0 +1,229 @@
+"""
+Server-side per-session state for the Dash app.
+
+Responsibilities:
+- NotificationLog: the notification history of each browser session, kept as
+  a ring buffer of the latest entries (200 by default). Callbacks add one entry
+  and send the browser only a small {"cursor", "count"} dict instead of the
+  whole list.
+- SessionState: JSON values per (session, key) with expiry, e.g. the add-asset
+  wizard's progress, so callbacks send only the session id and the wizard can
+  resume after a page reload.
+
+The session id is a random UUID generated in the browser (assets/session.js)
+and kept in a sessionStorage dcc.Store, so it survives page reloads in the tab.
+A callback can fire before the browser has sent its id; such calls read nothing
+and write nothing, so one user's state never ends up visible to another.
+State lives in a local SQLite file shared by every worker process on the host,
+path from SESSION_STORE_PATH (defaults to session_store.sqlite). Sessions idle
+longer than SESSION_TTL_HOURS (default 24) are purged.
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+
+DEFAULT_SESSION_STORE_PATH = os.getenv("SESSION_STORE_PATH", "session_store.sqlite")
+SESSION_TTL_SECONDS = float(os.getenv("SESSION_TTL_HOURS", 24)) * 3600
+NOTIFICATION_LOG_SIZE = 200
+
+
+def _connect(path):
+    conn = sqlite3.connect(path or DEFAULT_SESSION_STORE_PATH, timeout=30, check_same_thread=False,
+                           isolation_level=None)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    return conn
+
+
+class NotificationLog:
+    def __init__(self, path=None, size=NOTIFICATION_LOG_SIZE, ttl=SESSION_TTL_SECONDS):
+        """
+        Args:
+            path (str, optional): SQLite file path. Defaults to SESSION_STORE_PATH.
+            size (int): Entries kept per session; older entries are dropped as new ones arrive.
+            ttl (float): Seconds after its last entry that a session's log is purged.
+        """
+        self.size = size
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._adds = 0
+        self._conn = _connect(path)
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS notification_log (
+                session_id TEXT NOT NULL,
+                seq INTEGER NOT NULL,
+                type TEXT,
+                message TEXT,
+                timestamp TEXT,
+                created_at REAL NOT NULL,
+                PRIMARY KEY (session_id, seq)
+            ) WITHOUT ROWID
+        """)
+
+    def add(self, session_id, entry) -> dict:
+        """
+        Appends an entry to a session's log and drops entries beyond the ring size.
+        Args:
+            session_id (str): Browser session id. Without one the entry is not stored.
+            entry (dict): type ('success', 'warning' or 'error'), message and timestamp.
+        Returns:
+            dict: {"cursor": sequence number of this entry, "count": entries now in the log}
+                ({"cursor": 0, "count": 0} without a session id)
+        """
+        if not session_id:
+            return {"cursor": 0, "count": 0}
+        now = time.time()
+        with self._lock:
+            # IMMEDIATE takes the write lock up front, so two workers never assign the same seq
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                seq = self._conn.execute(
+                    "SELECT COALESCE(MAX(seq), 0) + 1 FROM notification_log WHERE session_id = ?", (session_id,)
+                ).fetchone()[0]
+                self._conn.execute(
+                    "INSERT INTO notification_log (session_id, seq, type, message, timestamp, created_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    (session_id, seq, entry.get("type"), entry.get("message"), entry.get("timestamp"), now),
+                )
+                self._conn.execute("DELETE FROM notification_log WHERE session_id = ? AND seq <= ?",
+                                   (session_id, seq - self.size))
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._adds += 1
+            purge = self._adds % 100 == 0
+        if purge:
+            self.purge_expired(now)
+        return {"cursor": seq, "count": min(seq, self.size)}
+
+    def latest(self, session_id, limit=20) -> list:
+        """Returns up to limit entries of a session's log, newest first (none without a session id)."""
+        if not session_id:
+            return []
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT type, message, timestamp FROM notification_log WHERE session_id = ? "
+                "ORDER BY seq DESC LIMIT ?",
+                (session_id, limit),
+            ).fetchall()
+        return [{"type": t, "message": m, "timestamp": ts} for t, m, ts in rows]
+
+    def state(self, session_id) -> dict:
+        """Returns {"cursor", "count"} for a session (both 0 for an empty log or no session id)."""
+        if not session_id:
+            return {"cursor": 0, "count": 0}
+        with self._lock:
+            cursor, count = self._conn.execute(
+                "SELECT COALESCE(MAX(seq), 0), COUNT(*) FROM notification_log WHERE session_id = ?",
+                (session_id,),
+            ).fetchone()
+        return {"cursor": cursor, "count": count}
+
+    def purge_expired(self, now=None) -> int:
+        """Deletes the logs of sessions idle longer than the ttl. Returns how many entries were removed."""
+        cutoff = (time.time() if now is None else now) - self.ttl
+        with self._lock:
+            return self._conn.execute("""
+                DELETE FROM notification_log WHERE session_id IN (
+                    SELECT session_id FROM notification_log GROUP BY session_id HAVING MAX(created_at) < ?
+                )
+            """, (cutoff,)).rowcount
+
+    def close(self):
+        self._conn.close()
+
+
+class SessionState:
+    def __init__(self, path=None, ttl=SESSION_TTL_SECONDS):
+        """
+        Args:
+            path (str, optional): SQLite file path. Defaults to SESSION_STORE_PATH.
+            ttl (float): Seconds after its last write that a value expires.
+        """
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._conn = _connect(path)
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS session_state (
+                session_id TEXT NOT NULL,
+                key TEXT NOT NULL,
+                value TEXT NOT NULL,
+                updated_at REAL NOT NULL,
+                PRIMARY KEY (session_id, key)
+            ) WITHOUT ROWID
+        """)
+
+    def get(self, session_id, key, default=None):
+        """Returns the stored value, or default if missing, expired or there is no session id."""
+        if not session_id:
+            return default
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, updated_at FROM session_state WHERE session_id = ? AND key = ?",
+                (session_id, key),
+            ).fetchone()
+        if row is None or row[1] < time.time() - self.ttl:
+            return default
+        return json.loads(row[0])
+
+    def set(self, session_id, key, value):
+        """Stores a JSON-serializable value and restarts its expiry (nothing is stored without a session id)."""
+        if not session_id:
+            return value
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO session_state (session_id, key, value, updated_at) VALUES (?, ?, ?, ?)",
+                (session_id, key, json.dumps(value), time.time()),
+            )
+        return value
+
+    def update(self, session_id, key, **fields) -> dict:
+        """Merges fields into a stored dict (created if missing). Returns the new dict."""
+        value = self.get(session_id, key) or {}
+        value.update(fields)
+        return self.set(session_id, key, value)
+
+    def delete(self, session_id, key):
+        if not session_id:
+            return
+        with self._lock:
+            self._conn.execute("DELETE FROM session_state WHERE session_id = ? AND key = ?",
+                               (session_id, key))
+
+    def purge_expired(self, now=None) -> int:
+        """Deletes expired values. Returns how many were removed."""
+        cutoff = (time.time() if now is None else now) - self.ttl
+        with self._lock:
+            return self._conn.execute("DELETE FROM session_state WHERE updated_at < ?", (cutoff,)).rowcount
+
+    def close(self):
+        self._conn.close()
+
+
+_notification_log = None
+_notification_log_lock = threading.Lock()
+_session_state = None
+_session_state_lock = threading.Lock()
+
+
+def get_notification_log() -> NotificationLog:
+    """Returns the process-wide NotificationLog on SESSION_STORE_PATH."""
+    global _notification_log
+    with _notification_log_lock:
+        if _notification_log is None:
+            _notification_log = NotificationLog()
+        return _notification_log
+
+
+def get_session_state() -> SessionState:
+    """Returns the process-wide SessionState on SESSION_STORE_PATH (expired values purged on first use)."""
+    global _session_state
+    with _session_state_lock:
+        if _session_state is None:
+            _session_state = SessionState()
+            _session_state.purge_expired()
+        return _session_state
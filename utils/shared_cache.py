@@ -0,0 +1,260 @@
+"""
+Shared cache for dashboard snapshots across server workers.
+
+Responsibilities:
+- One cache interface over pluggable backends:
+    MemoryBackend  per-process dict (single worker, tests)
+    SQLiteBackend  file on local disk, shared by every worker on the host
+    RedisBackend   shared by workers on any host (needs the optional `redis` package)
+- Versioned keys: every key lives in a group whose version number is part of
+  the stored key. invalidate(group) bumps the version in the backend, so a
+  write in one worker makes the old entries unreachable for all workers
+  without deleting them (they expire through their TTL; the SQLite backend
+  deletes expired entries on every invalidate()).
+- get_or_load() pins the version before loading, so a load that overlaps
+  another worker's invalidate() is stored under the old version and never
+  served as current.
+- Values are pickled, so DataFrames, Series and lists of dicts round-trip unchanged.
+
+The backend is chosen with SHARED_CACHE_URL:
+    memory://                    (per process)
+    sqlite:///path/to/cache.db   (default: sqlite:///shared_cache.sqlite)
+    redis://host:6379/0
+"""
+
+import os
+import pickle
+import sqlite3
+import threading
+import time
+
+DEFAULT_CACHE_URL = os.getenv("SHARED_CACHE_URL", "sqlite:///shared_cache.sqlite")
+
+
+class MemoryBackend:
+    """Per-process backend; nothing is shared between workers."""
+
+    def __init__(self):
+        self._data = {}
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return None
+            value, expires_at = item
+            if expires_at is not None and expires_at < time.time():
+                del self._data[key]
+                return None
+            return value
+
+    def set(self, key, value: bytes, ttl=None):
+        with self._lock:
+            self._data[key] = (value, None if ttl is None else time.time() + ttl)
+
+    def incr(self, key) -> int:
+        with self._lock:
+            value = int(self._data.get(key, (b"0", None))[0]) + 1
+            self._data[key] = (str(value).encode(), None)
+            return value
+
+    def delete(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+
+class SQLiteBackend:
+    """Backend in a local SQLite file (WAL mode), shared by all worker processes on the host."""
+
+    def __init__(self, path="shared_cache.sqlite"):
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS cache (
+                key TEXT PRIMARY KEY,
+                value BLOB NOT NULL,
+                expires_at REAL
+            ) WITHOUT ROWID
+        """)
+
+    def get(self, key):
+        with self._lock:
+            row = self._conn.execute("SELECT value, expires_at FROM cache WHERE key = ?", (key,)).fetchone()
+        if row is None or (row[1] is not None and row[1] < time.time()):
+            return None
+        return row[0]
+
+    def set(self, key, value: bytes, ttl=None):
+        expires_at = None if ttl is None else time.time() + ttl
+        with self._lock:
+            self._conn.execute("INSERT OR REPLACE INTO cache (key, value, expires_at) VALUES (?, ?, ?)",
+                               (key, value, expires_at))
+
+    def incr(self, key) -> int:
+        with self._lock:
+            # IMMEDIATE takes the write lock up front, so concurrent workers never read the same value
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = self._conn.execute("SELECT value FROM cache WHERE key = ?", (key,)).fetchone()
+                value = (int(row[0]) if row else 0) + 1
+                self._conn.execute("INSERT OR REPLACE INTO cache (key, value, expires_at) VALUES (?, ?, NULL)",
+                                   (key, str(value).encode()))
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+        return value
+
+    def delete(self, key):
+        with self._lock:
+            self._conn.execute("DELETE FROM cache WHERE key = ?", (key,))
+
+    def purge_expired(self) -> int:
+        """Deletes expired entries. Returns how many were removed."""
+        with self._lock:
+            return self._conn.execute("DELETE FROM cache WHERE expires_at < ?", (time.time(),)).rowcount
+
+
+class RedisBackend:
+    """Backend on a Redis server (requires `pip install redis`)."""
+
+    def __init__(self, url="redis://localhost:6379/0"):
+        try:
+            import redis
+        except ImportError as e:
+            raise ImportError("RedisBackend requires the 'redis' package (pip install redis).") from e
+        self._client = redis.Redis.from_url(url)
+
+    def get(self, key):
+        return self._client.get(key)
+
+    def set(self, key, value: bytes, ttl=None):
+        self._client.set(key, value, ex=None if ttl is None else max(1, int(ttl)))
+
+    def incr(self, key) -> int:
+        return int(self._client.incr(key))
+
+    def delete(self, key):
+        self._client.delete(key)
+
+
+def backend_from_url(url=None):
+    """Creates the backend named by a cache URL (see module docstring)."""
+    url = url or DEFAULT_CACHE_URL
+    if url.startswith("memory://"):
+        return MemoryBackend()
+    if url.startswith("sqlite:///"):
+        return SQLiteBackend(url[len("sqlite:///"):])
+    if url.startswith(("redis://", "rediss://")):
+        return RedisBackend(url)
+    raise ValueError(f"Unsupported shared cache URL: {url}")
+
+
+class SharedCache:
+    def __init__(self, backend=None, namespace="met-etl", version_ttl=1.0):
+        """
+        Args:
+            backend (optional): A backend instance. Defaults to backend_from_url().
+            namespace (str): Prefix for every key, so several apps can share one backend.
+            version_ttl (float): Seconds a group's version is reused locally before re-reading it
+                from the backend. Bounds how long another worker's invalidate() takes to be seen;
+                this worker's own invalidate() is seen immediately.
+        """
+        self.backend = backend or backend_from_url()
+        self.namespace = namespace
+        self.version_ttl = version_ttl
+        self._versions = {}  # group -> (version, read_at)
+        self._lock = threading.Lock()
+
+    def _version_key(self, group):
+        return f"{self.namespace}:version:{group}"
+
+    def version(self, group) -> int:
+        """Returns the current version of a group."""
+        now = time.monotonic()
+        with self._lock:
+            cached = self._versions.get(group)
+            if cached is not None and now - cached[1] < self.version_ttl:
+                return cached[0]
+        raw = self.backend.get(self._version_key(group))
+        version = int(raw) if raw is not None else 0
+        with self._lock:
+            self._versions[group] = (version, now)
+        return version
+
+    def _key(self, group, key, version=None):
+        version = self.version(group) if version is None else version
+        return f"{self.namespace}:{group}:v{version}:{key}"
+
+    def get(self, group, key, default=None, version=None):
+        """Returns the cached value, or default on a miss. version defaults to the group's current one."""
+        raw = self.backend.get(self._key(group, key, version))
+        return default if raw is None else pickle.loads(raw)
+
+    def set(self, group, key, value, ttl=None, version=None):
+        """
+        Stores a value; ttl in seconds (None never expires). version defaults to the group's
+        current one; pass the version read before computing the value (see get_or_load()).
+        """
+        self.backend.set(self._key(group, key, version), pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL), ttl)
+
+    def get_or_load(self, group, key, loader, ttl=None):
+        """
+        Returns the cached value, or calls loader(), stores and returns its result.
+        The result is stored under the version read before loading, so if the group is
+        invalidated while loader() runs the (possibly stale) result is not served as current.
+        """
+        version = self.version(group)
+        raw = self.backend.get(self._key(group, key, version))
+        if raw is not None:
+            return pickle.loads(raw)
+        value = loader()
+        self.set(group, key, value, ttl, version=version)
+        return value
+
+    def invalidate(self, group) -> int:
+        """Bumps a group's version for every worker. Returns the new version."""
+        version = self.backend.incr(self._version_key(group))
+        with self._lock:
+            self._versions[group] = (version, time.monotonic())
+        # Entries of older versions are unreachable now; drop the ones whose TTL has passed
+        purge_expired = getattr(self.backend, "purge_expired", None)
+        if purge_expired is not None:
+            try:
+                purge_expired()
+            except Exception as e:
+                print(f"Error purging expired shared cache entries: {e}")
+        return version
+
+
+if __name__ == "__main__":
+    # Benchmark: hit latency per backend for a typical snapshot (500 asset rows)
+    import tempfile
+
+    payload = [{"ClientName": f"Client {i % 20}", "ProjectName": f"Project {i % 60}", "ProjectAssetID": i,
+                "AssetName": f"MET-{i:04d}", "AssetType": "MET Tower", "Status": "Live", "RecoveryRate": 0.98}
+               for i in range(500)]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        backends = {"memory": MemoryBackend(), "sqlite": SQLiteBackend(os.path.join(tmp, "cache.sqlite"))}
+        try:
+            backends["redis"] = RedisBackend(os.getenv("REDIS_URL", "redis://localhost:6379/0"))
+            backends["redis"].get("ping")
+        except Exception as e:
+            backends.pop("redis", None)
+            print(f"redis: skipped ({e})")
+
+        for name, backend in backends.items():
+            cache = SharedCache(backend)
+            cache.set("snapshots", "assets", payload, ttl=60)
+            runs = 2000
+            started = time.perf_counter()
+            for _ in range(runs):
+                cache.get("snapshots", "assets")
+            hit = (time.perf_counter() - started) / runs
+            cache.invalidate("snapshots")
+            assert cache.get("snapshots", "assets") is None
+            print(f"{name:>6}: hit {hit * 1e6:8.1f} us, invalidation visible to this worker immediately")
@@ -0,0 +1,162 @@
+"""
+Single-flight request coalescing.
+
+Concurrent callers asking for the same key share one in-flight call: the first
+caller (the leader) runs it, the others wait for and receive its result (or its
+exception). Nothing is cached: once the call finishes the next caller runs it again.
+
+Writes bump a per-scope generation (see bump() and the writes decorator); a caller
+never joins a call started in an older generation, so a read issued after a write
+(even one made from another callback or thread) never receives pre-write data.
+
+Used by DataAccessLayer read methods, so twenty users opening the assets page at
+the same moment run the detailed-assets query once instead of twenty times.
+"""
+
+import copy
+import functools
+import threading
+
+
+class _Call:
+    __slots__ = ("generation", "done", "result", "error", "waiters")
+
+    def __init__(self, generation):
+        self.generation = generation
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+        self.waiters = 0
+
+
+class SingleFlight:
+    def __init__(self):
+        self._calls = {}
+        self._lock = threading.Lock()
+        self._stats = {"calls": 0, "executions": 0, "coalesced": 0, "errors": 0}
+        self._by_name = {}  # name -> {"calls", "executions", "coalesced"}
+        self._generations = {}  # scope -> write generation
+
+    def bump(self, scope=None):
+        """Starts a new generation for a scope after a write: later callers stop joining earlier calls."""
+        with self._lock:
+            self._generations[scope] = self._generations.get(scope, 0) + 1
+
+    def do(self, key, fn, name=None, scope=None):
+        """
+        Runs fn() unless an identical call (same key) is in flight, in which case waits for it.
+        Args:
+            key: Hashable identity of the call, e.g. (method, args).
+            fn (callable): The call to run.
+            name (str, optional): Label for per-name metrics (defaults to str(key)).
+            scope (hashable, optional): Write scope of the call (see bump()); only calls started in
+                the scope's current generation are joined.
+        Returns:
+            fn()'s result. Waiters get a copy of DataFrames/Series/lists/dicts so callers never share
+            a mutable result.
+        """
+        name = name or str(key)
+        with self._lock:
+            self._stats["calls"] += 1
+            counters = self._by_name.setdefault(name, {"calls": 0, "executions": 0, "coalesced": 0})
+            counters["calls"] += 1
+            generation = self._generations.get(scope, 0)
+            call = self._calls.get(key)
+            leader = call is None or call.generation != generation
+            if leader:
+                call = self._calls[key] = _Call(generation)
+                self._stats["executions"] += 1
+                counters["executions"] += 1
+            else:
+                call.waiters += 1
+                self._stats["coalesced"] += 1
+                counters["coalesced"] += 1
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return _copy_result(call.result)
+
+        try:
+            call.result = fn()
+        except Exception as e:
+            call.error = e
+            with self._lock:
+                self._stats["errors"] += 1
+            raise
+        finally:
+            with self._lock:
+                # A newer-generation call may have taken the key over while this one ran
+                if self._calls.get(key) is call:
+                    del self._calls[key]
+            call.done.set()
+        return call.result
+
+    def stats(self) -> dict:
+        """Totals (calls, executions, coalesced, errors, in_flight) plus per-name counters under 'by_name'."""
+        with self._lock:
+            stats = dict(self._stats)
+            stats["in_flight"] = len(self._calls)
+            stats["by_name"] = {name: dict(c) for name, c in self._by_name.items()}
+        return stats
+
+    def reset_stats(self):
+        with self._lock:
+            self._stats = {"calls": 0, "executions": 0, "coalesced": 0, "errors": 0}
+            self._by_name = {}
+
+
+def _copy_result(result):
+    if hasattr(result, "copy") and callable(result.copy):
+        return result.copy()
+    if isinstance(result, (list, dict, set)):
+        return copy.deepcopy(result)
+    return result
+
+
+def _make_key(args, kwargs):
+    key = (args, tuple(sorted(kwargs.items())))
+    try:
+        hash(key)
+    except TypeError:
+        key = repr(key)
+    return key
+
+
+def coalesced(single_flight, scope=None):
+    """
+    Method decorator: concurrent calls with the same arguments share one execution.
+    Args:
+        single_flight (SingleFlight): Shared coalescer (one per process, across instances).
+        scope (callable, optional): scope(self) -> hashable; calls only coalesce within the same
+            scope (e.g. the database URL), so instances on different databases never share results.
+    """
+    def decorator(method):
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            write_scope = scope(self) if scope else id(self)
+            key = (method.__name__, write_scope, _make_key(args, kwargs))
+            return single_flight.do(key, lambda: method(self, *args, **kwargs), name=method.__name__,
+                                    scope=write_scope)
+        return wrapper
+    return decorator
+
+
+def writes(single_flight, scope=None):
+    """
+    Method decorator for writes: bumps the scope's generation when the method returns (or raises),
+    so coalesced reads issued afterwards never join a call that started before the write.
+    Args:
+        single_flight (SingleFlight): The coalescer the reads use.
+        scope (callable, optional): Same as for coalesced().
+    """
+    def decorator(method):
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            try:
+                return method(self, *args, **kwargs)
+            finally:
+                single_flight.bump(scope(self) if scope else id(self))
+        return wrapper
+    return decorator
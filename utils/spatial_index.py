@@ -0,0 +1,155 @@
+"""
+In-memory spatial index over asset coordinates for the fleet map.
+
+Responsibilities:
+- GridIndex buckets every asset's latitude/longitude into fixed-size grid
+  cells, so a bounding-box query only looks at the cells the box covers
+  (including boxes crossing the antimeridian).
+- cluster() groups the points in a viewport into grid clusters sized for the
+  map zoom level and coarsens the grid until there are at most max_markers
+  clusters, so the browser never receives more markers than it can draw,
+  whatever the fleet size.
+
+Built once per snapshot (see snapshots.py "fleet_map"); queries do no database work.
+Run this module to time queries over 100k random assets.
+"""
+
+import math
+
+import numpy as np
+import pandas as pd
+
+DEFAULT_CELL_DEGREES = 1.0
+MAX_MARKERS = 300
+
+# Map tiles are 256 px wide; one cluster per ~64 px square at any zoom
+CLUSTERS_PER_TILE = 4
+
+ASSET_FIELDS = ["ProjectAssetID", "AssetName", "AssetType", "ClientName", "ProjectName"]
+
+
+class GridIndex:
+    def __init__(self, assets, cell_degrees=DEFAULT_CELL_DEGREES):
+        """
+        Args:
+            assets (DataFrame): One row per asset with Latitude, Longitude and the ASSET_FIELDS columns.
+                Rows without valid coordinates are skipped.
+            cell_degrees (float): Grid cell size in degrees.
+        """
+        assets = pd.DataFrame(assets)
+        for column in ["Latitude", "Longitude"] + ASSET_FIELDS:
+            if column not in assets.columns:
+                assets[column] = None
+        lat = pd.to_numeric(assets["Latitude"], errors="coerce")
+        lon = pd.to_numeric(assets["Longitude"], errors="coerce")
+        valid = lat.between(-90, 90) & lon.between(-180, 180)
+        assets = assets[valid]
+
+        self.cell_degrees = cell_degrees
+        self.lat = lat[valid].to_numpy(dtype="float64")
+        self.lon = lon[valid].to_numpy(dtype="float64")
+        self.assets = assets[ASSET_FIELDS].astype(object).where(assets[ASSET_FIELDS].notna(), None).to_dict(orient="records")
+
+        # Points sorted by cell; each occupied cell maps to its slice of self._order
+        rows, cols = self._cell(self.lat, self.lon)
+        keys = rows * self._cols_per_row + cols
+        self._order = np.argsort(keys, kind="stable")
+        cell_keys, starts, counts = np.unique(keys[self._order], return_index=True, return_counts=True)
+        self._cell_rows = cell_keys // self._cols_per_row
+        self._cell_cols = cell_keys % self._cols_per_row
+        self._cell_starts = starts
+        self._cell_counts = counts
+
+    def __len__(self):
+        return len(self.lat)
+
+    @property
+    def _cols_per_row(self):
+        return int(math.ceil(360 / self.cell_degrees)) + 1
+
+    def _cell(self, lat, lon):
+        rows = np.floor((np.asarray(lat) + 90) / self.cell_degrees).astype("int64")
+        cols = np.floor((np.asarray(lon) + 180) / self.cell_degrees).astype("int64")
+        return rows, cols
+
+    def query_bbox(self, south, west, north, east) -> np.ndarray:
+        """
+        Returns the positions (into lat, lon and assets) of the points inside a bounding box.
+        A box with west > east crosses the antimeridian.
+        """
+        south, north = max(south, -90.0), min(north, 90.0)
+        if south > north or not len(self):
+            return np.empty(0, dtype="int64")
+        if east - west >= 360:
+            west, east = -180.0, 180.0
+        west = (west + 180) % 360 - 180 if not -180 <= west <= 180 else west
+        east = (east + 180) % 360 - 180 if not -180 <= east <= 180 else east
+        if west > east:
+            return np.concatenate([self.query_bbox(south, west, north, 180.0),
+                                   self.query_bbox(south, -180.0, north, east)])
+
+        (row_min, row_max), (col_min, col_max) = self._cell([south, north], [west, east])
+        cells = np.flatnonzero((self._cell_rows >= row_min) & (self._cell_rows <= row_max)
+                               & (self._cell_cols >= col_min) & (self._cell_cols <= col_max))
+        if not len(cells):
+            return np.empty(0, dtype="int64")
+        if len(cells) * 4 > len(self._cell_counts):
+            # Box covers most occupied cells: one vectorized pass is cheaper than gathering slices
+            candidates = np.arange(len(self), dtype="int64")
+        else:
+            candidates = np.concatenate([self._order[self._cell_starts[c]:self._cell_starts[c] + self._cell_counts[c]]
+                                         for c in cells])
+        lat, lon = self.lat[candidates], self.lon[candidates]
+        inside = (lat >= south) & (lat <= north) & (lon >= west) & (lon <= east)
+        return candidates[inside]
+
+    def cluster(self, south, west, north, east, zoom, max_markers=MAX_MARKERS) -> list:
+        """
+        Clusters the points inside a bounding box for a map zoom level.
+        Returns:
+            list: At most max_markers dicts with lat, lon (centroid) and count; single assets
+                also carry their ASSET_FIELDS.
+        """
+        positions = self.query_bbox(south, west, north, east)
+        if not len(positions):
+            return []
+        size = 360 / (2 ** max(float(zoom or 0), 0) * CLUSTERS_PER_TILE)
+        lat, lon = self.lat[positions], self.lon[positions]
+        while True:
+            cols_per_row = int(math.ceil(360 / size)) + 1
+            keys = np.floor((lat + 90) / size).astype("int64") * cols_per_row + np.floor((lon + 180) / size).astype("int64")
+            _, groups, counts = np.unique(keys, return_inverse=True, return_counts=True)
+            if len(counts) <= max_markers:
+                break
+            size *= 2
+        centroid_lat = np.bincount(groups, weights=lat) / counts
+        centroid_lon = np.bincount(groups, weights=lon) / counts
+        # Position of one member per cluster, for single-asset markers
+        first = np.full(len(counts), -1, dtype="int64")
+        first[groups[::-1]] = positions[::-1]
+
+        clusters = []
+        for i, count in enumerate(counts):
+            marker = {"lat": float(centroid_lat[i]), "lon": float(centroid_lon[i]), "count": int(count)}
+            if count == 1:
+                marker.update(self.assets[first[i]])
+            clusters.append(marker)
+        return clusters
+
+
+if __name__ == "__main__":
+    import time
+
+    rows = 100_000
+    rng = np.random.default_rng(0)
+    index = GridIndex(pd.DataFrame({
+        "Latitude": rng.uniform(25, 50, rows),
+        "Longitude": rng.uniform(-125, -65, rows),
+        "ProjectAssetID": np.arange(rows),
+    }))
+    for name, bbox, zoom in [("world", (-90, -180, 90, 180), 1), ("US", (24, -126, 50, -64), 3),
+                             ("state", (38, -100, 41, -95), 6), ("county", (39.5, -97.5, 39.9, -97.0), 10)]:
+        start = time.perf_counter()
+        clusters = index.cluster(*bbox, zoom)
+        elapsed = (time.perf_counter() - start) * 1000
+        print(f"{name:7s} zoom {zoom:2d}: {len(index.query_bbox(*bbox)):6d} assets -> {len(clusters):3d} markers in {elapsed:6.1f} ms")
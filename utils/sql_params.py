@@ -0,0 +1,99 @@
+"""
+Parameterized statement helpers for the data access layer.
+
+Responsibilities:
+- statement(sql): returns one shared text() construct per SQL string, so every
+  call of a DAL method sends the same statement text with bound parameters.
+  SQL Server then reuses one cached plan instead of compiling a new plan per
+  distinct value, and SQLAlchemy's compiled cache hits on every call.
+- LiteralSQLMonitor: engine instrumentation that checks every statement
+  reaching the driver for inline string literals (ad hoc SQL built with
+  f-strings) and counts compiled-cache hits/misses.
+
+Set DAL_STRICT_SQL=1 to raise on literal SQL instead of logging it (useful in development).
+"""
+
+import os
+import re
+import threading
+
+from sqlalchemy import bindparam, event, text
+from sqlalchemy.engine.default import CACHE_HIT, CACHE_MISS
+
+STRICT_SQL = os.getenv("DAL_STRICT_SQL", "0") == "1"
+
+# 'abc', N'abc' (with '' escapes); bound parameters (?, :name) never match
+_STRING_LITERAL = re.compile(r"N?'(?:[^']|'')*'")
+
+_statements = {}
+_statements_lock = threading.Lock()
+
+
+def statement(sql: str, expanding=()):
+    """
+    Returns the cached text() construct for a SQL string (created on first use).
+    Args:
+        expanding (tuple): Names of list parameters used as `IN :name` (bound as one parameter per item).
+    """
+    key = (sql, tuple(expanding))
+    stmt = _statements.get(key)
+    if stmt is None:
+        stmt = text(sql)
+        if expanding:
+            stmt = stmt.bindparams(*(bindparam(name, expanding=True) for name in expanding))
+        with _statements_lock:
+            stmt = _statements.setdefault(key, stmt)
+    return stmt
+
+
+def has_literal_values(sql: str) -> bool:
+    """True if the statement text contains inline string literals."""
+    return _STRING_LITERAL.search(sql) is not None
+
+
+class LiteralSQLMonitor:
+    def __init__(self, strict=STRICT_SQL):
+        """
+        Args:
+            strict (bool): Raise ValueError on literal SQL instead of logging it.
+        """
+        self.strict = strict
+        self._lock = threading.Lock()
+        self._stats = {"statements": 0, "literal": 0, "cache_hits": 0, "cache_misses": 0}
+        self.literal_statements = []  # most recent offenders (statement text), up to 20
+        self._engines = []
+
+    def install(self, engine):
+        """Attaches the check to an engine. Safe to call more than once per engine."""
+        if any(e is engine for e in self._engines):
+            return engine
+        event.listen(engine, "before_cursor_execute", self._before_cursor_execute)
+        self._engines.append(engine)
+        return engine
+
+    def _before_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        literal = has_literal_values(statement)
+        cache_hit = getattr(context, "cache_hit", None)
+        with self._lock:
+            self._stats["statements"] += 1
+            if cache_hit == CACHE_HIT:
+                self._stats["cache_hits"] += 1
+            elif cache_hit == CACHE_MISS:
+                self._stats["cache_misses"] += 1
+            if literal:
+                self._stats["literal"] += 1
+                self.literal_statements = (self.literal_statements + [statement])[-20:]
+        if literal:
+            if self.strict:
+                raise ValueError(f"Literal SQL reached the engine (use bound parameters): {statement}")
+            print(f"Warning: literal SQL reached the engine (use bound parameters): {statement}")
+
+    def stats(self) -> dict:
+        """Counts of statements executed, statements with literals, and compiled-cache hits/misses."""
+        with self._lock:
+            stats = dict(self._stats)
+        stats["cached_statements"] = len(_statements)
+        return stats
+
+
+literal_sql_monitor = LiteralSQLMonitor()
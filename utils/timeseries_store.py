@@ -0,0 +1,189 @@
+"""
+Local time-series store for ingested logger data.
+
+Responsibilities:
+- Persists ingested samples per ProjectAssetID and channel in a local SQLite file.
+- Keeps a per-day watermark of when each asset's data last changed, so consumers
+  (comparisons, rollups, status) can refresh only the days that received new data.
+- Returns range reads as wide, Timestamp-indexed DataFrames (one column per channel).
+
+The store location is read from ETL_STORE_PATH (defaults to ./etl_store.sqlite).
+"""
+
+import os
+import sqlite3
+import threading
+import time
+
+import pandas as pd
+from dotenv import load_dotenv
+
+load_dotenv()
+
+DEFAULT_STORE_PATH = os.getenv("ETL_STORE_PATH", "etl_store.sqlite")
+
+# Shared with the services that read samples from the same file (e.g. utils/asset_status.py)
+SAMPLES_DDL = """
+    CREATE TABLE IF NOT EXISTS samples (
+        project_asset_id INTEGER NOT NULL,
+        channel TEXT NOT NULL,
+        ts INTEGER NOT NULL,
+        value REAL,
+        PRIMARY KEY (project_asset_id, channel, ts)
+    ) WITHOUT ROWID;
+"""
+
+
+def _to_epoch(value):
+    """Convert a timestamp-like value to integer epoch seconds (None passes through)."""
+    if value is None:
+        return None
+    return int(pd.Timestamp(value).timestamp())
+
+
+class TimeseriesStore:
+    def __init__(self, path=None):
+        """
+        Opens (and creates if needed) the SQLite store.
+        Args:
+            path (str, optional): SQLite file path. Defaults to ETL_STORE_PATH.
+        """
+        self._path = path or DEFAULT_STORE_PATH
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self._path, timeout=30, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(SAMPLES_DDL + """
+            CREATE TABLE IF NOT EXISTS series_periods (
+                project_asset_id INTEGER NOT NULL,
+                period TEXT NOT NULL,
+                updated_at REAL NOT NULL,
+                PRIMARY KEY (project_asset_id, period)
+            ) WITHOUT ROWID;
+        """)
+        self._conn.commit()
+
+    @property
+    def path(self):
+        return self._path
+
+    def write_frame(self, project_asset_id: int, frame: pd.DataFrame) -> dict:
+        """
+        Upserts the numeric channels of a Timestamp-indexed frame for one asset and
+        bumps the watermark of every day that was touched.
+        Args:
+            project_asset_id (int): The ProjectAssetID the data belongs to.
+            frame (pd.DataFrame): DatetimeIndex (or a 'Timestamp' column) plus one column per channel.
+        Returns:
+            dict: {'samples': int, 'periods': list of 'YYYY-MM-DD' strings}
+        """
+        if "Timestamp" in frame.columns:
+            frame = frame.set_index("Timestamp")
+        frame = frame.select_dtypes(include="number")
+        if frame.empty:
+            return {"samples": 0, "periods": []}
+
+        index = pd.DatetimeIndex(frame.index)
+        long_frame = (
+            frame.set_axis(index.asi8 // 10**9)
+            .rename_axis("ts")
+            .reset_index()
+            .melt(id_vars="ts", var_name="channel", value_name="value")
+            .dropna(subset=["value"])
+        )
+        rows = zip(
+            [int(project_asset_id)] * len(long_frame),
+            long_frame["channel"].astype(str),
+            long_frame["ts"].astype("int64").tolist(),
+            long_frame["value"].astype(float).tolist(),
+        )
+        periods = sorted(set(index.normalize().strftime("%Y-%m-%d")))
+        now = time.time()
+
+        with self._lock:
+            with self._conn:
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO samples (project_asset_id, channel, ts, value) VALUES (?, ?, ?, ?)",
+                    rows,
+                )
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO series_periods (project_asset_id, period, updated_at) VALUES (?, ?, ?)",
+                    [(int(project_asset_id), period, now) for period in periods],
+                )
+        return {"samples": len(long_frame), "periods": periods}
+
+    def read_frame(self, project_asset_id: int, start=None, end=None, channels=None) -> pd.DataFrame:
+        """
+        Returns a wide frame for one asset between start (inclusive) and end (exclusive).
+        Args:
+            project_asset_id (int): The ProjectAssetID to read.
+            start, end (optional): Timestamp-like bounds. None leaves the side open.
+            channels (list, optional): Restrict to these channel names.
+        Returns:
+            pd.DataFrame: DatetimeIndex named 'Timestamp', one float column per channel.
+        """
+        clauses = ["project_asset_id = ?"]
+        params = [int(project_asset_id)]
+        if start is not None:
+            clauses.append("ts >= ?")
+            params.append(_to_epoch(start))
+        if end is not None:
+            clauses.append("ts < ?")
+            params.append(_to_epoch(end))
+        if channels:
+            clauses.append(f"channel IN ({', '.join('?' * len(channels))})")
+            params.extend(str(c) for c in channels)
+
+        query = f"SELECT ts, channel, value FROM samples WHERE {' AND '.join(clauses)}"
+        with self._lock:
+            long_frame = pd.read_sql_query(query, self._conn, params=params)
+        if long_frame.empty:
+            return pd.DataFrame(index=pd.DatetimeIndex([], name="Timestamp"))
+
+        wide = long_frame.pivot(index="ts", columns="channel", values="value").sort_index()
+        wide.index = pd.to_datetime(wide.index, unit="s").rename("Timestamp")
+        wide.columns.name = None
+        return wide
+
+    def period_watermarks(self, project_asset_id: int) -> pd.Series:
+        """
+        Returns when each day of data for an asset last changed.
+        Returns:
+            pd.Series: epoch-seconds updated_at indexed by normalized day Timestamps.
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT period, updated_at FROM series_periods WHERE project_asset_id = ? ORDER BY period",
+                (int(project_asset_id),),
+            ).fetchall()
+        if not rows:
+            return pd.Series(dtype=float, index=pd.DatetimeIndex([], name="Period"))
+        periods, updated = zip(*rows)
+        return pd.Series(updated, index=pd.DatetimeIndex(periods, name="Period"), dtype=float)
+
+    def asset_ids(self) -> list:
+        """Returns the ProjectAssetIDs that have stored samples."""
+        with self._lock:
+            rows = self._conn.execute("SELECT DISTINCT project_asset_id FROM samples ORDER BY project_asset_id").fetchall()
+        return [row[0] for row in rows]
+
+    def channels(self, project_asset_id: int) -> list:
+        """Returns the channel names stored for an asset."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT DISTINCT channel FROM samples WHERE project_asset_id = ? ORDER BY channel",
+                (int(project_asset_id),),
+            ).fetchall()
+        return [row[0] for row in rows]
+
+    def last_timestamp(self, project_asset_id: int):
+        """Returns the newest sample Timestamp for an asset, or None if nothing is stored."""
+        with self._lock:
+            value = self._conn.execute(
+                "SELECT MAX(ts) FROM samples WHERE project_asset_id = ?",
+                (int(project_asset_id),),
+            ).fetchone()[0]
+        return None if value is None else pd.Timestamp(value, unit="s")
+
+    def close(self):
+        with self._lock:
+            self._conn.close()